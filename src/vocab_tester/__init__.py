@@ -1,9 +1,7 @@
 from .app import VocabTesterApp
+from .cli import main
 
-
-def main():
-    app = VocabTesterApp()
-    app.run()
+__all__ = ["VocabTesterApp", "main"]
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ from textual.screen import Screen
 from textual.widgets import Button, Input, Label, Static
 from pydantic import ValidationError
 
-from .db import Database
+from .async_db import AsyncDatabase
 from .models import Word
 from .ai_service import AIService, AIServiceError
 
@@ -14,7 +14,7 @@ from .ai_service import AIService, AIServiceError
 class AddWordScreen(Screen):
     CSS_PATH = "styles.tcss"
 
-    def __init__(self, db: Database):
+    def __init__(self, db: AsyncDatabase):
         super().__init__()
         self.db = db
         try:
@@ -53,11 +53,11 @@ class AddWordScreen(Screen):
             id="add_word_container",
         )
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:
+    async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "cancel_btn":
             self.app.pop_screen()
         elif event.button.id == "save_btn":
-            self.save_word()
+            await self.save_word()
         elif event.button.id == "generate_btn":
             self.generate_ai_data()
 
@@ -103,7 +103,7 @@ class AddWordScreen(Screen):
         finally:
             generate_btn.disabled = False
 
-    def save_word(self) -> None:
+    async def save_word(self) -> None:
         kanji = self.query_one("#kanji", Input).value.strip()
         kana = self.query_one("#kana", Input).value.strip()
         english = self.query_one("#english", Input).value.strip()
@@ -124,7 +124,7 @@ class AddWordScreen(Screen):
                 tag=tag,
             )
 
-            self.db.add_word(word)
+            await self.db.add_word(word)
             # Clear inputs
             for input_widget in self.query(Input):
                 input_widget.value = ""
@@ -1,10 +1,27 @@
 import shutil
 import subprocess
+import time
+from textual import events
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer
+from .async_db import AsyncDatabase
+from .config import CONFIG
 from .db import Database
+from .maintenance import maintain
 from .quiz_screen import QuizScreen
+from .result_recorder import ResultRecorder
+from .session_log import SessionLog
+from .session_snapshot import load_snapshot, save_snapshot, snapshot_path
 from .add_word_screen import AddWordScreen
+from .search_screen import SearchScreen
+
+# Seconds between checks whether the app has been idle long enough to run
+# database maintenance.
+IDLE_CHECK_INTERVAL = 60
+
+# Seconds between saves of the session in progress, to resume from if the
+# app doesn't get to save it on exit.
+SNAPSHOT_INTERVAL = 15
 
 
 class VocabTesterApp(App):
@@ -13,14 +30,87 @@ class VocabTesterApp(App):
         ("d", "toggle_dark", "Toggle dark mode"),
         ("a", "add_word", "Add Word"),
         ("e", "edit_word", "Edit Word"),
+        ("s", "search", "Search"),
         ("q", "quit", "Quit"),
     ]
 
+    def __init__(
+        self, db: Database | None = None, session_log: SessionLog | None = None
+    ) -> None:
+        super().__init__()
+        # A single shared Database (and connection pool) for every screen.
+        if db is None:
+            db = Database(
+                sample_mode=CONFIG.sample_mode,
+                cache_size=CONFIG.word_cache_size,
+                settings=CONFIG.database,
+                seed=CONFIG.seed,
+            )
+        self.db = db
+        # Answers are also written here when recording the session.
+        self.session_log = session_log
+        # Screens go through this so queries never block the event loop.
+        self.async_db = AsyncDatabase(self.db)
+        # Replays results a previous run didn't get to write.
+        self.recorder = ResultRecorder(self.db)
+        self.snapshot_path = snapshot_path(self.db.db_path)
+        self.resume_from = load_snapshot(self.snapshot_path)
+        self.quiz_screen: QuizScreen | None = None
+        self.last_input_time = time.monotonic()
+        self.maintained_while_idle = False
+
     def on_mount(self) -> None:
-        self.db = Database()
-        self.score_correct = 0
-        self.score_total = 0
+        self.score_correct = self.resume_from.score_correct if self.resume_from else 0
+        self.score_total = self.resume_from.score_total if self.resume_from else 0
         self.update_score_display()
+        self.set_interval(self.recorder.max_delay, self.flush_results)
+        self.set_interval(SNAPSHOT_INTERVAL, self.save_session)
+        if CONFIG.idle_maintenance_minutes > 0:
+            self.set_interval(IDLE_CHECK_INTERVAL, self.maintain_if_idle)
+
+    def on_unmount(self) -> None:
+        # The database thread is idle by now, so this can run here.
+        self.write_snapshot()
+        self.recorder.close()
+        self.async_db.close()
+        if self.session_log:
+            self.session_log.close()
+
+    async def flush_results(self) -> None:
+        await self.async_db.run(self.recorder.flush)
+
+    async def save_session(self) -> None:
+        await self.async_db.run(self.write_snapshot)
+
+    def write_snapshot(self) -> None:
+        """Saves the session in progress, along with the score."""
+        if self.quiz_screen is None:
+            return
+        snapshot = self.quiz_screen.snapshot()._replace(
+            score_correct=self.score_correct, score_total=self.score_total
+        )
+        save_snapshot(self.snapshot_path, snapshot)
+
+    async def on_event(self, event: events.Event) -> None:
+        # Every key press and mouse event reaches the app here before it is
+        # forwarded, including the keys the answer Input consumes.
+        if isinstance(event, events.InputEvent) and not event.is_forwarded:
+            self.last_input_time = time.monotonic()
+            self.maintained_while_idle = False
+        await super().on_event(event)
+
+    async def maintain_if_idle(self) -> None:
+        """Runs database maintenance once per idle spell, off the UI thread."""
+        idle = time.monotonic() - self.last_input_time
+        if self.maintained_while_idle or idle < CONFIG.idle_maintenance_minutes * 60:
+            return
+        self.maintained_while_idle = True
+        report = await self.async_db.run(maintain, self.db)
+        if report.problems:
+            self.notify(
+                "Database integrity check failed, see `vocab-tester maintain`",
+                severity="error",
+            )
 
     def update_score_display(self) -> None:
         self.sub_title = f"Score: {self.score_correct}/{self.score_total}"
@@ -85,13 +175,23 @@ class VocabTesterApp(App):
     def compose(self) -> ComposeResult:
         yield Header()
         yield Footer()
-        yield QuizScreen(Database())
+        self.quiz_screen = QuizScreen(
+            self.async_db, self.recorder, self.session_log, self.resume_from
+        )
+        yield self.quiz_screen
+
+    async def action_edit_word(self) -> None:
+        await self.query_one(QuizScreen).action_edit_word()
 
-    def action_edit_word(self) -> None:
-        self.query_one(QuizScreen).action_edit_word()
+    async def action_add_word(self) -> None:
+        await self.flush_results()
+        self.push_screen(AddWordScreen(self.async_db))
 
-    def action_add_word(self) -> None:
-        self.push_screen(AddWordScreen(Database()))
+    async def action_search(self) -> None:
+        await self.flush_results()
+        self.push_screen(
+            SearchScreen(self.async_db, self.query_one(QuizScreen).session)
+        )
 
     def action_toggle_dark(self) -> None:
         self.theme = "textual-light" if self.theme == "textual-dark" else "textual-dark"
@@ -0,0 +1,84 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from typing import Callable, Collection, TypeVar
+
+from .db import Database
+from .models import TagFilter, TagStats, Word
+
+T = TypeVar("T")
+
+
+class AsyncDatabase:
+    """
+    Awaitable front end to a Database for the Textual event loop.
+
+    Every call is queued to a single dedicated thread, which owns its own
+    pooled connection, so a slow disk or a locked database stalls only that
+    thread and never the UI. Calls run one at a time in the order they were
+    made.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self.db = db
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="vocab-db"
+        )
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Runs any blocking callable on the database thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """Waits for queued calls to finish, then closes the database."""
+        self._executor.shutdown(wait=True)
+        self.db.close()
+
+    async def get_word(self, word_id: int) -> Word | None:
+        return await self.run(self.db.get_word, word_id)
+
+    async def get_words(self, word_ids: list[int]) -> list[Word]:
+        return await self.run(self.db.get_words, word_ids)
+
+    async def get_tags(self) -> list[str]:
+        return await self.run(self.db.get_tags)
+
+    async def get_tag_stats(self) -> list[TagStats]:
+        return await self.run(self.db.get_tag_stats)
+
+    async def get_random_word_ids(
+        self,
+        limit: int,
+        tag_filter: str | TagFilter | None = None,
+        exclude_ids: Collection[int] | None = None,
+    ) -> list[int]:
+        return await self.run(
+            self.db.get_random_word_ids, limit, tag_filter, exclude_ids
+        )
+
+    async def get_incorrect_word_ids(
+        self,
+        limit: int,
+        tag_filter: str | TagFilter | None = None,
+        exclude_ids: Collection[int] | None = None,
+    ) -> list[int]:
+        return await self.run(
+            self.db.get_incorrect_word_ids, limit, tag_filter, exclude_ids
+        )
+
+    async def search_words(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> list[Word]:
+        return await self.run(self.db.search_words, query, limit, offset)
+
+    async def add_word(self, word: Word) -> None:
+        await self.run(self.db.add_word, word)
+
+    async def update_word(self, word: Word) -> None:
+        await self.run(self.db.update_word, word)
+
+    async def record_result(self, word_id: int, correct: bool, **details) -> None:
+        await self.run(self.db.record_result, word_id, correct, **details)
@@ -0,0 +1,340 @@
+import argparse
+import datetime
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .app import VocabTesterApp
+from .config import CONFIG
+from .db import DB_PATH, Database
+from .exporter import EXPORTS, export_table
+from .forecast import FORECAST_DAYS, NEW_PER_DAY, load_state, simulate
+from .importer import CHUNK_SIZE, FORMATS, ImportResult, detect_format, import_file
+from .leeches import LEECH_THRESHOLD
+from .maintenance import maintain
+from .models import TagFilter
+from .replay import ReplayReport, copy_deck, percentile, replay
+from .sampling import SAMPLE_MODES
+from .session_log import SessionLog, SessionSettings, load_session
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="vocab-tester", description="Japanese vocab CLI"
+    )
+    parser.add_argument(
+        "--db", type=Path, default=DB_PATH, help="path to the SQLite database"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="seed for every random draw, to make sessions reproducible",
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        metavar="FILE",
+        help="write the quiz session's answers to FILE for `replay`",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    import_parser = commands.add_parser(
+        "import", help="bulk import words from a CSV, TSV or JSONL file"
+    )
+    import_parser.add_argument("file", type=Path)
+    import_parser.add_argument(
+        "--format", choices=FORMATS, help="defaults to the file extension"
+    )
+    import_parser.add_argument("--tag", help="tag for rows that don't have one")
+    import_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    import_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="ignore the checkpoint of an interrupted import",
+    )
+    import_parser.set_defaults(handler=run_import)
+
+    export_parser = commands.add_parser(
+        "export", help="stream words or review data to CSV, TSV or JSONL"
+    )
+    export_parser.add_argument("table", choices=EXPORTS, nargs="?", default="words")
+    export_parser.add_argument(
+        "-o", "--output", type=Path, help="defaults to standard output"
+    )
+    export_parser.add_argument(
+        "--format", choices=FORMATS, help="defaults to the file extension"
+    )
+    export_parser.add_argument(
+        "--tag",
+        action="append",
+        help="only export words with this tag (can be repeated)",
+    )
+    export_parser.add_argument(
+        "--all-tags",
+        action="store_true",
+        help="with several --tag options, require every tag instead of any",
+    )
+    export_parser.set_defaults(handler=run_export)
+
+    maintain_parser = commands.add_parser(
+        "maintain",
+        help="reclaim free space, refresh query statistics and check integrity",
+    )
+    maintain_parser.set_defaults(handler=run_maintain)
+
+    forecast_parser = commands.add_parser(
+        "forecast", help="simulate the daily review load of the coming days"
+    )
+    forecast_parser.add_argument("--days", type=int, default=FORECAST_DAYS)
+    forecast_parser.add_argument(
+        "--new-per-day",
+        type=int,
+        default=NEW_PER_DAY,
+        help="words never answered to introduce each day",
+    )
+    forecast_parser.add_argument(
+        "--retention",
+        type=float,
+        help="chance of recalling a due word, defaults to the recent success rate",
+    )
+    forecast_parser.set_defaults(handler=run_forecast)
+
+    leeches_parser = commands.add_parser(
+        "leeches", help="list the words failed most often"
+    )
+    leeches_parser.add_argument(
+        "--threshold",
+        type=int,
+        default=CONFIG.leech_threshold or LEECH_THRESHOLD,
+        help="failures needed to count as a leech",
+    )
+    leeches_parser.set_defaults(handler=run_leeches)
+
+    replay_parser = commands.add_parser(
+        "replay",
+        help="re-drive a recorded session against a copy of the deck and time it",
+    )
+    replay_parser.add_argument("recording", type=Path)
+    replay_parser.add_argument(
+        "--scheduler", choices=("random", "sm2"), help="override the recorded one"
+    )
+    replay_parser.add_argument(
+        "--sample-mode", choices=SAMPLE_MODES, help="override the recorded one"
+    )
+    replay_parser.set_defaults(handler=run_replay)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command is None:
+        seed = args.seed if args.seed is not None else CONFIG.seed
+        session_log = None
+        if args.record:
+            # A recording is only replayable with a known seed.
+            if seed is None:
+                seed = random.randrange(2**32)
+            session_log = SessionLog(
+                args.record, SessionSettings.from_config(CONFIG, seed)
+            )
+        app = VocabTesterApp(
+            Database(
+                args.db,
+                sample_mode=CONFIG.sample_mode,
+                cache_size=CONFIG.word_cache_size,
+                settings=CONFIG.database,
+                seed=seed,
+            ),
+            session_log,
+        )
+        app.run()
+        return 0
+
+    return args.handler(args)
+
+
+def run_import(args: argparse.Namespace) -> int:
+    if not args.file.exists():
+        print(f"File not found: {args.file}", file=sys.stderr)
+        return 1
+
+    db = Database(args.db, settings=CONFIG.database)
+    started = time.perf_counter()
+
+    def report(result: ImportResult) -> None:
+        print(
+            f"\rImported {result.inserted} words ({result.skipped} skipped)",
+            end="",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    try:
+        result = import_file(
+            db,
+            args.file,
+            args.format,
+            default_tag=args.tag,
+            chunk_size=args.chunk_size,
+            restart=args.restart,
+            progress=report,
+        )
+    finally:
+        db.close()
+
+    print(file=sys.stderr)
+    if result.resumed_from:
+        print(f"Resumed after row {result.resumed_from}")
+    for error in result.errors:
+        print(f"Skipped {error}")
+    print(
+        f"Imported {result.inserted} of {result.rows} rows"
+        f" in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+def run_export(args: argparse.Namespace) -> int:
+    fmt = args.format
+    if fmt is None:
+        fmt = detect_format(args.output) if args.output else "csv"
+
+    tags = TagFilter.of(args.tag or [])
+    if tags and args.all_tags:
+        tags = TagFilter(tags.tags, match_all=True)
+
+    db = Database(args.db, settings=CONFIG.database)
+    try:
+        if args.output:
+            with args.output.open("w", encoding="utf-8", newline="") as out:
+                written = export_table(db, args.table, out, fmt, tags)
+            print(f"Exported {written} {args.table} rows to {args.output}")
+        else:
+            export_table(db, args.table, sys.stdout, fmt, tags)
+    finally:
+        db.close()
+    return 0
+
+
+def run_maintain(args: argparse.Namespace) -> int:
+    db = Database(args.db, settings=CONFIG.database)
+    try:
+        report = maintain(db)
+    finally:
+        db.close()
+
+    print(
+        f"Reclaimed {report.pages_reclaimed} pages"
+        f" ({report.bytes_reclaimed / 1024:.0f} KiB) in {report.seconds:.2f}s"
+    )
+    if report.problems:
+        for problem in report.problems:
+            print(f"Integrity problem: {problem}", file=sys.stderr)
+        return 1
+    print("Integrity check passed")
+    return 0
+
+
+def run_forecast(args: argparse.Namespace) -> int:
+    if args.days < 1:
+        print("--days must be at least 1", file=sys.stderr)
+        return 1
+    if args.retention is not None and not 0 < args.retention <= 1:
+        print("--retention must be above 0 and at most 1", file=sys.stderr)
+        return 1
+
+    db = Database(args.db, settings=CONFIG.database)
+    try:
+        started = time.perf_counter()
+        state = load_state(db)
+    finally:
+        db.close()
+    if args.retention is not None:
+        state = state._replace(retention=args.retention)
+    forecast = simulate(state, args.days, args.new_per_day, args.seed)
+    seconds = time.perf_counter() - started
+
+    today = datetime.date.today()
+    print(f"{'Date':<10}  {'Reviews':>7}  {'New':>5}  {'Lapses':>6}")
+    for day, (reviews, new, lapses) in enumerate(zip(*forecast)):
+        date = today + datetime.timedelta(days=day)
+        print(f"{date:%Y-%m-%d}  {reviews:>7}  {new:>5}  {lapses:>6}")
+
+    total = forecast.reviews + forecast.new
+    peak = int(total.argmax())
+    print(
+        f"Peak of {total[peak]} answers on {today + datetime.timedelta(days=peak)},"
+        f" {total.mean():.0f} a day on average"
+        f" (retention {state.retention:.0%}, {seconds:.2f}s)"
+    )
+    return 0
+
+
+def run_leeches(args: argparse.Namespace) -> int:
+    db = Database(args.db, settings=CONFIG.database)
+    try:
+        leeches = db.get_leeches(args.threshold)
+    finally:
+        db.close()
+
+    for word, counts in leeches:
+        print(
+            f"{word.kanji_word} ({word.kana_word}) {word.english_word}:"
+            f" failed {counts.failures} times, {counts.streak} in a row"
+        )
+    print(f"{len(leeches)} leeches failed at least {args.threshold} times")
+    return 0
+
+
+def run_replay(args: argparse.Namespace) -> int:
+    if not args.recording.exists():
+        print(f"File not found: {args.recording}", file=sys.stderr)
+        return 1
+
+    settings, answers = load_session(args.recording)
+    if args.seed is not None:
+        settings = settings._replace(seed=args.seed)
+    if args.scheduler:
+        settings = settings._replace(scheduler=args.scheduler)
+    if args.sample_mode:
+        settings = settings._replace(sample_mode=args.sample_mode)
+
+    # Replaying records results, so it runs against a throwaway copy.
+    with tempfile.TemporaryDirectory() as tmp:
+        deck = Path(tmp) / "deck.db"
+        if args.db.exists():
+            copy_deck(args.db, deck)
+        db = Database(
+            deck,
+            sample_mode=settings.sample_mode,
+            cache_size=CONFIG.word_cache_size,
+            settings=CONFIG.database,
+        )
+        try:
+            report = replay(db, settings, answers)
+        finally:
+            db.close()
+
+    print_replay_report(report, len(answers))
+    return 0
+
+
+def print_replay_report(report: ReplayReport, recorded: int) -> None:
+    print(
+        f"Replayed {len(report.asked)} of {recorded} answers"
+        f" in {report.seconds:.2f}s ({report.matched} asked the recorded word)"
+    )
+    for name, values in (
+        ("next question", report.question_ms),
+        ("record result", report.answer_ms),
+    ):
+        print(
+            f"{name}: p50 {percentile(values, 0.5):.2f} ms,"
+            f" p95 {percentile(values, 0.95):.2f} ms,"
+            f" max {max(values, default=0.0):.2f} ms"
+        )
+    print(f"Word order fingerprint: {report.fingerprint}")
@@ -1,13 +1,109 @@
 from typing import Self
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 import tomllib
 
+CONFIG_PATH = Path("settings.toml")
+
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+# Starting points for common deployments; any key set alongside `preset`
+# in the [database] section overrides the preset's value.
+DATABASE_PRESETS: dict[str, dict] = {
+    # Fast local SSD, one user: WAL with NORMAL sync is durable against
+    # app crashes and only risks the last commits on power loss.
+    "laptop": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -20000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Slow, wear-sensitive flash and little RAM: few fsyncs, temp data in
+    # memory rather than on the card, a small cache and no mmap.
+    "sd-card-kiosk": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -4000,
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+    # Several processes and users on one host: full durability, a large
+    # cache and long waits for the write lock.
+    "shared-server": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -65536,
+        "mmap_size": 1073741824,
+        "temp_store": "FILE",
+        "busy_timeout": 30000,
+    },
+}
+
+
+@dataclass
+class DatabaseSettings:
+    """
+    SQLite tuning applied to every connection as it is opened. The defaults
+    match the "laptop" preset.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    # Pages, or KiB when negative (SQLite's convention).
+    cache_size: int = -20000
+    mmap_size: int = 268435456
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000
+
+    def __post_init__(self) -> None:
+        for name, allowed in (
+            ("journal_mode", JOURNAL_MODES),
+            ("synchronous", SYNCHRONOUS_LEVELS),
+            ("temp_store", TEMP_STORES),
+        ):
+            value = str(getattr(self, name)).upper()
+            if value not in allowed:
+                raise ValueError(f"Unknown {name}: {getattr(self, name)}")
+            setattr(self, name, value)
+        for name in ("cache_size", "mmap_size", "busy_timeout"):
+            setattr(self, name, int(getattr(self, name)))
+
+    @classmethod
+    def from_dict(cls, settings: dict) -> Self:
+        """Builds settings from a [database] table, applying its preset first."""
+        settings = dict(settings)
+        preset = settings.pop("preset", None)
+        if preset is not None:
+            if preset not in DATABASE_PRESETS:
+                raise ValueError(f"Unknown database preset: {preset}")
+            settings = DATABASE_PRESETS[preset] | settings
+        return cls(**settings)
+
+    def pragmas(self) -> list[str]:
+        """The PRAGMA statements for these settings (values are validated)."""
+        return [f"PRAGMA {f.name} = {getattr(self, f.name)}" for f in fields(self)]
+
 
 @dataclass
 class Config:
     default_filter: str | None = None
     translation_kana: str = "hiragana"
+    sample_mode: str = "random"
+    seed: int | None = None
+    scheduler: str = "random"
+    incorrect_ratio: float = 1.0
+    session_size: int = 10
+    word_cache_size: int = 1024
+    exclude_seen: bool = False
+    leech_threshold: int = 0
+    leech_mode: str = "allow"
+    idle_maintenance_minutes: int = 0
+    database: DatabaseSettings = field(default_factory=DatabaseSettings)
 
     @classmethod
     def from_file(cls, file: Path) -> Self:
@@ -21,4 +117,8 @@ class Config:
                 # but since we want it to be robust, maybe just default to empty settings?
                 # Actually, the original code had 'raise e' for general exceptions.
                 raise e
-        return cls(**settings)
+        database = DatabaseSettings.from_dict(settings.pop("database", {}))
+        return cls(**settings, database=database)
+
+
+CONFIG = Config.from_file(CONFIG_PATH)
@@ -1,38 +1,160 @@
 from contextlib import contextmanager
+import functools
+import json
 from pathlib import Path
+import random
+import re
 import sqlite3
+import threading
 import time
-from typing import Generator
-
-from .models import Word
+from typing import Callable, Collection, Generator, Iterable, Iterator
+
+from .config import DatabaseSettings
+from .leeches import FailureCounts
+from .migrations import SEARCH_COLUMNS, migrate
+from .models import Review, TagFilter, TagStats, Word, split_tags
+from .sampling import (
+    SAMPLE_MODES,
+    exclude_condition,
+    ProbeSource,
+    next_epoch_ids,
+    probe_ids,
+    probe_source,
+    queue_ids,
+    review_stats,
+    tag_condition,
+    word_review_stats,
+)
 from .seeds import SAMPLES
+from .sm2 import Schedule, due_ids, new_ids, record_review
+from .weighted_sampler import REWEIGH_MS, ReviewStats, WeightedSampler, word_weight
+from .word_cache import CacheInfo, WordCache
 
 DB_PATH = Path("data/vocab.db")
 SCHEMA_PATH = Path("ref/sqlite3-schema.txt")
 
+# Attempts at a write that still finds the database locked once SQLite's own
+# busy_timeout wait has run out, e.g. behind another process's import.
+WRITE_ATTEMPTS = 5
+# Upper bound in seconds of the first retry's random delay, doubling each time.
+RETRY_DELAY = 0.05
+
+
+def retry_on_busy[**P, T](method: Callable[P, T]) -> Callable[P, T]:
+    """
+    Reruns a write when the database is busy or locked, up to WRITE_ATTEMPTS
+    times. The delays are exponential with full jitter so that competing
+    processes don't keep retrying in lockstep. The method must be safe to
+    rerun from the start, which holds as each write is one transaction.
+    """
+
+    @functools.wraps(method)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        for attempt in range(WRITE_ATTEMPTS - 1):
+            try:
+                return method(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                code = getattr(e, "sqlite_errorcode", 0) & 0xFF
+                if code not in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED):
+                    raise
+                time.sleep(random.uniform(0, RETRY_DELAY * 2**attempt))
+        return method(*args, **kwargs)
+
+    return wrapper
+
 
 class Database:
-    def __init__(self, db_path: Path = DB_PATH):
+    def __init__(
+        self,
+        db_path: Path = DB_PATH,
+        sample_mode: str = "random",
+        cache_size: int = 1024,
+        settings: DatabaseSettings | None = None,
+        seed: int | None = None,
+    ):
+        if sample_mode not in SAMPLE_MODES:
+            raise ValueError(f"Unknown sample mode: {sample_mode}")
+
         self.db_path = db_path
+        self.sample_mode = sample_mode
+        # Every sampling decision draws from this, so a seed makes them
+        # reproducible.
+        self.rng = random.Random(seed)
+        self.cache = WordCache(cache_size)
+        # Random mode: each filter's id range, read on the first refill and
+        # dropped whenever words are added or changed, here or elsewhere as
+        # noticed by _check_cache.
+        self._probe_sources: dict[TagFilter | None, ProbeSource | None] = {}
+        # Weighted mode: a sampler per tag filter, built on first use and
+        # reweighted as results come in, plus the review stats behind them.
+        # Staleness grows for words that aren't reviewed too, so each
+        # sampler is reweighed in full once REWEIGH_MS has passed since it
+        # was built or last reweighed.
+        self._samplers: dict[TagFilter | None, WeightedSampler] = {}
+        self._weighed_at: dict[TagFilter | None, int] = {}
+        self._review_stats: dict[int, ReviewStats] = {}
+        self._sampler_lock = threading.Lock()
+        self.settings = settings or DatabaseSettings()
+        # One long-lived connection per thread, opened lazily and kept
+        # until close() so SQLite's statement cache survives between calls.
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
 
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the calling thread's connection, opening it on first use."""
+        con = getattr(self._local, "con", None)
+        if con is None:
+            # Each connection is only ever used by the thread that opened it,
+            # the flag just allows close() to run from a different thread.
+            con = sqlite3.connect(self.db_path, check_same_thread=False)
+            con.row_factory = sqlite3.Row
+            for pragma in self.settings.pragmas():
+                con.execute(pragma)
+            self._local.con = con
+            with self._lock:
+                self._connections.append(con)
+        return con
+
     @contextmanager
     def get_cursor(
         self, *, commit: bool = False
     ) -> Generator[sqlite3.Cursor, None, None]:
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        con = sqlite3.connect(self.db_path)
-        con.row_factory = sqlite3.Row
-
-        yield con.cursor()
-
-        if commit:
-            con.commit()
-
-        con.close()
-
+        con = self._connection()
+        cur = con.cursor()
+        try:
+            if commit:
+                # Take the write lock up front. A transaction that reads
+                # first and then tries to write can't wait for the lock
+                # (busy_timeout doesn't apply) and fails straight away.
+                cur.execute("BEGIN IMMEDIATE")
+            yield cur
+            if commit:
+                con.commit()
+        finally:
+            cur.close()
+            # Never leave a transaction open on a shared connection: anything
+            # not committed above is discarded, as closing the connection did.
+            if con.in_transaction:
+                con.rollback()
+
+    def close(self) -> None:
+        """Closes every pooled connection. The next call reopens lazily."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for con in connections:
+            con.close()
+        self._local = threading.local()
+
+    @retry_on_busy
     def _init_db(self) -> None:
-        """Initialize the database with schema if tables don't exist."""
+        """
+        Initialize the database with schema if tables don't exist,
+        then apply any pending migrations.
+        """
         # Ensure schema file exists, if not, we can't init
         if not SCHEMA_PATH.exists():
             raise RuntimeError("Database schema missing")
@@ -45,7 +167,11 @@ class Database:
             if not cur.fetchone():
                 with open(SCHEMA_PATH, "r") as f:
                     schema = f.read()
-                cur.executescript(schema)
+                # Statement by statement rather than executescript, which
+                # would commit and let another process in half way through.
+                for statement in schema.split(";"):
+                    if statement.strip():
+                        cur.execute(statement)
 
                 # seed databas with sample data
                 cur.executemany(
@@ -53,114 +179,398 @@ class Database:
                     SAMPLES,
                 )
 
-    def get_random_word(self, tag_filter: str | None = None) -> Word | None:
+        migrate(self._connection())
+
+    def get_random_word(self, tag_filter: str | TagFilter | None = None) -> Word | None:
         """
         Returns a random word object.
         """
-
         with self.get_cursor() as cur:
-            if tag_filter:
-                cur.execute(
-                    "SELECT * FROM words WHERE tag = ? ORDER BY RANDOM() LIMIT 1",
-                    (tag_filter,),
-                )
-            else:
-                cur.execute("SELECT * FROM words ORDER BY RANDOM() LIMIT 1")
-
-            row = cur.fetchone()
+            ids = probe_ids(cur, self.rng, 1, tag_filter)
 
-        if row:
-            return Word(**dict(row))
+        if ids:
+            return self.get_word(ids[0])
 
+    @retry_on_busy
     def get_random_word_ids(
         self,
         limit: int,
-        tag_filter: str | None = None,
-        exclude_ids: list[int] | None = None,
+        tag_filter: str | TagFilter | None = None,
+        exclude_ids: Collection[int] | None = None,
     ) -> list[int]:
         """
         Returns a list of random word IDs.
-        """
-        query = "SELECT id FROM words WHERE 1=1"
-        params = []
 
-        if tag_filter:
-            query += " AND tag = ?"
-            params.append(tag_filter)
+        In "random" mode each call draws independently; in "epoch" mode the
+        filtered deck is walked without repeats before being reshuffled; in
+        "weighted" mode words are drawn in proportion to their error rate
+        and the time since they were last seen.
+        """
+        exclude = set(exclude_ids or ())
 
-        if exclude_ids:
-            placeholders = ",".join("?" * len(exclude_ids))
-            query += f" AND id NOT IN ({placeholders})"
-            params.extend(exclude_ids)
+        if self.sample_mode == "epoch":
+            with self.get_cursor(commit=True) as cur:
+                return next_epoch_ids(cur, self.rng, limit, tag_filter, exclude)
 
-        query += " ORDER BY RANDOM() LIMIT ?"
-        params.append(limit)
+        if self.sample_mode == "weighted":
+            with self._sampler_lock:
+                sampler = self._weighted_sampler(tag_filter)
+                return sampler.sample(self.rng, limit, exclude)
 
         with self.get_cursor() as cur:
-            cur.execute(query, params)
-            rows = cur.fetchall()
-
-        return [row["id"] for row in rows]
+            return probe_ids(cur, self.rng, limit, tag_filter, exclude)
+
+    def _weighted_sampler(self, tag_filter: str | TagFilter | None) -> WeightedSampler:
+        """Returns the filter's sampler, building it on first use."""
+        normalized = TagFilter.of(tag_filter)
+        sampler = self._samplers.get(normalized)
+        now = int(time.time() * 1000)
+        if sampler is None:
+            with self.get_cursor() as cur:
+                stats = review_stats(cur, tag_filter)
+            self._review_stats.update(stats)
+            sampler = WeightedSampler(
+                (word_id, word_weight(word_stats, now)) for word_id, word_stats in stats
+            )
+            self._samplers[normalized] = sampler
+            self._weighed_at[normalized] = now
+        elif now - self._weighed_at[normalized] >= REWEIGH_MS:
+            # Words that left the filter keep no weight.
+            sampler.reweigh(
+                lambda word_id, weight: (
+                    word_weight(self._review_stats[word_id], now) if weight > 0 else 0.0
+                )
+            )
+            self._weighed_at[normalized] = now
+        return sampler
+
+    def _reweight(self, reviews: list[Review]) -> None:
+        """Updates the cached samplers after new reviews, O(log n) each."""
+        with self._sampler_lock:
+            if not self._samplers:
+                return
+            for review in reviews:
+                stats = self._review_stats.get(review.word_id, ReviewStats())
+                last_seen = max(stats.last_seen or review.timestamp, review.timestamp)
+                stats = ReviewStats(
+                    stats.reviews + 1, stats.misses + (not review.correct), last_seen
+                )
+                self._review_stats[review.word_id] = stats
+                weight = word_weight(stats, last_seen)
+                for sampler in self._samplers.values():
+                    # Words that left the filter stay in it with no weight.
+                    if sampler.weight(review.word_id) > 0:
+                        sampler.set_weight(review.word_id, weight)
+
+    def _retag(self, words: dict[int, str | None]) -> None:
+        """
+        Moves words added, retagged or deleted (tag None) into or out of
+        the cached samplers, O(log n) each. A word leaving a filter keeps
+        its slot with no weight.
+        """
+        with self._sampler_lock:
+            if not self._samplers:
+                return
+            missing = [
+                word_id for word_id in words if word_id not in self._review_stats
+            ]
+            if missing:
+                with self.get_cursor() as cur:
+                    found = word_review_stats(cur, missing)
+                for word_id in missing:
+                    self._review_stats[word_id] = found.get(word_id, ReviewStats())
+
+            now = int(time.time() * 1000)
+            for word_id, tag in words.items():
+                tags = split_tags(tag) if tag is not None else None
+                weight = word_weight(self._review_stats[word_id], now)
+                for tag_filter, sampler in self._samplers.items():
+                    matches = tags is not None and (
+                        tag_filter is None or tag_filter.matches(tags)
+                    )
+                    if not matches:
+                        if word_id in sampler:
+                            sampler.set_weight(word_id, 0.0)
+                    elif sampler.weight(word_id) <= 0:
+                        sampler.set_weight(word_id, weight)
 
     def get_incorrect_word_ids(
         self,
         limit: int,
-        tag_filter: str | None = None,
-        exclude_ids: list[int] | None = None,
+        tag_filter: str | TagFilter | None = None,
+        exclude_ids: Collection[int] | None = None,
     ) -> list[int]:
         """
         Returns a list of word IDs that were last answered incorrectly.
         """
-
-        query = """
+        condition, params = tag_condition(tag_filter, column="w.id", per_row=True)
+        excluded, excluded_params = exclude_condition(exclude_ids, "lt.word_id")
+        # CROSS JOIN keeps the (small) partial index of missed words as the
+        # outer loop rather than walking every word carrying the tag.
+        query = f"""
             SELECT w.id
-            FROM words w
-            JOIN last_tested lt ON w.id = lt.word_id
-            WHERE lt.last_correct = 0
+            FROM last_tested lt
+            CROSS JOIN words w ON w.id = lt.word_id
+            WHERE lt.last_correct = 0 AND {condition} AND {excluded}
+        """
+
+        with self.get_cursor() as cur:
+            cur.execute(query, params + excluded_params)
+            rows = cur.fetchall()
+
+        # Only the (small) set of missed words is read, so sampling it in
+        # Python avoids having SQLite sort it by RANDOM().
+        ids = [row["id"] for row in rows]
+        return self.rng.sample(ids, min(limit, len(ids)))
+
+    def build_queue(
+        self,
+        size: int,
+        tag_filter: str | TagFilter | None = None,
+        exclude_ids: Collection[int] | None = None,
+        incorrect_ratio: float = 1.0,
+    ) -> list[int]:
+        """
+        Returns up to `size` word IDs for a quiz queue: words last answered
+        incorrectly first, up to `incorrect_ratio` of the queue, then random
+        words. In random mode that is a single statement once the filter's
+        id range is cached, with a follow-up query only when its probes come
+        up short.
         """
-        params = []
+        if not 0 <= incorrect_ratio <= 1:
+            raise ValueError(
+                f"Incorrect ratio must be between 0 and 1: {incorrect_ratio}"
+            )
+
+        max_incorrect = round(size * incorrect_ratio)
+        if self.sample_mode != "random":
+            # queue_ids only knows the probes, the other modes draw through
+            # get_random_word_ids below.
+            ids = self.get_incorrect_word_ids(max_incorrect, tag_filter, exclude_ids)
+        else:
+            normalized = TagFilter.of(tag_filter)
+            with self.get_cursor() as cur:
+                if normalized not in self._probe_sources:
+                    self._probe_sources[normalized] = probe_source(cur, normalized)
+                source = self._probe_sources[normalized]
+                ids = queue_ids(
+                    cur, self.rng, source, size, normalized, exclude_ids, max_incorrect
+                )
+
+        if len(ids) < size:
+            ids += self.get_random_word_ids(
+                size - len(ids), tag_filter, set(exclude_ids or ()) | set(ids)
+            )
+        return ids
 
-        if tag_filter:
-            query += " AND w.tag = ?"
-            params.append(tag_filter)
+    def get_due_word_ids(
+        self,
+        limit: int,
+        tag_filter: str | TagFilter | None = None,
+        exclude_ids: Collection[int] | None = None,
+        now: int | None = None,
+    ) -> list[int]:
+        """Returns IDs of words due for review by `now` (unix ms), most overdue first."""
+        if now is None:
+            now = int(time.time() * 1000)
+        with self.get_cursor() as cur:
+            return due_ids(cur, now, limit, tag_filter, exclude_ids)
 
-        if exclude_ids:
-            placeholders = ",".join("?" * len(exclude_ids))
-            query += f" AND w.id NOT IN ({placeholders})"
-            params.extend(exclude_ids)
+    def get_new_word_ids(
+        self,
+        limit: int,
+        tag_filter: str | TagFilter | None = None,
+        exclude_ids: Collection[int] | None = None,
+    ) -> list[int]:
+        """Returns IDs of words that have never been reviewed, oldest first."""
+        with self.get_cursor() as cur:
+            return new_ids(cur, limit, tag_filter, exclude_ids)
 
-        query += " ORDER BY RANDOM() LIMIT ?"
-        params.append(limit)
+    def get_schedule(self, word_id: int) -> Schedule | None:
+        with self.get_cursor() as cur:
+            cur.execute(
+                "SELECT word_id, due_at, stability, difficulty, reps"
+                " FROM schedule WHERE word_id = ?",
+                (word_id,),
+            )
+            row = cur.fetchone()
+        return Schedule(*row) if row else None
 
+    def get_failure_counts(self, word_ids: Iterable[int]) -> dict[int, FailureCounts]:
+        """
+        Returns the failure counters of the given words in one query, by
+        primary key. Words never failed or never reviewed are left out.
+        """
+        ids = list(dict.fromkeys(word_ids))
+        if not ids:
+            return {}
         with self.get_cursor() as cur:
-            cur.execute(query, params)
-            rows = cur.fetchall()
+            cur.execute(
+                "SELECT word_id, failures, streak FROM failure_counts"
+                " WHERE word_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(ids),),
+            )
+            return {row[0]: FailureCounts(row[1], row[2]) for row in cur.fetchall()}
 
-        return [row["id"] for row in rows]
+    def get_leeches(self, threshold: int) -> list[tuple[Word, FailureCounts]]:
+        """Words failed at least `threshold` times, most failed first."""
+        with self.get_cursor() as cur:
+            cur.execute(
+                "SELECT word_id, failures, streak FROM failure_counts"
+                " WHERE failures >= ? ORDER BY failures DESC, word_id",
+                (max(threshold, 1),),
+            )
+            counts = {row[0]: FailureCounts(row[1], row[2]) for row in cur.fetchall()}
+        return [
+            (word, counts[word.id])
+            for word in self.get_words(counts)
+            if word.id is not None
+        ]
+
+    def stream_rows(
+        self, query: str, params: Iterable = (), batch_size: int = 1000
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Yields the rows of a query in fetchmany batches, so memory use stays
+        flat however many rows match.
+        """
+        with self.get_cursor() as cur:
+            cur.execute(query, list(params))
+            while rows := cur.fetchmany(batch_size):
+                yield from rows
 
     def get_tags(self) -> list[str]:
         """
         Returns a list of all unique tags, ordered by the ID of the most recent word using that tag.
         """
+        return [stats.name for stats in self.get_tag_stats()]
+
+    def get_tag_stats(self) -> list[TagStats]:
+        """
+        Returns every tag in use with its word count, newest word and last
+        review, in get_tags order. Reads the trigger-maintained tag_stats
+        table, so the cost depends on the number of tags, not words.
+        """
         with self.get_cursor() as cur:
             cur.execute(
-                "SELECT tag, MAX(id) as max_id FROM words GROUP BY tag ORDER BY max_id DESC"
+                """
+                SELECT t.name, s.word_count, s.max_word_id, s.last_used
+                FROM tag_stats s
+                JOIN tags t ON t.id = s.tag_id
+                ORDER BY s.max_word_id DESC, s.tag_id DESC
+                """
             )
             rows = cur.fetchall()
 
-        return [row["tag"] for row in rows]
+        return [TagStats(*row) for row in rows]
+
+    def _check_cache(self) -> None:
+        """
+        Clears the word cache and the cached id ranges if another
+        connection, possibly in another
+        process, has committed since this thread last looked. SQLite bumps
+        a connection's data_version for every such commit, and reading it
+        costs no I/O.
+        """
+        cur = self._connection().execute("PRAGMA data_version")
+        version = cur.fetchone()[0]
+        if version != getattr(self._local, "data_version", None):
+            self.cache.invalidate()
+            self._probe_sources.clear()
+            self._local.data_version = version
 
     def get_word(self, word_id: int) -> Word | None:
         """
         Returns a word object by ID.
         """
+        self._check_cache()
+        word = self.cache.get(word_id)
+        if word is not None:
+            return word
+
         with self.get_cursor() as cur:
             cur.execute("SELECT * FROM words WHERE id = ?", (word_id,))
             row = cur.fetchone()
 
         if row:
-            return Word(**dict(row))
+            word = Word(**dict(row))
+            self.cache.put(word)
+            return word
 
+    def get_words(self, word_ids: Iterable[int]) -> list[Word]:
+        """
+        Returns the words with the given IDs in one query, in the order given.
+        IDs that no longer exist are skipped.
+        """
+        ids = list(word_ids)
+        found: dict[int, Word] = {}
+        self._check_cache()
+        for word_id in dict.fromkeys(ids):
+            word = self.cache.get(word_id)
+            if word is not None:
+                found[word_id] = word
+
+        missing = [word_id for word_id in dict.fromkeys(ids) if word_id not in found]
+        if missing:
+            with self.get_cursor() as cur:
+                cur.execute(
+                    "SELECT * FROM words WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(missing),),
+                )
+                rows = cur.fetchall()
+            for row in rows:
+                word = Word(**dict(row))
+                self.cache.put(word)
+                found[row["id"]] = word
+
+        return [found[word_id] for word_id in ids if word_id in found]
+
+    def search_words(self, query: str, limit: int = 20, offset: int = 0) -> list[Word]:
+        """
+        Returns words whose text contains every term of the query.
+
+        Terms of three or more characters go through the trigram index and
+        every hit is ranked with bm25, keeping only the requested page while
+        sorting. Shorter terms can't use the index and are checked with LIKE;
+        a query made only of those is returned in id order.
+        """
+        terms = query.split()
+        if not terms:
+            return []
+
+        long_terms = [term for term in terms if len(term) >= 3]
+        conditions, params = ["1=1"], []
+        for term in terms:
+            if len(term) < 3:
+                pattern = "%" + re.sub(r"([\\%_])", r"\\\1", term) + "%"
+                columns = [
+                    f"w.{column} LIKE ? ESCAPE '\\'" for column in SEARCH_COLUMNS
+                ]
+                conditions.append("(" + " OR ".join(columns) + ")")
+                params += [pattern] * len(SEARCH_COLUMNS)
+        condition = " AND ".join(conditions)
+
+        if long_terms:
+            # Quoted so punctuation in the query isn't read as FTS5 syntax.
+            match = " ".join('"' + term.replace('"', '""') + '"' for term in long_terms)
+            # Hits in the word itself outrank hits in the example sentences.
+            sql = f"""
+                SELECT w.* FROM words_fts JOIN words w ON w.id = words_fts.rowid
+                WHERE words_fts MATCH ? AND {condition}
+                ORDER BY bm25(words_fts, 10.0, 10.0, 10.0, 1.0, 1.0), w.id
+                LIMIT ? OFFSET ?
+            """
+            params = [match] + params
+        else:
+            sql = f"SELECT * FROM words w WHERE {condition} ORDER BY w.id LIMIT ? OFFSET ?"
+
+        with self.get_cursor() as cur:
+            cur.execute(sql, params + [limit, offset])
+            rows = cur.fetchall()
+
+        return [Word(**dict(row)) for row in rows]
+
+    @retry_on_busy
     def update_word(self, word: Word) -> None:
         """Updates an existing word in the database."""
         if word.id is None:
@@ -179,40 +589,188 @@ class Database:
                     word.id,
                 ),
             )
+            updated = cur.rowcount > 0
+
+        # The word's tag may have changed, moving it between filters.
+        self._probe_sources.clear()
+        self._retag({word.id: word.tag if updated else None})
+
+        # Write-through, so the next read of this word needs no query.
+        if updated:
+            self.cache.put(word)
+        else:
+            self.cache.invalidate([word.id])
 
     def add_word(self, word: Word) -> None:
         """Adds a new word to the database."""
+        self.add_words([word])
 
+    def add_words(
+        self, words: Iterable[Word], checkpoint: tuple[str, int] | None = None
+    ) -> int:
+        """
+        Adds many words in a single transaction, returning how many were added.
+        A (source, rows) checkpoint is saved in the same transaction.
+        """
+        # Materialized so that a retried transaction sees the same words.
+        return self._add_words(list(words), checkpoint)
+
+    @retry_on_busy
+    def _add_words(self, words: list[Word], checkpoint: tuple[str, int] | None) -> int:
         with self.get_cursor(commit=True) as cur:
-            cur.execute(
+            # Ids above the current maximum may have belonged to deleted
+            # words, and new rows can take them over.
+            cur.execute("SELECT MAX(id) FROM words")
+            max_id = cur.fetchone()[0] or 0
+            cur.executemany(
                 "INSERT INTO words (kanji_word, kana_word, english_word, japanese_sentence, english_sentence, tag) VALUES (?, ?, ?, ?, ?, ?)",
                 (
-                    word.kanji_word,
-                    word.kana_word,
-                    word.english_word,
-                    word.japanese_sentence,
-                    word.english_sentence,
-                    word.tag,
+                    (
+                        word.kanji_word,
+                        word.kana_word,
+                        word.english_word,
+                        word.japanese_sentence,
+                        word.english_sentence,
+                        word.tag,
+                    )
+                    for word in words
                 ),
             )
+            added = max(cur.rowcount, 0)
 
-    def record_result(self, word_id: int, correct: bool) -> None:
-        """Records the result of a test."""
-        # This is a placeholder for future logic (e.g. spaced repetition)
-        with self.get_cursor(commit=True) as cur:
-            # Check if exists
-            cur.execute("SELECT id FROM last_tested WHERE word_id = ?", (word_id,))
+            if checkpoint:
+                cur.execute(
+                    """
+                    INSERT INTO import_checkpoints (source, rows, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(source) DO UPDATE SET
+                        rows = excluded.rows,
+                        updated_at = excluded.updated_at
+                    """,
+                    (*checkpoint, int(time.time())),
+                )
+
+        self.cache.invalidate_above(max_id)
+        self._probe_sources.clear()
+        if self._samplers:
+            with self.get_cursor() as cur:
+                cur.execute("SELECT id, tag FROM words WHERE id > ?", (max_id,))
+                added_tags = {row[0]: row[1] for row in cur.fetchall()}
+            self._retag(added_tags)
+        return added
+
+    def cache_info(self) -> CacheInfo:
+        """Hit/miss counters and size of the Word cache."""
+        return self.cache.info()
+
+    def get_import_checkpoint(self, source: str) -> int:
+        """Returns how many rows of an import source were already committed."""
+        with self.get_cursor() as cur:
+            cur.execute(
+                "SELECT rows FROM import_checkpoints WHERE source = ?", (source,)
+            )
             row = cur.fetchone()
 
-            timestamp = int(time.time())
+        return row["rows"] if row else 0
 
-            if row:
-                cur.execute(
-                    "UPDATE last_tested SET last_seen = ?, last_correct = ? WHERE word_id = ?",
-                    (timestamp, 1 if correct else 0, word_id),
-                )
-            else:
+    @retry_on_busy
+    def clear_import_checkpoint(self, source: str) -> None:
+        with self.get_cursor(commit=True) as cur:
+            cur.execute("DELETE FROM import_checkpoints WHERE source = ?", (source,))
+
+    def record_result(
+        self,
+        word_id: int,
+        correct: bool,
+        *,
+        kana_correct: bool | None = None,
+        meaning_correct: bool | None = None,
+        response_ms: int | None = None,
+    ) -> None:
+        """Records the result of a test."""
+        self.record_results(
+            [Review.now(word_id, correct, kana_correct, meaning_correct, response_ms)]
+        )
+
+    @retry_on_busy
+    def record_results(self, reviews: list[Review]) -> None:
+        """
+        Appends a batch of reviews to the history in one transaction and
+        reschedules the reviewed words. last_tested is kept up to date by a
+        trigger on the reviews table.
+        """
+        inserted = []
+        with self.get_cursor(commit=True) as cur:
+            for review in reviews:
                 cur.execute(
-                    "INSERT INTO last_tested (word_id, last_seen, last_correct) VALUES (?, ?, ?)",
-                    (word_id, timestamp, 1 if correct else 0),
+                    """
+                    INSERT OR IGNORE INTO reviews
+                        (word_id, ts, kana_correct, meaning_correct, response_ms)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    review,
                 )
+                if not cur.rowcount:
+                    # The word already has a review at that millisecond.
+                    placed = _free_review_slot(cur, review)
+                    if placed is None:
+                        continue
+                    review = placed
+                    cur.execute(
+                        """
+                        INSERT INTO reviews
+                            (word_id, ts, kana_correct, meaning_correct, response_ms)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        review,
+                    )
+                record_review(cur, review)
+                inserted.append(review)
+
+        self._reweight(inserted)
+
+    def get_reviews(self, word_id: int) -> list[Review]:
+        """Returns the review history of a word, oldest first."""
+        with self.get_cursor() as cur:
+            cur.execute(
+                """
+                SELECT word_id, ts, kana_correct, meaning_correct, response_ms
+                FROM reviews WHERE word_id = ? ORDER BY ts
+                """,
+                (word_id,),
+            )
+            rows = cur.fetchall()
+
+        return [
+            Review(
+                row["word_id"],
+                row["ts"],
+                bool(row["kana_correct"]),
+                bool(row["meaning_correct"]),
+                row["response_ms"],
+            )
+            for row in rows
+        ]
+
+
+def _free_review_slot(cur: sqlite3.Cursor, review: Review) -> Review | None:
+    """
+    Places a review whose (word_id, ts) key is taken. The same answer
+    already recorded there (or a millisecond or two later, where an earlier
+    clash moved it) is a replay, e.g. of a recorder journal, and gives None
+    so the word isn't rescheduled twice. A different answer, given in the
+    same millisecond by another process, moves to the next free one.
+    """
+    ts = review.timestamp
+    while True:
+        cur.execute(
+            "SELECT kana_correct, meaning_correct, response_ms FROM reviews"
+            " WHERE word_id = ? AND ts = ?",
+            (review.word_id, ts),
+        )
+        row = cur.fetchone()
+        if row is None:
+            return review._replace(timestamp=ts)
+        if (bool(row[0]), bool(row[1]), row[2]) == review[2:]:
+            return None
+        ts += 1
@@ -6,7 +6,7 @@ from textual.screen import Screen
 from textual.widgets import Button, Input, Label, Static
 from pydantic import ValidationError
 
-from .db import Database
+from .async_db import AsyncDatabase
 from .models import Word
 from .ai_service import AIService, AIServiceError
 
@@ -14,7 +14,7 @@ from .ai_service import AIService, AIServiceError
 class EditWordScreen(Screen):
     CSS_PATH = "styles.tcss"
 
-    def __init__(self, db: Database, word_id: int):
+    def __init__(self, db: AsyncDatabase, word_id: int):
         super().__init__()
         self.db = db
         self.word_id = word_id
@@ -54,8 +54,8 @@ class EditWordScreen(Screen):
             id="add_word_container",
         )
 
-    def on_mount(self) -> None:
-        word = self.db.get_word(self.word_id)
+    async def on_mount(self) -> None:
+        word = await self.db.get_word(self.word_id)
         if word:
             self.query_one("#kanji", Input).value = word.kanji_word
             self.query_one("#kana", Input).value = word.kana_word
@@ -64,11 +64,11 @@ class EditWordScreen(Screen):
             self.query_one("#en_sentence", Input).value = word.english_sentence
             self.query_one("#tag", Input).value = word.tag
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:
+    async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "cancel_btn":
             self.dismiss(False)
         elif event.button.id == "save_btn":
-            self.save_word()
+            await self.save_word()
         elif event.button.id == "generate_btn":
             self.generate_ai_data()
 
@@ -114,7 +114,7 @@ class EditWordScreen(Screen):
         finally:
             generate_btn.disabled = False
 
-    def save_word(self) -> None:
+    async def save_word(self) -> None:
         kanji = self.query_one("#kanji", Input).value.strip()
         kana = self.query_one("#kana", Input).value.strip()
         english = self.query_one("#english", Input).value.strip()
@@ -136,7 +136,7 @@ class EditWordScreen(Screen):
             )
 
             word.id = self.word_id
-            self.db.update_word(word)
+            await self.db.update_word(word)
             self.dismiss(True)
 
         except ValidationError as e:
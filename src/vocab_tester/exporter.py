@@ -0,0 +1,64 @@
+import csv
+import json
+from typing import TextIO
+
+from .db import Database
+from .importer import FORMATS
+from .models import TagFilter
+from .sampling import tag_condition
+
+# Every export walks its table in primary key order, so no sort is needed.
+EXPORTS = {
+    "words": (
+        "SELECT w.id, w.kanji_word, w.japanese_sentence, w.kana_word,"
+        " w.english_word, w.english_sentence, w.tag"
+        " FROM words w WHERE {condition} ORDER BY w.id"
+    ),
+    "reviews": (
+        "SELECT r.word_id, r.ts, r.kana_correct, r.meaning_correct, r.response_ms"
+        " FROM reviews r JOIN words w ON w.id = r.word_id"
+        " WHERE {condition} ORDER BY r.word_id, r.ts"
+    ),
+    "last_tested": (
+        "SELECT lt.word_id, lt.last_seen, lt.last_correct"
+        " FROM last_tested lt JOIN words w ON w.id = lt.word_id"
+        " WHERE {condition} ORDER BY lt.word_id"
+    ),
+}
+
+
+def export_table(
+    db: Database,
+    table: str,
+    out: TextIO,
+    fmt: str = "csv",
+    tag_filter: str | TagFilter | None = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Streams a table to `out`, restricted to words matching the tag filter.
+    Returns the number of rows written.
+    """
+    if table not in EXPORTS:
+        raise ValueError(f"Unknown export: {table}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    condition, params = tag_condition(tag_filter, column="w.id")
+    rows = db.stream_rows(
+        EXPORTS[table].format(condition=condition), params, batch_size
+    )
+
+    written = 0
+    writer = None
+    for row in rows:
+        if fmt == "jsonl":
+            out.write(json.dumps(dict(row), ensure_ascii=False) + "\n")
+        else:
+            if writer is None:
+                writer = csv.writer(out, delimiter="\t" if fmt == "tsv" else ",")
+                writer.writerow(row.keys())
+            writer.writerow(tuple(row))
+        written += 1
+
+    return written
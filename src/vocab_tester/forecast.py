@@ -0,0 +1,159 @@
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from .db import Database
+from .sm2 import DAY_MS, INITIAL_EASE, MIN_EASE
+
+FORECAST_DAYS = 90
+
+# New words introduced per day, first answered on the day they come up.
+NEW_PER_DAY = 20
+
+# Chance of recalling a word on its due date when the history is too short
+# to measure it.
+DEFAULT_RETENTION = 0.9
+
+# How many of the latest reviews the retention is measured over, and how
+# many it takes to trust the measurement.
+RETENTION_SAMPLE = 1000
+MIN_RETENTION_SAMPLE = 50
+
+
+class DeckState(NamedTuple):
+    """
+    The SM-2 state of every word as parallel arrays: due is the day the
+    word is next due (0 is today, negative is overdue), stability the
+    current interval in days, 0 for words never answered.
+    """
+
+    due: np.ndarray
+    stability: np.ndarray
+    ease: np.ndarray
+    reps: np.ndarray
+    new_words: int
+    retention: float
+
+
+class Forecast(NamedTuple):
+    """Answers expected per day: reviews of known words, new words, lapses."""
+
+    reviews: np.ndarray
+    new: np.ndarray
+    lapses: np.ndarray
+
+
+def load_state(db: Database, now: int | None = None) -> DeckState:
+    """
+    Reads the schedule of every word. Words answered before the review
+    history was kept only have last_tested, so they are taken to be due a
+    day after they were last seen.
+    """
+    now = int(time.time() * 1000) if now is None else now
+    with db.get_cursor() as cur:
+        cur.execute(
+            "SELECT s.due_at, s.stability, s.difficulty, s.reps"
+            " FROM schedule s CROSS JOIN words w ON w.id = s.word_id"
+        )
+        scheduled = np.array(
+            [tuple(row) for row in cur.fetchall()], dtype=np.float64
+        ).reshape(-1, 4)
+
+        cur.execute(
+            """
+            SELECT lt.last_seen, lt.last_correct
+            FROM last_tested lt
+            JOIN words w ON w.id = lt.word_id
+            WHERE NOT EXISTS (SELECT 1 FROM schedule s WHERE s.word_id = lt.word_id)
+            """
+        )
+        legacy = np.array(
+            [tuple(row) for row in cur.fetchall()], dtype=np.float64
+        ).reshape(-1, 2)
+
+        cur.execute(
+            """
+            SELECT COUNT(*) FROM words w
+            WHERE NOT EXISTS (SELECT 1 FROM schedule s WHERE s.word_id = w.id)
+            AND NOT EXISTS (SELECT 1 FROM last_tested lt WHERE lt.word_id = w.id)
+            """
+        )
+        new_words = cur.fetchone()[0]
+
+        cur.execute(
+            "SELECT COUNT(*), SUM(kana_correct AND meaning_correct) FROM"
+            " (SELECT kana_correct, meaning_correct FROM reviews"
+            " ORDER BY ts DESC LIMIT ?)",
+            (RETENTION_SAMPLE,),
+        )
+        answered, correct = cur.fetchone()
+
+    retention = (
+        correct / answered if answered >= MIN_RETENTION_SAMPLE else DEFAULT_RETENTION
+    )
+    legacy_due = legacy[:, 0] * 1000 + DAY_MS
+    return DeckState(
+        due=np.floor((np.concatenate([scheduled[:, 0], legacy_due]) - now) / DAY_MS),
+        stability=np.concatenate([scheduled[:, 1], np.ones(len(legacy))]),
+        ease=np.concatenate([scheduled[:, 2], np.full(len(legacy), INITIAL_EASE)]),
+        reps=np.concatenate([scheduled[:, 3], legacy[:, 1]]).astype(np.int64),
+        new_words=new_words,
+        retention=retention,
+    )
+
+
+def simulate(
+    state: DeckState,
+    days: int = FORECAST_DAYS,
+    new_per_day: int = NEW_PER_DAY,
+    seed: int | None = None,
+) -> Forecast:
+    """
+    Plays the schedule forward a day at a time, every due word in one go.
+    A word is recalled with probability retention ** (1 + days overdue /
+    interval) and rescheduled as SM-2 would (see sm2.next_schedule, with
+    recalled answers graded 4 and forgotten ones 0).
+    """
+    rng = np.random.default_rng(seed)
+    introduced = min(state.new_words, days * new_per_day) if new_per_day > 0 else 0
+    # New words join as never answered, each due on the day it comes up.
+    due = np.concatenate(
+        [state.due, np.arange(introduced, dtype=np.float64) // max(new_per_day, 1)]
+    )
+    stability = np.concatenate([state.stability, np.zeros(introduced)])
+    ease = np.concatenate([state.ease, np.full(introduced, INITIAL_EASE)])
+    reps = np.concatenate([state.reps, np.zeros(introduced, dtype=np.int64)])
+
+    reviews = np.zeros(days, dtype=np.int64)
+    new = np.zeros(days, dtype=np.int64)
+    lapses = np.zeros(days, dtype=np.int64)
+    for day in range(days):
+        idx = np.flatnonzero(due <= day)
+        interval = stability[idx]
+        first = interval == 0
+        overdue = day - due[idx]
+        recall = state.retention ** (1 + overdue / np.maximum(interval, 1))
+        recalled = rng.random(idx.size) < recall
+
+        quality = np.where(recalled, 4, 0)
+        word_ease = np.maximum(
+            MIN_EASE, ease[idx] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+        )
+        word_reps = np.where(recalled, reps[idx] + 1, 0)
+        interval = np.select(
+            [~recalled | (word_reps == 1), word_reps == 2],
+            [1.0, 6.0],
+            interval * word_ease,
+        )
+
+        ease[idx] = word_ease
+        reps[idx] = word_reps
+        stability[idx] = interval
+        due[idx] = day + np.maximum(np.rint(interval), 1)
+
+        new[day] = np.count_nonzero(first)
+        reviews[day] = idx.size - new[day]
+        lapses[day] = np.count_nonzero(~recalled & ~first)
+
+    return Forecast(reviews, new, lapses)
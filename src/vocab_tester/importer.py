@@ -0,0 +1,134 @@
+from dataclasses import dataclass, field
+import csv
+import itertools
+import json
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from pydantic import ValidationError
+
+from .db import Database
+from .models import Word
+
+FORMATS = ("csv", "tsv", "jsonl")
+CHUNK_SIZE = 5000
+
+# Only the first few bad rows are kept for the report.
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    resumed_from: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def detect_format(path: Path) -> str:
+    """Guesses the file format from its extension."""
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in ("jsonl", "ndjson"):
+        return "jsonl"
+    if suffix in ("tsv", "tab"):
+        return "tsv"
+    return "csv"
+
+
+def read_rows(path: Path, fmt: str) -> Iterator[object]:
+    """
+    Streams the rows of a CSV/TSV file (with a header) or a JSONL file. A
+    JSONL line that doesn't parse is yielded as its JSONDecodeError, so it
+    is reported as a bad row rather than ending the import.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        if fmt == "jsonl":
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield e
+        else:
+            delimiter = "\t" if fmt == "tsv" else ","
+            yield from csv.DictReader(f, delimiter=delimiter)
+
+
+def parse_words(
+    rows: Iterable[object], default_tag: str | None = None, start: int = 0
+) -> Iterator[tuple[int, Word | str]]:
+    """
+    Validates rows against the Word model, yielding (row number, Word) or
+    (row number, error message) for rows that don't validate.
+    """
+    for number, row in enumerate(rows, start=start + 1):
+        if isinstance(row, json.JSONDecodeError):
+            yield number, f"row {number}: invalid JSON ({row.msg})"
+            continue
+        if not isinstance(row, dict):
+            yield number, f"row {number}: not a JSON object"
+            continue
+        values = {name: row.get(name) for name in Word.model_fields if name != "id"}
+        if not values["tag"]:
+            values["tag"] = default_tag or "none"
+        try:
+            yield number, Word.model_validate(values)
+        except ValidationError as e:
+            err = e.errors()[0]
+            yield number, f"row {number}: {err['loc'][0]} {err['msg']}"
+
+
+def import_file(
+    db: Database,
+    path: Path,
+    fmt: str | None = None,
+    *,
+    default_tag: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    restart: bool = False,
+    progress: Callable[[ImportResult], None] | None = None,
+) -> ImportResult:
+    """
+    Streams a vocabulary file into the database in chunked transactions.
+
+    The number of source rows consumed is checkpointed in the same
+    transaction as each chunk, so an interrupted import resumes after the
+    last committed chunk. The checkpoint is removed once the file is done.
+    """
+    fmt = fmt or detect_format(path)
+    source = _source_key(path)
+    result = ImportResult()
+
+    if restart:
+        db.clear_import_checkpoint(source)
+    result.resumed_from = db.get_import_checkpoint(source)
+
+    rows = itertools.islice(read_rows(path, fmt), result.resumed_from, None)
+    parsed = parse_words(rows, default_tag, start=result.resumed_from)
+
+    for chunk in itertools.batched(parsed, chunk_size):
+        words = []
+        for number, item in chunk:
+            if isinstance(item, Word):
+                words.append(item)
+            else:
+                result.skipped += 1
+                if len(result.errors) < MAX_REPORTED_ERRORS:
+                    result.errors.append(item)
+
+        result.inserted += db.add_words(words, checkpoint=(source, number))
+        result.rows = number - result.resumed_from
+        if progress:
+            progress(result)
+
+    db.clear_import_checkpoint(source)
+    return result
+
+
+def _source_key(path: Path) -> str:
+    """Identifies an input file; a file that changed size starts over."""
+    return f"{path.resolve()}:{path.stat().st_size}"
@@ -0,0 +1,37 @@
+from typing import NamedTuple
+
+from .models import Review
+
+# "allow" treats leeches like any other word, "cap" re-queues a missed
+# leech once rather than twice and keeps only a few in the queue at a time,
+# "isolate" leaves them out of sessions until they are reworked.
+LEECH_MODES = ("allow", "cap", "isolate")
+
+# The failures the leeches command lists words at when neither --threshold
+# nor the config's leech_threshold (0 by default, so sessions ignore
+# leeches) says otherwise.
+LEECH_THRESHOLD = 8
+
+
+class FailureCounts(NamedTuple):
+    """How often a word was answered incorrectly, overall and in a row."""
+
+    failures: int = 0
+    streak: int = 0
+
+
+def next_counts(counts: FailureCounts, correct: bool) -> FailureCounts:
+    """Applies one answer; mirrors the reviews_failure_counts trigger."""
+    if correct:
+        return FailureCounts(counts.failures, 0)
+    return FailureCounts(counts.failures + 1, counts.streak + 1)
+
+
+def replay_counts(reviews: list[Review]) -> dict[int, FailureCounts]:
+    """Counts per word from a history sorted by word and time."""
+    counts: dict[int, FailureCounts] = {}
+    for review in reviews:
+        counts[review.word_id] = next_counts(
+            counts.get(review.word_id, FailureCounts()), review.correct
+        )
+    return counts
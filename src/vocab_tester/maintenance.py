@@ -0,0 +1,79 @@
+import time
+from typing import NamedTuple
+
+from .db import Database, retry_on_busy
+
+# Rough cap on the rows ANALYZE reads per index, so optimize stays quick on
+# big decks while still giving the planner usable statistics.
+ANALYSIS_LIMIT = 1000
+
+
+class MaintenanceReport(NamedTuple):
+    pages_before: int
+    pages_after: int
+    page_size: int
+    problems: list[str]
+    seconds: float
+
+    @property
+    def pages_reclaimed(self) -> int:
+        return self.pages_before - self.pages_after
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return self.pages_reclaimed * self.page_size
+
+
+def maintain(db: Database) -> MaintenanceReport:
+    """
+    Tidies up a database that is in use: returns free pages to the file
+    system, refreshes the query planner's statistics and runs a quick
+    integrity check. Other processes can keep reading throughout.
+    """
+    started = time.perf_counter()
+    page_size, pages_before = _page_counts(db)
+    _incremental_vacuum(db)
+    _optimize(db)
+    problems = quick_check(db)
+    _, pages_after = _page_counts(db)
+    return MaintenanceReport(
+        pages_before,
+        pages_after,
+        page_size,
+        problems,
+        time.perf_counter() - started,
+    )
+
+
+def quick_check(db: Database) -> list[str]:
+    """Returns the problems PRAGMA quick_check finds, if any."""
+    with db.get_cursor() as cur:
+        cur.execute("PRAGMA quick_check")
+        rows = [row[0] for row in cur.fetchall()]
+    return [] if rows == ["ok"] else rows
+
+
+def _page_counts(db: Database) -> tuple[int, int]:
+    with db.get_cursor() as cur:
+        cur.execute("PRAGMA page_size")
+        page_size = cur.fetchone()[0]
+        cur.execute("PRAGMA page_count")
+        return page_size, cur.fetchone()[0]
+
+
+@retry_on_busy
+def _incremental_vacuum(db: Database) -> None:
+    with db.get_cursor() as cur:
+        # Frees one page per result row, so every row has to be stepped.
+        cur.execute("PRAGMA incremental_vacuum").fetchall()
+        # In WAL mode the file only shrinks once the WAL is checkpointed.
+        cur.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+
+@retry_on_busy
+def _optimize(db: Database) -> None:
+    with db.get_cursor() as cur:
+        cur.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        # 0x10002: analyze every table that needs it, not just the ones this
+        # connection happened to query.
+        cur.execute("PRAGMA optimize = 0x10002").fetchall()
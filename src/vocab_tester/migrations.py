@@ -0,0 +1,465 @@
+import sqlite3
+from typing import Callable
+
+from .leeches import replay_counts
+from .models import Review
+from .sampling import EPOCH_SCHEMA
+from .sm2 import Schedule, next_schedule
+
+# PRAGMA auto_vacuum value of INCREMENTAL.
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _v1_indexes(cur: sqlite3.Cursor) -> None:
+    """Indexes for the hot queries and one last_tested row per word."""
+    # Tag filters and get_tags; the rowid is implicitly part of the key,
+    # so "tag = ? AND id >= ?" probes are a single index seek.
+    # (Dropped again in v4 once tags moved to word_tags.)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_words_tag ON words(tag)")
+
+    # Older databases could end up with several rows per word, keep the newest.
+    cur.execute(
+        "DELETE FROM last_tested WHERE id NOT IN "
+        "(SELECT MAX(id) FROM last_tested GROUP BY word_id)"
+    )
+    cur.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_last_tested_word_id "
+        "ON last_tested(word_id)"
+    )
+    # Only the words last answered incorrectly, for get_incorrect_word_ids.
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_last_tested_incorrect "
+        "ON last_tested(word_id) WHERE last_correct = 0"
+    )
+
+    for statement in EPOCH_SCHEMA.split(";"):
+        if statement.strip():
+            cur.execute(statement)
+
+
+def _v2_reviews(cur: sqlite3.Cursor) -> None:
+    """Append-only review history that keeps last_tested up to date."""
+    # Clustered on (word_id, ts) so a word's history is one contiguous range.
+    # Timestamps are unix milliseconds; 0/1 flags take no payload bytes.
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reviews (
+        word_id INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        kana_correct INTEGER NOT NULL,
+        meaning_correct INTEGER NOT NULL,
+        response_ms INTEGER,
+        PRIMARY KEY (word_id, ts)) WITHOUT ROWID
+        """
+    )
+    # last_tested becomes derived data: the newest review per word.
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS reviews_maintain_last_tested
+        AFTER INSERT ON reviews
+        BEGIN
+            INSERT INTO last_tested (word_id, last_seen, last_correct)
+            VALUES (
+                NEW.word_id,
+                NEW.ts / 1000,
+                NEW.kana_correct AND NEW.meaning_correct
+            )
+            ON CONFLICT(word_id) DO UPDATE SET
+                last_seen = excluded.last_seen,
+                last_correct = excluded.last_correct
+            WHERE excluded.last_seen >= last_tested.last_seen;
+        END
+        """
+    )
+
+
+def _v3_import_checkpoints(cur: sqlite3.Cursor) -> None:
+    """Progress of bulk imports, committed together with each chunk."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+        source TEXT PRIMARY KEY,
+        rows INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL)
+        """
+    )
+
+
+# Splits NEW.tag on ";" into trimmed, non-empty parts (see models.split_tags).
+_SPLIT_NEW_TAG = """
+WITH RECURSIVE split(part, rest) AS (
+    SELECT '', NEW.tag || ';'
+    UNION ALL
+    SELECT trim(substr(rest, 1, instr(rest, ';') - 1)),
+           substr(rest, instr(rest, ';') + 1)
+    FROM split WHERE rest <> ''
+)
+"""
+
+_LINK_NEW_TAGS = f"""
+INSERT OR IGNORE INTO tags (name)
+{_SPLIT_NEW_TAG} SELECT part FROM split WHERE part <> '';
+INSERT OR IGNORE INTO word_tags (tag_id, word_id)
+{_SPLIT_NEW_TAG} SELECT t.id, NEW.id FROM split JOIN tags t ON t.name = split.part;
+"""
+
+
+def _v4_tags(cur: sqlite3.Cursor) -> None:
+    """Normalized many-to-many tags, kept in sync with words.tag by triggers."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tags (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE)
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS word_tags (
+        tag_id INTEGER NOT NULL,
+        word_id INTEGER NOT NULL,
+        PRIMARY KEY (tag_id, word_id)) WITHOUT ROWID
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_word_tags_word ON word_tags(word_id, tag_id)"
+    )
+
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS words_insert_tags AFTER INSERT ON words
+        BEGIN {_LINK_NEW_TAGS} END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS words_update_tags AFTER UPDATE OF tag ON words
+        BEGIN
+            DELETE FROM word_tags WHERE word_id = OLD.id;
+            {_LINK_NEW_TAGS}
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS words_delete_tags AFTER DELETE ON words
+        BEGIN
+            DELETE FROM word_tags WHERE word_id = OLD.id;
+        END
+        """
+    )
+
+    # Backfill existing words by letting the update trigger split their tags.
+    cur.execute("UPDATE words SET tag = tag")
+
+    # Filters go through word_tags now, nothing reads words.tag by index.
+    cur.execute("DROP INDEX IF EXISTS idx_words_tag")
+
+
+# The text columns indexed by words_fts, in index order.
+SEARCH_COLUMNS = (
+    "kanji_word",
+    "kana_word",
+    "english_word",
+    "japanese_sentence",
+    "english_sentence",
+)
+
+
+def _v5_search(cur: sqlite3.Cursor) -> None:
+    """Trigram full-text index over the words and their example sentences."""
+    # External content: the index stores no second copy of the text. Trigrams
+    # need no word boundaries, so Japanese substrings match too.
+    columns = ", ".join(SEARCH_COLUMNS)
+    cur.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+        {columns}, content='words', content_rowid='id', tokenize='trigram')
+        """
+    )
+    old_values = ", ".join(f"OLD.{column}" for column in SEARCH_COLUMNS)
+    new_values = ", ".join(f"NEW.{column}" for column in SEARCH_COLUMNS)
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS words_insert_search AFTER INSERT ON words
+        BEGIN
+            INSERT INTO words_fts (rowid, {columns})
+            VALUES (NEW.id, {new_values});
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS words_update_search
+        AFTER UPDATE OF {columns} ON words
+        BEGIN
+            INSERT INTO words_fts (words_fts, rowid, {columns})
+            VALUES ('delete', OLD.id, {old_values});
+            INSERT INTO words_fts (rowid, {columns})
+            VALUES (NEW.id, {new_values});
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS words_delete_search AFTER DELETE ON words
+        BEGIN
+            INSERT INTO words_fts (words_fts, rowid, {columns})
+            VALUES ('delete', OLD.id, {old_values});
+        END
+        """
+    )
+
+    cur.execute("INSERT INTO words_fts (words_fts) VALUES ('rebuild')")
+
+
+def _v6_tag_stats(cur: sqlite3.Cursor) -> None:
+    """Per-tag word count, newest word id and last review, kept by triggers."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tag_stats (
+        tag_id INTEGER PRIMARY KEY,
+        word_count INTEGER NOT NULL,
+        max_word_id INTEGER NOT NULL,
+        last_used INTEGER)
+        """
+    )
+    # get_tags lists tags newest first straight from this index.
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tag_stats_max_word_id ON tag_stats(max_word_id)"
+    )
+
+    # word_tags changes whenever a word is added, retagged or deleted
+    # (see _v4_tags), so these two triggers cover every case.
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS word_tags_insert_stats AFTER INSERT ON word_tags
+        BEGIN
+            INSERT INTO tag_stats (tag_id, word_count, max_word_id)
+            VALUES (NEW.tag_id, 1, NEW.word_id)
+            ON CONFLICT(tag_id) DO UPDATE SET
+                word_count = word_count + 1,
+                max_word_id = max(max_word_id, excluded.max_word_id);
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS word_tags_delete_stats AFTER DELETE ON word_tags
+        BEGIN
+            UPDATE tag_stats SET
+                word_count = word_count - 1,
+                max_word_id = coalesce(
+                    (SELECT MAX(word_id) FROM word_tags WHERE tag_id = OLD.tag_id), 0
+                )
+            WHERE tag_id = OLD.tag_id;
+            DELETE FROM tag_stats WHERE tag_id = OLD.tag_id AND word_count <= 0;
+        END
+        """
+    )
+    # last_used is the last time (unix seconds) a word with the tag was
+    # answered, read through idx_word_tags_word.
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS reviews_tag_stats AFTER INSERT ON reviews
+        BEGIN
+            UPDATE tag_stats SET last_used = max(coalesce(last_used, 0), NEW.ts / 1000)
+            WHERE tag_id IN (SELECT tag_id FROM word_tags WHERE word_id = NEW.word_id);
+        END
+        """
+    )
+
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO tag_stats (tag_id, word_count, max_word_id, last_used)
+        SELECT wt.tag_id, COUNT(*), MAX(wt.word_id), MAX(lt.last_seen)
+        FROM word_tags wt
+        LEFT JOIN last_tested lt ON lt.word_id = wt.word_id
+        GROUP BY wt.tag_id
+        """
+    )
+
+
+def _v7_auto_vacuum(cur: sqlite3.Cursor) -> None:
+    """Incremental auto-vacuum, so `maintain` can hand free pages back."""
+    # The mode of a database that already has tables only changes with a
+    # full VACUUM, which can't run inside a transaction (see
+    # NON_TRANSACTIONAL). Checking first makes a rerun a no-op.
+    cur.execute("PRAGMA auto_vacuum")
+    if cur.fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+        cur.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cur.execute("VACUUM")
+
+
+def _v8_schedule(cur: sqlite3.Cursor) -> None:
+    """Spaced repetition state per word, filled in by replaying the history."""
+    # The rowid is the word id, so idx_schedule_due covers the due query.
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schedule (
+        word_id INTEGER PRIMARY KEY,
+        due_at INTEGER NOT NULL,
+        stability REAL NOT NULL,
+        difficulty REAL NOT NULL,
+        reps INTEGER NOT NULL)
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_schedule_due ON schedule(due_at)")
+
+    cur.execute(
+        "SELECT word_id, ts, kana_correct, meaning_correct, response_ms"
+        " FROM reviews ORDER BY word_id, ts"
+    )
+    schedules: dict[int, Schedule] = {}
+    for row in cur.fetchall():
+        review = Review(row[0], row[1], bool(row[2]), bool(row[3]), row[4])
+        schedules[review.word_id] = next_schedule(schedules.get(review.word_id), review)
+    cur.executemany(
+        "INSERT OR REPLACE INTO schedule"
+        " (word_id, due_at, stability, difficulty, reps) VALUES (?, ?, ?, ?, ?)",
+        schedules.values(),
+    )
+
+
+def _v9_failure_counts(cur: sqlite3.Cursor) -> None:
+    """Failures per word, in total and in a row, kept up to date by a trigger."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS failure_counts (
+        word_id INTEGER PRIMARY KEY,
+        failures INTEGER NOT NULL,
+        streak INTEGER NOT NULL,
+        last_ts INTEGER NOT NULL)
+        """
+    )
+    # A review older than the newest one (a replayed journal) still counts
+    # as a failure but can't break or extend the streak.
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS reviews_failure_counts AFTER INSERT ON reviews
+        BEGIN
+            INSERT INTO failure_counts (word_id, failures, streak, last_ts)
+            VALUES (
+                NEW.word_id,
+                NOT (NEW.kana_correct AND NEW.meaning_correct),
+                NOT (NEW.kana_correct AND NEW.meaning_correct),
+                NEW.ts
+            )
+            ON CONFLICT(word_id) DO UPDATE SET
+                failures = failures + excluded.failures,
+                streak = CASE
+                    WHEN excluded.last_ts < last_ts THEN streak
+                    WHEN excluded.failures THEN streak + 1
+                    ELSE 0
+                END,
+                last_ts = max(last_ts, excluded.last_ts);
+        END
+        """
+    )
+
+    cur.execute(
+        "SELECT word_id, ts, kana_correct, meaning_correct, response_ms"
+        " FROM reviews ORDER BY word_id, ts"
+    )
+    reviews = [
+        Review(row[0], row[1], bool(row[2]), bool(row[3]), row[4])
+        for row in cur.fetchall()
+    ]
+    last_ts = {review.word_id: review.timestamp for review in reviews}
+    cur.executemany(
+        "INSERT OR REPLACE INTO failure_counts (word_id, failures, streak, last_ts)"
+        " VALUES (?, ?, ?, ?)",
+        (
+            (word_id, *counts, last_ts[word_id])
+            for word_id, counts in replay_counts(reviews).items()
+        ),
+    )
+
+
+def _v10_relink_changed_tags(cur: sqlite3.Cursor) -> None:
+    """Leaves a word's tag links alone unless its tags actually change."""
+    # Unlinking every tag on each edit emptied the tag_stats row of a tag
+    # with one word, losing its last_used, even when the tag was relinked.
+    # Only the tags the word no longer carries are unlinked now.
+    cur.execute("DROP TRIGGER IF EXISTS words_update_tags")
+    cur.execute(
+        f"""
+        CREATE TRIGGER words_update_tags AFTER UPDATE OF tag ON words
+        WHEN OLD.tag IS NOT NEW.tag
+        BEGIN
+            DELETE FROM word_tags WHERE word_id = OLD.id AND tag_id NOT IN (
+                {_SPLIT_NEW_TAG} SELECT t.id FROM split JOIN tags t ON t.name = split.part
+            );
+            {_LINK_NEW_TAGS}
+        END
+        """
+    )
+
+
+# Each entry upgrades the schema by one version; never edit or reorder
+# migrations that have shipped, append a new one instead.
+MIGRATIONS: list[Callable[[sqlite3.Cursor], None]] = [
+    _v1_indexes,
+    _v2_reviews,
+    _v3_import_checkpoints,
+    _v4_tags,
+    _v5_search,
+    _v6_tag_stats,
+    _v7_auto_vacuum,
+    _v8_schedule,
+    _v9_failure_counts,
+    _v10_relink_changed_tags,
+]
+
+# Run outside of any transaction before the version bump, so these have
+# to be idempotent.
+NON_TRANSACTIONAL = {_v7_auto_vacuum}
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(con: sqlite3.Connection) -> int:
+    return con.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(con: sqlite3.Connection) -> int:
+    """
+    Brings the database up to SCHEMA_VERSION in place.
+
+    Each migration runs in its own transaction together with the
+    user_version bump, so an interrupted upgrade resumes where it stopped.
+    NON_TRANSACTIONAL ones run just before the transaction instead.
+    Returns the number of migrations applied.
+    """
+    applied = 0
+    while get_version(con) < SCHEMA_VERSION:
+        migration = MIGRATIONS[get_version(con)]
+        cur = con.cursor()
+        try:
+            if migration in NON_TRANSACTIONAL:
+                migration(cur)
+
+            # Take the write lock before re-reading the version so two
+            # processes opening the same database don't both migrate.
+            cur.execute("BEGIN IMMEDIATE")
+            version = get_version(con)
+            if version >= SCHEMA_VERSION:
+                con.rollback()
+                break
+            if MIGRATIONS[version] is not migration:
+                # Another process got further in the meantime.
+                con.rollback()
+                continue
+
+            if migration not in NON_TRANSACTIONAL:
+                migration(cur)
+            cur.execute(f"PRAGMA user_version = {version + 1}")
+            con.commit()
+            applied += 1
+        except BaseException:
+            con.rollback()
+            raise
+        finally:
+            cur.close()
+
+    return applied
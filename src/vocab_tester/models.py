@@ -1,3 +1,8 @@
+from dataclasses import dataclass
+import threading
+import time
+from typing import Iterable, NamedTuple, Self
+
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -11,3 +16,106 @@ class Word(BaseModel):
     english_word: str = Field(min_length=1)
     english_sentence: str = Field(min_length=1)
     tag: str = Field(default="none", min_length=1)
+
+    @property
+    def tags(self) -> list[str]:
+        """The individual tags; several can be given separated by ;"""
+        return split_tags(self.tag)
+
+
+def split_tags(tag: str) -> list[str]:
+    return [part.strip() for part in tag.split(";") if part.strip()]
+
+
+@dataclass(frozen=True)
+class TagFilter:
+    """
+    A set of tags to quiz on. Words match if they carry any of the tags,
+    or all of them when `match_all` is set.
+    """
+
+    tags: frozenset[str]
+    match_all: bool = False
+
+    @classmethod
+    def of(cls, value: "str | Iterable[str] | TagFilter | None") -> Self | None:
+        """Normalizes a single tag, a collection of tags or a filter."""
+        if isinstance(value, TagFilter) or value is None:
+            return value or None
+        if isinstance(value, str):
+            value = [value]
+        tags = frozenset(tag for tag in value if tag)
+        return cls(tags) if tags else None
+
+    def matches(self, tags: Iterable[str]) -> bool:
+        """Whether a word carrying `tags` is part of the filter."""
+        carried = self.tags.intersection(tags)
+        return carried == self.tags if self.match_all else bool(carried)
+
+    @property
+    def key(self) -> str:
+        """A canonical text form, stable across runs."""
+        separator = "&" if self.match_all else "|"
+        return separator.join(sorted(self.tags))
+
+    def __bool__(self) -> bool:
+        return bool(self.tags)
+
+    def __str__(self) -> str:
+        return (" & " if self.match_all else ", ").join(sorted(self.tags))
+
+
+_clock_lock = threading.Lock()
+_last_timestamp = 0
+
+
+def _next_timestamp() -> int:
+    """
+    Current unix time in milliseconds, strictly increasing within the process
+    so two answers given in the same millisecond still get distinct keys.
+    """
+    global _last_timestamp
+    with _clock_lock:
+        _last_timestamp = max(time.time_ns() // 1_000_000, _last_timestamp + 1)
+        return _last_timestamp
+
+
+class TagStats(NamedTuple):
+    """A tag with its word count, newest word id and last review (unix seconds)."""
+
+    name: str
+    word_count: int
+    max_word_id: int
+    last_used: int | None = None
+
+
+class Review(NamedTuple):
+    """One answer in the review history. Timestamps are unix milliseconds."""
+
+    word_id: int
+    timestamp: int
+    kana_correct: bool
+    meaning_correct: bool
+    response_ms: int | None = None
+
+    @property
+    def correct(self) -> bool:
+        return self.kana_correct and self.meaning_correct
+
+    @classmethod
+    def now(
+        cls,
+        word_id: int,
+        correct: bool,
+        kana_correct: bool | None = None,
+        meaning_correct: bool | None = None,
+        response_ms: int | None = None,
+    ) -> Self:
+        """Builds a review for an answer given just now."""
+        return cls(
+            word_id,
+            _next_timestamp(),
+            correct if kana_correct is None else kana_correct,
+            correct if meaning_correct is None else meaning_correct,
+            response_ms,
+        )
@@ -1,4 +1,5 @@
-from pathlib import Path
+import time
+from typing import Iterable
 
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal
@@ -6,8 +7,8 @@ from textual.widgets import Static, Input, Button, Label
 from textual.reactive import reactive
 from textual import work
 
-from .config import Config
-from .db import Database
+from .config import CONFIG
+from .async_db import AsyncDatabase
 from .edit_word_screen import EditWordScreen
 from .tag_screen import TagSelectionScreen
 from .models import Word
@@ -15,9 +16,11 @@ from .wsl_utils import set_ime_mode
 from .text_utils import kanji_to_kana, is_answer_correct
 from .audio_service import AudioService
 from .quiz_session import QuizSession
-
-_config_path = Path("settings.toml")
-CONFIG = Config.from_file(_config_path)
+from .scheduler import make_scheduler
+from .session_queue import SessionQueue
+from .result_recorder import ResultRecorder
+from .session_log import SessionLog
+from .session_snapshot import SessionSnapshot
 
 
 class QuizScreen(Container):
@@ -26,27 +29,42 @@ class QuizScreen(Container):
     current_word = reactive(None)
     step = reactive("kana")  # kana -> meaning -> result
 
-    def __init__(self, db: Database) -> None:
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        recorder: ResultRecorder | None = None,
+        session_log: SessionLog | None = None,
+        resume_from: SessionSnapshot | None = None,
+    ) -> None:
         super().__init__()
         self.db = db
-
-        # Load default filter if set and valid
-        default_filter = CONFIG.default_filter
-        available_tags = self.db.get_tags() if hasattr(self.db, "get_tags") else []
-        initial_tag = default_filter if default_filter in available_tags else None
-
-        self.session = QuizSession(db, initial_tag)
+        # The session talks to the database synchronously, so its methods are
+        # only ever called through self.db.run on the database thread.
+        self.session = QuizSession(
+            db.db,
+            None,
+            recorder,
+            exclude_seen=CONFIG.exclude_seen,
+            scheduler=make_scheduler(CONFIG.scheduler, CONFIG.incorrect_ratio),
+            queue_size=CONFIG.session_size,
+            log=session_log,
+            leech_threshold=CONFIG.leech_threshold,
+            leech_mode=CONFIG.leech_mode,
+        )
         self.audio_service = AudioService()
         self.kana_answer = ""
         self.meaning_answer = ""
         self.full_info = ""
+        self.question_started = time.monotonic()
+        # A session saved by the previous run, picked up on mount.
+        self.resume_from = resume_from
 
     @property
-    def queue(self) -> list[int]:
+    def queue(self) -> SessionQueue:
         return self.session.queue
 
     @queue.setter
-    def queue(self, val: list[int]) -> None:
+    def queue(self, val: Iterable[int]) -> None:
         self.session.queue = val
 
     @property
@@ -90,17 +108,51 @@ class QuizScreen(Container):
                 yield Button("Filter", variant="default", id="filter_btn")
                 yield Button("Quit", variant="error", id="quit_btn")
 
-    def on_mount(self) -> None:
-        if self.session.current_tag_filter:
+    async def on_mount(self) -> None:
+        if self.resume_from:
+            await self.resume(self.resume_from)
+            return
+
+        # Load default filter if set and valid
+        default_filter = CONFIG.default_filter
+        if default_filter and default_filter in await self.db.get_tags():
+            self.session.current_tag_filter = default_filter
+            self.query_one("#filter_label", Label).update(f"Filter: {default_filter}")
+
+        await self.next_question()
+
+    async def resume(self, snapshot: SessionSnapshot) -> None:
+        """Picks up a saved session where it was left."""
+        word = await self.db.run(self.session.restore, snapshot)
+        if snapshot.tag_filter:
             self.query_one("#filter_label", Label).update(
-                f"Filter: {self.session.current_tag_filter}"
+                f"Filter: {snapshot.tag_filter}"
+            )
+
+        # An answer already shown was recorded, so move on to the next word.
+        if word is None or snapshot.step == "result":
+            await self.next_question()
+            return
+
+        self.show_question(word)
+        if snapshot.step == "meaning":
+            self.kana_answer = snapshot.kana_answer
+            self.step = "meaning"
+            set_ime_mode(False)
+            self.query_one("#prompt_label", Label).update(
+                f"Meaning of: [white]{word.kanji_word}[/]"
             )
 
-        self.next_question()
+    def snapshot(self) -> SessionSnapshot:
+        """The session and how far the current question has got."""
+        return self.session.snapshot()._replace(
+            step=self.step, kana_answer=self.kana_answer
+        )
 
-    def next_question(self) -> None:
-        word = self.session.next_question()
+    async def next_question(self) -> None:
+        self.show_question(await self.db.run(self.session.next_question))
 
+    def show_question(self, word: Word | None) -> None:
         if not word:
             self.query_one("#sentence_label", Label).update(
                 "No words found for this filter!"
@@ -109,6 +161,7 @@ class QuizScreen(Container):
             return
 
         self.step = "kana"
+        self.question_started = time.monotonic()
         set_ime_mode(True)
         self.kana_answer = ""
         self.meaning_answer = ""
@@ -131,7 +184,7 @@ class QuizScreen(Container):
         self.query_one("#audio_btn").add_class("hidden")
         self.query_one("#test_again_btn").add_class("hidden")
 
-    def on_input_submitted(self, event: Input.Submitted) -> None:
+    async def on_input_submitted(self, event: Input.Submitted) -> None:
         if not self.session.current_word:
             return
 
@@ -148,9 +201,9 @@ class QuizScreen(Container):
 
         elif self.step == "meaning":
             self.meaning_answer = val
-            self.show_results()
+            await self.show_results()
 
-    def show_results(self) -> None:
+    async def show_results(self) -> None:
         if not self.session.current_word:
             return
 
@@ -164,7 +217,13 @@ class QuizScreen(Container):
         overall_correct = is_kana_correct and is_meaning_correct
 
         # Record result
-        self.session.record_result(overall_correct)
+        await self.db.run(
+            self.session.record_result,
+            overall_correct,
+            kana_correct=is_kana_correct,
+            meaning_correct=is_meaning_correct,
+            response_ms=int((time.monotonic() - self.question_started) * 1000),
+        )
         if hasattr(self.app, "update_score"):
             self.app.update_score(overall_correct)  # type: ignore
 
@@ -177,6 +236,8 @@ class QuizScreen(Container):
             if not is_meaning_correct:
                 parts.append(f"Meaning: {self.session.current_word.english_word}")
             result_text = "[red bold]Incorrect.[/] " + ", ".join(parts)
+            if self.session.is_leech(self.session.current_word.id):
+                result_text += " [yellow](leech)[/]"
 
         self.query_one("#result_message", Static).update(result_text)
 
@@ -196,14 +257,15 @@ class QuizScreen(Container):
             self.query_one("#test_again_btn").add_class("hidden")
         self.query_one("#next_btn").focus()
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:
+    async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "next_btn":
-            self.next_question()
+            await self.next_question()
         elif event.button.id == "test_again_btn":
-            self.test_again()
+            await self.test_again()
         elif event.button.id == "quit_btn":
             self.app.exit()
         elif event.button.id == "filter_btn":
+            await self.db.run(self.session.flush)
             self.app.push_screen(TagSelectionScreen(self.db), self.on_filter_selected)
         elif event.button.id == "copy_btn":
             if self.session.current_word:
@@ -211,10 +273,9 @@ class QuizScreen(Container):
         elif event.button.id == "audio_btn":
             self.play_audio()
 
-    def test_again(self) -> None:
+    async def test_again(self) -> None:
         if self.session.current_word and self.session.current_word.id is not None:
-            self.session.queue.insert(0, self.session.current_word.id)
-            self.next_question()
+            self.show_question(await self.db.run(self.session.test_again))
 
     @work(exclusive=True, thread=True)
     def play_audio(self) -> None:
@@ -231,11 +292,11 @@ class QuizScreen(Container):
         except Exception as e:
             self.app.notify(f"Error playing audio: {e}", severity="error")
 
-    def on_filter_selected(self, tag: str | None) -> None:
+    async def on_filter_selected(self, tag: str | None) -> None:
         if tag is None:
             return
 
-        self.session.set_tag_filter(tag if tag else None)
+        await self.db.run(self.session.set_tag_filter, tag if tag else None)
 
         label_text = (
             f"Filter: {self.session.current_tag_filter}"
@@ -252,26 +313,27 @@ class QuizScreen(Container):
         self.query_one("#copy_btn").add_class("hidden")
         self.query_one("#audio_btn").add_class("hidden")
 
-        self.next_question()
+        await self.next_question()
 
-    def action_edit_word(self) -> None:
+    async def action_edit_word(self) -> None:
         if (
             self.step == "result"
             and self.session.current_word
             and self.session.current_word.id
         ):
+            await self.db.run(self.session.flush)
             self.app.push_screen(  # type: ignore
                 EditWordScreen(self.db, self.session.current_word.id),
                 self.on_edit_word_done,
             )
 
-    def on_edit_word_done(self, changed: bool) -> None:
+    async def on_edit_word_done(self, changed: bool) -> None:
         if changed and self.session.current_word and self.session.current_word.id:
             # Reload data
             word_id = self.session.current_word.id
-            new_data = self.db.get_word(word_id)
+            new_data = await self.db.get_word(word_id)
             if new_data:
-                self.session.current_word = new_data
+                await self.db.run(self.session.reload_word, new_data)
 
                 # Refresh display
                 self.full_info = (
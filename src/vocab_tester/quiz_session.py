@@ -1,72 +1,269 @@
+from typing import Iterable
+
 from .db import Database
-from .models import Word
+from .leeches import LEECH_MODES, FailureCounts, next_counts
+from .models import TagFilter, Word
+from .result_recorder import ResultRecorder
+from .scheduler import RandomScheduler, Scheduler
+from .session_log import RecordedAnswer, SessionLog
+from .session_queue import SessionQueue
+from .session_snapshot import SessionSnapshot
+
+# Default number of words queued ahead (configurable as session_size).
+QUEUE_SIZE = 10
 
 
 class QuizSession:
-    def __init__(self, db: Database, tag_filter: str | None = None) -> None:
+    def __init__(
+        self,
+        db: Database,
+        tag_filter: str | TagFilter | None = None,
+        recorder: ResultRecorder | None = None,
+        exclude_seen: bool = False,
+        scheduler: Scheduler | None = None,
+        queue_size: int = QUEUE_SIZE,
+        log: SessionLog | None = None,
+        leech_threshold: int = 0,
+        leech_mode: str = "allow",
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError(f"Session size must be at least 1: {queue_size}")
+        if leech_mode not in LEECH_MODES:
+            raise ValueError(f"Unknown leech mode: {leech_mode}")
+
         self.db = db
-        self.queue: list[int] = []
+        self.queue_size = queue_size
+        # The queue is only topped up once fewer than half of its words are
+        # left, so most questions are served from already prefetched words
+        # without touching the database.
+        self.refill_below = max(1, queue_size // 2)
+        self.scheduler = scheduler or RandomScheduler()
+        self.recorder = recorder
+        self.log = log
+        # Words failed leech_threshold times are leeches (0 disables this),
+        # handled as leech_mode says. Their counters are read once per word
+        # when it's first queued and then kept up to date here.
+        self.leech_threshold = leech_threshold
+        self.leech_mode = leech_mode
+        self.leech_cap = max(1, queue_size // 5)
+        self.failures: dict[int, FailureCounts] = {}
+        # With exclude_seen, words answered this session are left out of
+        # refills until every word matching the filter has been seen.
+        self.exclude_seen = exclude_seen
+        self.seen: set[int] = set()
+        self._queue = SessionQueue()
+        # Words for the ids in the queue, loaded in batches.
+        self.prefetched: dict[int, Word] = {}
         self.current_word: Word | None = None
-        self.current_tag_filter: str | None = tag_filter
+        self.current_tag_filter: str | TagFilter | None = tag_filter
 
-    def set_tag_filter(self, tag_filter: str | None) -> None:
+    @property
+    def queue(self) -> SessionQueue:
+        return self._queue
+
+    @queue.setter
+    def queue(self, word_ids: Iterable[int]) -> None:
+        self._queue = SessionQueue(word_ids)
+
+    def set_tag_filter(self, tag_filter: str | TagFilter | None) -> None:
         self.current_tag_filter = tag_filter
         self.queue.clear()
+        self.prefetched.clear()
+        # Words seen under the old filter don't count towards the new one.
+        self.seen.clear()
 
     def next_question(self) -> Word | None:
         """
-        Loads the next question. Refills the queue up to 10 if needed.
+        Loads the next question. Refills the queue up to queue_size from the
+        scheduler once it runs low and loads the words of the whole queue in
+        one batch.
         Recursively skips deleted/invalid words, returning the loaded Word or None.
         """
         while True:
-            needed = 10 - len(self.queue)
-            if needed > 0:
-                exclude_ids = list(self.queue)
-
-                # 1. Fetch incorrect words first
-                incorrect_ids = self.db.get_incorrect_word_ids(
-                    limit=needed,
-                    tag_filter=self.current_tag_filter,
-                    exclude_ids=exclude_ids,
-                )
-                self.queue.extend(incorrect_ids)
+            if len(self.queue) < self.refill_below:
+                needed = self.queue_size - len(self.queue)
+                exclude_ids = set(self.queue)
+                if self.exclude_seen:
+                    exclude_ids |= self.seen
 
-                needed -= len(incorrect_ids)
-                if needed > 0:
-                    exclude_ids.extend(incorrect_ids)
+                picked = self.scheduler.pick(
+                    self.db, needed, self.current_tag_filter, exclude_ids
+                )
+                self.queue.extend(self._admit(picked))
 
-                    # 2. Fetch random words for the rest
-                    random_ids = self.db.get_random_word_ids(
-                        limit=needed,
-                        tag_filter=self.current_tag_filter,
-                        exclude_ids=exclude_ids,
-                    )
-                    self.queue.extend(random_ids)
+                self.prefetch()
 
             if not self.queue:
+                if self.exclude_seen and self.seen:
+                    # Everything has been seen, start over.
+                    self.seen.clear()
+                    continue
                 self.current_word = None
                 return None
 
-            word_id = self.queue.pop(0)
-            self.current_word = self.db.get_word(word_id)
+            if self.queue[0] not in self.prefetched:
+                # Queued from outside, or deleted since it was prefetched.
+                self.prefetch()
+
+            word_id = self.queue.popleft()
+            self.current_word = self.prefetched.get(word_id)
+            if word_id not in self.queue:
+                self.prefetched.pop(word_id, None)
             if self.current_word:
                 return self.current_word
 
-    def record_result(self, overall_correct: bool) -> None:
+    def is_leech(self, word_id: int) -> bool:
+        counts = self.failures.get(word_id)
+        return (
+            counts is not None
+            and self.leech_threshold > 0
+            and counts.failures >= self.leech_threshold
+        )
+
+    def _admit(self, word_ids: list[int]) -> list[int]:
+        """
+        Holds back leeches picked for a refill, as leech_mode says. In cap
+        mode the leeches still queued count against the cap, so it holds
+        for the queue as a whole rather than for each refill.
+        """
+        if not self.leech_threshold:
+            return word_ids
+        self._load_failures([*word_ids, *self.queue])
+        if self.leech_mode == "allow":
+            return word_ids
+
+        allowed = 0
+        if self.leech_mode == "cap":
+            queued = {word_id for word_id in self.queue if self.is_leech(word_id)}
+            allowed = max(self.leech_cap - len(queued), 0)
+        admitted = []
+        for word_id in word_ids:
+            if self.is_leech(word_id):
+                if not allowed:
+                    continue
+                allowed -= 1
+            admitted.append(word_id)
+        return admitted
+
+    def _load_failures(self, word_ids: Iterable[int]) -> None:
+        missing = [word_id for word_id in word_ids if word_id not in self.failures]
+        if missing:
+            counts = self.db.get_failure_counts(missing)
+            for word_id in missing:
+                self.failures[word_id] = counts.get(word_id, FailureCounts())
+
+    def prefetch(self) -> None:
+        """Loads every queued word that isn't prefetched yet in one query."""
+        missing = [
+            word_id
+            for word_id in dict.fromkeys(self.queue)
+            if word_id not in self.prefetched
+        ]
+        for word in self.db.get_words(missing):
+            if word.id is not None:
+                self.prefetched[word.id] = word
+
+    def reload_word(self, word: Word) -> None:
+        """Swaps in an edited word, including any prefetched copy."""
+        if self.current_word and self.current_word.id == word.id:
+            self.current_word = word
+        if word.id in self.prefetched:
+            self.prefetched[word.id] = word
+
+    def record_result(
+        self,
+        overall_correct: bool,
+        *,
+        kana_correct: bool | None = None,
+        meaning_correct: bool | None = None,
+        response_ms: int | None = None,
+    ) -> None:
         if not self.current_word or self.current_word.id is None:
             return
 
-        self.db.record_result(self.current_word.id, overall_correct)
+        word_id = self.current_word.id
+        if self.leech_threshold:
+            # Loaded before the result is written, so it isn't counted twice.
+            self._load_failures([word_id])
+            self.failures[word_id] = next_counts(
+                self.failures[word_id], overall_correct
+            )
+
+        self.seen.add(word_id)
+        record = self.recorder.record if self.recorder else self.db.record_result
+        record(
+            word_id,
+            overall_correct,
+            kana_correct=kana_correct,
+            meaning_correct=meaning_correct,
+            response_ms=response_ms,
+        )
+        if self.log:
+            self.log.record(
+                RecordedAnswer(
+                    word_id,
+                    overall_correct if kana_correct is None else kana_correct,
+                    overall_correct if meaning_correct is None else meaning_correct,
+                    response_ms,
+                    TagFilter.of(self.current_tag_filter),
+                )
+            )
 
         # Re-queue the word at different positions to practice again
-        # if not already in the queue a couple of times
-        if not overall_correct and self.queue[1:].count(self.current_word.id) < 2:
-            self.queue.insert(2, self.current_word.id)
-            self.queue.insert(5, self.current_word.id)
+        # if not already in the queue a couple of times (a copy at the
+        # front, e.g. from test_again, doesn't count)
+        repeats = self.queue.count(word_id)
+        if self.queue and self.queue[0] == word_id:
+            repeats -= 1
+        if not overall_correct and repeats < 2:
+            if self.leech_mode == "allow" or not self.is_leech(word_id):
+                self.queue.insert(2, word_id)
+                self.queue.insert(5, word_id)
+            elif self.leech_mode == "cap" and word_id not in self.queue:
+                # Once, so a leech can't crowd out the rest of the session.
+                self.queue.insert(5, word_id)
+            if word_id in self.queue:
+                self.prefetched[word_id] = self.current_word
+
+    def snapshot(self) -> SessionSnapshot:
+        """Captures the queue, its words and the current word."""
+        words = dict(self.prefetched)
+        current_id = self.current_word.id if self.current_word else None
+        if self.current_word and current_id is not None:
+            words[current_id] = self.current_word
+        return SessionSnapshot(
+            list(self.queue),
+            list(words.values()),
+            current_id,
+            TagFilter.of(self.current_tag_filter),
+            sorted(self.seen),
+        )
+
+    def restore(self, snapshot: SessionSnapshot) -> Word | None:
+        """
+        Picks a snapshot back up without querying the deck, returning the
+        current word. Words edited or deleted since are only noticed once
+        they come up again after a refill.
+        """
+        words = {word.id: word for word in snapshot.words}
+        self.current_tag_filter = snapshot.tag_filter
+        self.queue = snapshot.queue
+        self.prefetched = {
+            word_id: words[word_id] for word_id in self.queue if word_id in words
+        }
+        self.current_word = words.get(snapshot.current_word_id)
+        self.seen = set(snapshot.seen)
+        return self.current_word
+
+    def flush(self) -> None:
+        """Writes any buffered results to the database."""
+        if self.recorder:
+            self.recorder.flush()
 
     def test_again(self) -> Word | None:
         """Queues the current word at index 0 and returns the newly loaded question."""
         if self.current_word and self.current_word.id is not None:
             self.queue.insert(0, self.current_word.id)
+            self.prefetched[self.current_word.id] = self.current_word
             return self.next_question()
         return None
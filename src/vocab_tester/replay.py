@@ -0,0 +1,95 @@
+import hashlib
+from pathlib import Path
+import sqlite3
+import time
+from typing import NamedTuple
+
+from .db import Database
+from .models import TagFilter
+from .quiz_session import QuizSession
+from .scheduler import make_scheduler
+from .session_log import RecordedAnswer, SessionSettings
+
+
+class ReplayReport(NamedTuple):
+    asked: list[int]
+    # How many of the asked words were the ones asked in the recording.
+    matched: int
+    question_ms: list[float]
+    answer_ms: list[float]
+    seconds: float
+
+    @property
+    def fingerprint(self) -> str:
+        """A short digest of the word order, to compare runs at a glance."""
+        order = ",".join(map(str, self.asked)).encode()
+        return hashlib.sha256(order).hexdigest()[:12]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def copy_deck(source: Path, target: Path) -> None:
+    """Copies a database (including its write-ahead log) to a new file."""
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+
+
+def replay(
+    db: Database, settings: SessionSettings, answers: list[RecordedAnswer]
+) -> ReplayReport:
+    """
+    Re-drives a session: asks the next question and gives the next recorded
+    answer to it, whichever word it is, timing both. Results are written
+    straight to the database rather than buffered, and with a seed the same
+    deck and settings always ask the same words.
+    """
+    if settings.seed is not None:
+        db.rng.seed(settings.seed)
+    session = QuizSession(
+        db,
+        exclude_seen=settings.exclude_seen,
+        scheduler=make_scheduler(settings.scheduler, settings.incorrect_ratio),
+        queue_size=settings.session_size,
+        leech_threshold=settings.leech_threshold,
+        leech_mode=settings.leech_mode,
+    )
+
+    asked: list[int] = []
+    matched = 0
+    question_ms: list[float] = []
+    answer_ms: list[float] = []
+    started = time.perf_counter()
+    for answer in answers:
+        if answer.tag_filter != TagFilter.of(session.current_tag_filter):
+            session.set_tag_filter(answer.tag_filter)
+
+        before = time.perf_counter()
+        word = session.next_question()
+        question_ms.append((time.perf_counter() - before) * 1000)
+        if word is None or word.id is None:
+            break
+        asked.append(word.id)
+        matched += word.id == answer.word_id
+
+        before = time.perf_counter()
+        session.record_result(
+            answer.correct,
+            kana_correct=answer.kana_correct,
+            meaning_correct=answer.meaning_correct,
+            response_ms=answer.response_ms,
+        )
+        answer_ms.append((time.perf_counter() - before) * 1000)
+
+    return ReplayReport(
+        asked, matched, question_ms, answer_ms, time.perf_counter() - started
+    )
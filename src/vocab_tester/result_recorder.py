@@ -0,0 +1,176 @@
+from pathlib import Path
+import threading
+import time
+from typing import IO
+import uuid
+
+from .db import Database
+from .models import Review
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Each recorder journals to its own pending_results.<id>.log next to the
+# database; the unsuffixed name is the single journal older versions kept.
+JOURNAL_NAME = "pending_results.log"
+JOURNAL_GLOB = "pending_results*.log"
+
+
+class ResultRecorder:
+    """
+    Write-behind buffer for quiz results.
+
+    Answers are appended to a small journal file (without fsync) and kept in
+    memory, then written to the database in one transaction once enough have
+    piled up or the oldest has waited long enough. Whatever is left in the
+    journal after a crash is replayed the next time a recorder is created.
+
+    Every recorder has a journal of its own, locked for as long as it is
+    open, so several processes can share a deck: replay only takes the
+    journals nobody holds, and a flush only clears the recorder's own.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        journal_path: Path | None = None,
+        max_pending: int = 20,
+        max_delay: float = 30.0,
+    ) -> None:
+        self.db = db
+        self.journal_path = journal_path or db.db_path.with_name(
+            f"pending_results.{uuid.uuid4().hex}.log"
+        )
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+
+        self.pending: list[Review] = []
+        self._oldest: float | None = None
+        self._lock = threading.Lock()
+
+        self.replay()
+        self._journal = self.journal_path.open("a", encoding="utf-8")
+        if not _try_lock(self._journal):
+            self._journal.close()
+            raise RuntimeError(f"Journal is in use: {self.journal_path}")
+
+    def record(
+        self,
+        word_id: int,
+        correct: bool,
+        *,
+        kana_correct: bool | None = None,
+        meaning_correct: bool | None = None,
+        response_ms: int | None = None,
+    ) -> None:
+        """Queues a result, flushing if a size or time threshold is reached."""
+        entry = Review.now(word_id, correct, kana_correct, meaning_correct, response_ms)
+
+        with self._lock:
+            self._journal.write(_format_entry(entry))
+            self._journal.flush()
+            self.pending.append(entry)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            due = (
+                len(self.pending) >= self.max_pending
+                or time.monotonic() - self._oldest >= self.max_delay
+            )
+
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Writes all pending results in one transaction and clears the journal."""
+        with self._lock:
+            if not self.pending:
+                return 0
+
+            batch = self.pending
+            self.db.record_results(batch)
+            self.pending = []
+            self._oldest = None
+            self._journal.truncate(0)
+
+        return len(batch)
+
+    def replay(self) -> int:
+        """Records any results left in journals by previous runs."""
+        journals = set(self.db.db_path.parent.glob(JOURNAL_GLOB))
+        journals.add(self.journal_path)
+        return sum(_replay_journal(self.db, path) for path in sorted(journals))
+
+    def close(self) -> None:
+        """Flushes pending results and removes the journal."""
+        self.flush()
+        self._journal.close()
+        self.journal_path.unlink(missing_ok=True)
+
+
+def _replay_journal(db: Database, path: Path) -> int:
+    """Records a journal's results and removes it, unless its recorder is open."""
+    try:
+        journal = path.open("r+", encoding="utf-8")
+    except FileNotFoundError:
+        return 0
+
+    with journal:
+        if not _try_lock(journal):
+            return 0
+
+        entries = []
+        for line in journal:
+            entry = _parse_entry(line)
+            # A crash mid-write can leave a truncated last line.
+            if entry is not None:
+                entries.append(entry)
+
+        # Reviews are keyed by word and timestamp, so replaying a batch
+        # that was already committed is harmless.
+        if entries:
+            db.record_results(entries)
+        journal.truncate(0)
+    path.unlink(missing_ok=True)
+    return len(entries)
+
+
+def _try_lock(journal: IO[str]) -> bool:
+    """Takes an exclusive lock on an open journal without waiting for it."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(journal.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _format_entry(review: Review) -> str:
+    response_ms = "" if review.response_ms is None else review.response_ms
+    return (
+        f"{review.word_id}\t{review.timestamp}\t{int(review.kana_correct)}"
+        f"\t{int(review.meaning_correct)}\t{response_ms}\n"
+    )
+
+
+def _parse_entry(line: str) -> Review | None:
+    if not line.endswith("\n"):
+        return None
+
+    parts = line.rstrip("\n").split("\t")
+    try:
+        if len(parts) == 3:
+            # Journals written before reviews existed: id, correct, seconds.
+            word_id, correct, seconds = (int(part) for part in parts)
+            return Review(word_id, seconds * 1000, bool(correct), bool(correct))
+        if len(parts) == 5:
+            word_id, timestamp, kana, meaning = (int(part) for part in parts[:4])
+            response_ms = int(parts[4]) if parts[4] else None
+            return Review(word_id, timestamp, bool(kana), bool(meaning), response_ms)
+    except ValueError:
+        pass
+    return None
@@ -0,0 +1,519 @@
+import json
+import math
+import random
+import sqlite3
+from typing import Collection, NamedTuple
+
+from .models import TagFilter
+from .weighted_sampler import ReviewStats
+
+SAMPLE_MODES = ("random", "epoch", "weighted")
+
+# How many probe rounds to try before falling back to reading the candidates.
+PROBE_ROUNDS = 4
+
+# The most probes a round may make before reading the candidates instead.
+MAX_PROBES = 4096
+
+EPOCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sample_epochs (
+filter_key TEXT PRIMARY KEY,
+epoch INTEGER NOT NULL,
+position INTEGER NOT NULL,
+size INTEGER NOT NULL,
+max_word_id INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS sample_order (
+filter_key TEXT NOT NULL,
+position INTEGER NOT NULL,
+word_id INTEGER NOT NULL,
+PRIMARY KEY (filter_key, position)) WITHOUT ROWID;
+"""
+
+
+class ProbeSource(NamedTuple):
+    """The id range holding a filter's words, and about how many it holds."""
+
+    low: int
+    high: int
+    size: int
+
+
+def tag_condition(
+    tag_filter: str | TagFilter | None, column: str = "id", *, per_row: bool = False
+) -> tuple[str, list]:
+    """
+    Returns an SQL condition (and its params) restricting the word id in
+    `column` to words matching the filter, resolved through word_tags.
+
+    By default the matching ids are looked up once from the tags' index
+    ranges, which suits queries driven by the filter. With `per_row` each
+    candidate row is checked through the word_id index instead, which suits
+    queries driven by a smaller set such as the incorrectly answered words.
+    """
+    tag_filter = TagFilter.of(tag_filter)
+    if not tag_filter:
+        return "1=1", []
+
+    names = json.dumps(sorted(tag_filter.tags))
+    tag_ids = "SELECT id FROM tags WHERE name IN (SELECT value FROM json_each(?))"
+
+    if per_row:
+        matches = (
+            f"(SELECT COUNT(*) FROM word_tags wt WHERE wt.word_id = {column}"
+            f" AND wt.tag_id IN ({tag_ids}))"
+        )
+        if tag_filter.match_all:
+            return f"{matches} = ?", [names, len(tag_filter.tags)]
+        return f"{matches} > 0", [names]
+
+    condition = (
+        f"{column} IN (SELECT wt.word_id FROM word_tags wt"
+        f" WHERE wt.tag_id IN ({tag_ids})"
+    )
+    if tag_filter.match_all:
+        condition += " GROUP BY wt.word_id HAVING COUNT(*) = ?"
+        return condition + ")", [names, len(tag_filter.tags)]
+    return condition + ")", [names]
+
+
+def exclude_condition(
+    exclude_ids: Collection[int] | None, column: str = "id"
+) -> tuple[str, list]:
+    """
+    Returns an SQL condition (and its params) leaving out the given ids.
+
+    The ids are bound as one JSON array and read back through json_each, so
+    the statement text and its single variable stay the same size however
+    many ids are excluded, well clear of SQLite's variable limit.
+    """
+    if not exclude_ids:
+        return "1=1", []
+    return (
+        f"{column} NOT IN (SELECT value FROM json_each(?))",
+        [json.dumps(list(exclude_ids))],
+    )
+
+
+def ids_after(
+    cur: sqlite3.Cursor,
+    tag_filter: str | TagFilter | None,
+    after: int,
+    limit: int | None = None,
+    condition: str = "1=1",
+    params: list | None = None,
+) -> list[int]:
+    """
+    Returns ids of words matching the filter and `condition` (on w.id) above
+    `after`, in id order, up to `limit` of them.
+
+    Each tag's index range is read from `after` onwards and stops at the
+    limit, so the cost follows the number of ids returned rather than the
+    size of the tags, unlike tag_condition.
+    """
+    params = params or []
+    tag_filter = TagFilter.of(tag_filter)
+    # A negative LIMIT is no limit in SQLite.
+    limit = -1 if limit is None else limit
+    if not tag_filter:
+        cur.execute(
+            f"SELECT w.id FROM words w WHERE w.id > ? AND {condition}"
+            " ORDER BY w.id LIMIT ?",
+            [after] + params + [limit],
+        )
+        return [row[0] for row in cur.fetchall()]
+
+    cur.execute(
+        "SELECT id FROM tags WHERE name IN (SELECT value FROM json_each(?))",
+        (json.dumps(sorted(tag_filter.tags)),),
+    )
+    tag_ids = [row[0] for row in cur.fetchall()]
+    if not tag_ids or (tag_filter.match_all and len(tag_ids) < len(tag_filter.tags)):
+        return []
+
+    seek = (
+        "SELECT w.id FROM word_tags wt CROSS JOIN words w ON w.id = wt.word_id"
+        f" WHERE wt.tag_id = ? AND wt.word_id > ? AND {condition}"
+    )
+    if tag_filter.match_all:
+        # Walk the first tag and check the others through the word_id index.
+        others, others_params = tag_condition(tag_filter, "w.id", per_row=True)
+        cur.execute(
+            f"{seek} AND {others} ORDER BY wt.word_id LIMIT ?",
+            [tag_ids[0], after] + params + others_params + [limit],
+        )
+        return [row[0] for row in cur.fetchall()]
+
+    # Any of the tags: the first `limit` of each, merged.
+    found: set[int] = set()
+    for tag_id in tag_ids:
+        cur.execute(
+            f"{seek} ORDER BY wt.word_id LIMIT ?", [tag_id, after] + params + [limit]
+        )
+        found.update(row[0] for row in cur.fetchall())
+    ids = sorted(found)
+    return ids if limit < 0 else ids[:limit]
+
+
+def probe_ids(
+    cur: sqlite3.Cursor,
+    rng: random.Random,
+    limit: int,
+    tag_filter: str | TagFilter | None = None,
+    exclude_ids: Collection[int] | None = None,
+) -> list[int]:
+    """
+    Returns up to `limit` random word IDs using rowid-range probing.
+
+    Each probe picks a random id between the smallest and largest matching
+    id and is kept only if that very id matches, so every matching word is
+    equally likely however the ids are spread, and a refill costs a handful
+    of primary key lookups instead of sorting the whole deck. When the
+    matching ids are too sparse for that to pay off they are read directly.
+    """
+    tag_filter = TagFilter.of(tag_filter)
+    seen = set(exclude_ids or ())
+    source = probe_source(cur, tag_filter)
+    if source is None or limit <= 0:
+        return []
+
+    member, member_params = _member_condition(tag_filter, seen)
+    # Share of the id range that matches, refined by each round's hits.
+    density = source.size / (source.high - source.low + 1)
+    found: list[int] = []
+    for _ in range(PROBE_ROUNDS):
+        missing = limit - len(found)
+        if missing <= 0:
+            break
+
+        count = math.ceil(missing * 2 / density)
+        if count > min(source.size, MAX_PROBES):
+            # Reading the candidates is cheaper than this many probes.
+            break
+        probes = [rng.randint(source.low, source.high) for _ in range(count)]
+        cur.execute(
+            "WITH probes(start) AS (SELECT value FROM json_each(?))"
+            f" SELECT start FROM probes WHERE {member}",
+            [json.dumps(probes)] + member_params,
+        )
+        hits = [row[0] for row in cur.fetchall()]
+        density = max(len(hits), 1) / count
+        for word_id in hits:
+            if word_id not in seen and len(found) < limit:
+                seen.add(word_id)
+                found.append(word_id)
+
+    if len(found) < limit:
+        # Few words match, or few are left undrawn: read the rest directly.
+        condition, params = tag_condition(tag_filter)
+        excluded, excluded_params = exclude_condition(seen)
+        cur.execute(
+            f"SELECT id FROM words WHERE {condition} AND {excluded}",
+            params + excluded_params,
+        )
+        rest = [row[0] for row in cur.fetchall() if row[0] not in seen]
+        found.extend(rng.sample(rest, min(limit - len(found), len(rest))))
+
+    return found
+
+
+def queue_ids(
+    cur: sqlite3.Cursor,
+    rng: random.Random,
+    source: ProbeSource | None,
+    size: int,
+    tag_filter: str | TagFilter | None = None,
+    exclude_ids: Collection[int] | None = None,
+    max_incorrect: int | None = None,
+) -> list[int]:
+    """
+    Returns up to `size` word IDs in one statement, given the filter's id
+    range from probe_source: words last answered incorrectly first (at
+    most `max_incorrect` of them, shuffled), then random words from
+    rowid-range probes as in probe_ids, or from the matching words
+    themselves when they are too sparse to probe.
+
+    Probes that miss or land on the same word are dropped rather than
+    retried, so the result can come up short.
+    """
+    tag_filter = TagFilter.of(tag_filter)
+    if max_incorrect is None:
+        max_incorrect = size
+    max_incorrect = max(int(max_incorrect), 0)
+    if source is None or size <= 0:
+        return []
+
+    # Enough probes per missing word to find two matches, as in probe_ids.
+    per_word = math.ceil(2 * (source.high - source.low + 1) / source.size)
+    if per_word * size > min(source.size, MAX_PROBES):
+        per_word = 0
+    probes = [rng.randint(source.low, source.high) for _ in range(per_word * size)]
+
+    condition, params = tag_condition(tag_filter, column="w.id", per_row=True)
+    excluded, excluded_params = exclude_condition(exclude_ids, "lt.word_id")
+    member, member_params = _member_condition(tag_filter, exclude_ids)
+    candidates, candidate_params = "", []
+    if not per_word:
+        # Too sparse to probe: read the matching words, as probe_ids would.
+        matches, matches_params = tag_condition(tag_filter, column="w.id")
+        others, others_params = exclude_condition(exclude_ids, "w.id")
+        candidates = (
+            f"UNION ALL SELECT w.id, 2, NULL FROM words w WHERE {matches} AND {others}"
+        )
+        candidate_params = matches_params + others_params
+    # The limits are inlined: bound as variables they make SQLite noticeably
+    # slower to run the statement.
+    cur.execute(
+        f"""
+        WITH missed AS MATERIALIZED (
+            SELECT w.id
+            FROM last_tested lt
+            CROSS JOIN words w ON w.id = lt.word_id
+            WHERE lt.last_correct = 0 AND {condition} AND {excluded}
+        ),
+        probes(n, start) AS (
+            SELECT key, value FROM json_each(?)
+            WHERE key < {per_word} * ({int(size)}
+                - MIN((SELECT COUNT(*) FROM missed), {max_incorrect}))
+        )
+        SELECT id, 0 AS priority, NULL AS n FROM missed
+        UNION ALL
+        SELECT start, 1, n FROM probes WHERE {member}
+        {candidates}
+        ORDER BY priority, n
+        """,
+        params
+        + excluded_params
+        + [json.dumps(probes)]
+        + member_params
+        + candidate_params,
+    )
+    rows = cur.fetchall()
+
+    # Only the (small) set of missed words is read, so it is sampled here
+    # with `rng`, as Database.get_incorrect_word_ids does.
+    missed = [row[0] for row in rows if row[1] == 0]
+    found = rng.sample(missed, min(max_incorrect, size, len(missed)))
+    seen = set(found)
+    # Probes landing on an already drawn word are dropped here, which is
+    # cheaper than deduplicating in SQL.
+    for word_id, priority, _ in rows:
+        if priority == 1 and word_id not in seen and len(found) < size:
+            seen.add(word_id)
+            found.append(word_id)
+
+    rest = [row[0] for row in rows if row[1] == 2 and row[0] not in seen]
+    found.extend(rng.sample(rest, min(size - len(found), len(rest))))
+    return found
+
+
+def probe_source(
+    cur: sqlite3.Cursor, tag_filter: TagFilter | None
+) -> ProbeSource | None:
+    """
+    Returns the range probes are drawn from for a filter, or None if the
+    filter can't match anything. The size is an estimate for tag filters
+    (words carrying several of the tags are counted for each) and taken to
+    be the whole range for the unfiltered deck, which seldom has gaps.
+    """
+    if not tag_filter:
+        cur.execute("SELECT (SELECT MIN(id) FROM words), (SELECT MAX(id) FROM words)")
+        low, high = cur.fetchone()
+        return None if low is None else ProbeSource(low, high, high - low + 1)
+
+    # Two index seeks per tag for its range, the count from tag_stats.
+    cur.execute(
+        """
+        SELECT (SELECT MIN(word_id) FROM word_tags WHERE tag_id = t.id),
+            (SELECT MAX(word_id) FROM word_tags WHERE tag_id = t.id),
+            ts.word_count
+        FROM tags t
+        JOIN tag_stats ts ON ts.tag_id = t.id
+        WHERE t.name IN (SELECT value FROM json_each(?))
+        """,
+        (json.dumps(sorted(tag_filter.tags)),),
+    )
+    rows = [tuple(row) for row in cur.fetchall()]
+    if not rows or (tag_filter.match_all and len(rows) < len(tag_filter.tags)):
+        return None
+
+    if tag_filter.match_all:
+        # Every match carries the smallest tag, so probe within its range.
+        low, high, size = min(rows, key=lambda row: row[2])
+    else:
+        low = min(row[0] for row in rows)
+        high = max(row[1] for row in rows)
+        size = sum(row[2] for row in rows)
+    return ProbeSource(low, high, max(min(size, high - low + 1), 1))
+
+
+def _member_condition(
+    tag_filter: TagFilter | None, exclude_ids: Collection[int] | None
+) -> tuple[str, list]:
+    """
+    Returns the condition (and its params) keeping the probes that landed
+    exactly on a matching word that isn't excluded.
+    """
+    if tag_filter:
+        condition, params = tag_condition(tag_filter, "probes.start", per_row=True)
+    else:
+        condition = "EXISTS (SELECT 1 FROM words WHERE id = probes.start)"
+        params = []
+    excluded, excluded_params = exclude_condition(exclude_ids, "probes.start")
+    return f"{condition} AND {excluded}", params + excluded_params
+
+
+def review_stats(
+    cur: sqlite3.Cursor, tag_filter: str | TagFilter | None = None
+) -> list[tuple[int, ReviewStats]]:
+    """
+    Returns every word matching the filter with its review count, misses
+    and last review time, read in one pass over the clustered reviews.
+    """
+    condition, params = tag_condition(tag_filter, column="w.id")
+    cur.execute(
+        f"""
+        SELECT w.id, COUNT(r.ts),
+            COALESCE(SUM(NOT (r.kana_correct AND r.meaning_correct)), 0),
+            MAX(r.ts)
+        FROM words w
+        LEFT JOIN reviews r ON r.word_id = w.id
+        WHERE {condition}
+        GROUP BY w.id
+        """,
+        params,
+    )
+    return [(row[0], ReviewStats(row[1], row[2], row[3])) for row in cur.fetchall()]
+
+
+def word_review_stats(
+    cur: sqlite3.Cursor, word_ids: Collection[int]
+) -> dict[int, ReviewStats]:
+    """Returns the review stats of the given words, leaving out unreviewed ones."""
+    cur.execute(
+        """
+        SELECT word_id, COUNT(*),
+            SUM(NOT (kana_correct AND meaning_correct)), MAX(ts)
+        FROM reviews
+        WHERE word_id IN (SELECT value FROM json_each(?))
+        GROUP BY word_id
+        """,
+        (json.dumps(list(word_ids)),),
+    )
+    return {row[0]: ReviewStats(row[1], row[2], row[3]) for row in cur.fetchall()}
+
+
+def next_epoch_ids(
+    cur: sqlite3.Cursor,
+    rng: random.Random,
+    limit: int,
+    tag_filter: str | TagFilter | None = None,
+    exclude_ids: Collection[int] | None = None,
+) -> list[int]:
+    """
+    Returns the next `limit` word IDs from the filter's persisted permutation.
+
+    Every matching word is drawn once before the deck is reshuffled into a
+    new epoch. Words added mid-epoch are appended to the current permutation.
+    The caller must commit, as the epoch position is advanced in place.
+    """
+    taken = set(exclude_ids or ())
+    tag_filter = TagFilter.of(tag_filter)
+    filter_key = tag_filter.key if tag_filter else ""
+    condition, params = tag_condition(tag_filter)
+    excluded, excluded_params = exclude_condition(exclude_ids, "word_id")
+
+    found: list[int] = []
+    reshuffled = False
+    while len(found) < limit:
+        cur.execute(
+            "SELECT position, size, max_word_id FROM sample_epochs WHERE filter_key = ?",
+            (filter_key,),
+        )
+        row = cur.fetchone()
+
+        if row is None or row["position"] >= row["size"]:
+            if reshuffled:
+                # Every word of the new epoch is excluded, nothing left to draw.
+                break
+            _start_epoch(cur, rng, filter_key, condition, params)
+            reshuffled = True
+            continue
+
+        position, size = row["position"], row["size"]
+        size = _append_new_words(
+            cur, rng, filter_key, tag_filter, size, row["max_word_id"]
+        )
+
+        # Excluded words are skipped over (and used up for this epoch) in SQL.
+        cur.execute(
+            "SELECT position, word_id FROM sample_order"
+            f" WHERE filter_key = ? AND position >= ? AND {excluded}"
+            " ORDER BY position LIMIT ?",
+            [filter_key, position] + excluded_params + [limit - len(found)],
+        )
+        rows = cur.fetchall()
+        for order_row in rows:
+            position = order_row["position"] + 1
+            if order_row["word_id"] not in taken:
+                taken.add(order_row["word_id"])
+                found.append(order_row["word_id"])
+
+        if not rows:
+            position = size
+        cur.execute(
+            "UPDATE sample_epochs SET position = ?, size = ? WHERE filter_key = ?",
+            (position, size, filter_key),
+        )
+
+    return found
+
+
+def _start_epoch(
+    cur: sqlite3.Cursor,
+    rng: random.Random,
+    filter_key: str,
+    condition: str,
+    params: list,
+) -> None:
+    """Writes a freshly shuffled permutation of the filtered deck."""
+    cur.execute(f"SELECT id FROM words WHERE {condition}", params)
+    ids = [row[0] for row in cur.fetchall()]
+    rng.shuffle(ids)
+
+    cur.execute("DELETE FROM sample_order WHERE filter_key = ?", (filter_key,))
+    cur.executemany(
+        "INSERT INTO sample_order (filter_key, position, word_id) VALUES (?, ?, ?)",
+        ((filter_key, position, word_id) for position, word_id in enumerate(ids)),
+    )
+    cur.execute(
+        "INSERT INTO sample_epochs (filter_key, epoch, position, size, max_word_id)"
+        " VALUES (?, 1, 0, ?, ?)"
+        " ON CONFLICT(filter_key) DO UPDATE SET epoch = epoch + 1,"
+        " position = 0, size = excluded.size, max_word_id = excluded.max_word_id",
+        (filter_key, len(ids), max(ids, default=0)),
+    )
+
+
+def _append_new_words(
+    cur: sqlite3.Cursor,
+    rng: random.Random,
+    filter_key: str,
+    tag_filter: TagFilter | None,
+    size: int,
+    max_word_id: int,
+) -> int:
+    """Appends words added since the epoch started, returning the new size."""
+    ids = ids_after(cur, tag_filter, max_word_id)
+    if not ids:
+        return size
+
+    rng.shuffle(ids)
+    cur.executemany(
+        "INSERT INTO sample_order (filter_key, position, word_id) VALUES (?, ?, ?)",
+        ((filter_key, size + offset, word_id) for offset, word_id in enumerate(ids)),
+    )
+    cur.execute(
+        "UPDATE sample_epochs SET size = ?, max_word_id = ? WHERE filter_key = ?",
+        (size + len(ids), max(ids), filter_key),
+    )
+    return size + len(ids)
@@ -0,0 +1,80 @@
+from typing import Protocol
+
+from .db import Database
+from .models import TagFilter
+
+
+class Scheduler(Protocol):
+    def pick(
+        self,
+        db: Database,
+        limit: int,
+        tag_filter: str | TagFilter | None,
+        exclude_ids: set[int],
+    ) -> list[int]:
+        """Returns up to `limit` word ids to queue next, none of them excluded."""
+        ...
+
+
+class RandomScheduler:
+    """
+    Words last answered incorrectly first, up to `incorrect_ratio` of each
+    refill, the rest drawn at random.
+    """
+
+    def __init__(self, incorrect_ratio: float = 1.0) -> None:
+        self.incorrect_ratio = incorrect_ratio
+
+    def pick(
+        self,
+        db: Database,
+        limit: int,
+        tag_filter: str | TagFilter | None,
+        exclude_ids: set[int],
+    ) -> list[int]:
+        return db.build_queue(
+            limit,
+            tag_filter=tag_filter,
+            exclude_ids=exclude_ids,
+            incorrect_ratio=self.incorrect_ratio,
+        )
+
+
+class SM2Scheduler:
+    """
+    Spaced repetition: words due for review first, most overdue first, then
+    words never reviewed. Once neither is left, random words are drawn so
+    the quiz can carry on ahead of schedule.
+    """
+
+    def pick(
+        self,
+        db: Database,
+        limit: int,
+        tag_filter: str | TagFilter | None,
+        exclude_ids: set[int],
+    ) -> list[int]:
+        ids = db.get_due_word_ids(
+            limit=limit, tag_filter=tag_filter, exclude_ids=exclude_ids
+        )
+        if len(ids) < limit:
+            ids += db.get_new_word_ids(
+                limit=limit - len(ids),
+                tag_filter=tag_filter,
+                exclude_ids=exclude_ids | set(ids),
+            )
+        if len(ids) < limit:
+            ids += db.get_random_word_ids(
+                limit=limit - len(ids),
+                tag_filter=tag_filter,
+                exclude_ids=exclude_ids | set(ids),
+            )
+        return ids
+
+
+def make_scheduler(name: str, incorrect_ratio: float = 1.0) -> Scheduler:
+    if name == "random":
+        return RandomScheduler(incorrect_ratio)
+    if name == "sm2":
+        return SM2Scheduler()
+    raise ValueError(f"Unknown scheduler: {name}")
@@ -0,0 +1,122 @@
+import functools
+
+from textual import work
+from textual.app import ComposeResult
+from textual.containers import Container, Horizontal
+from textual.screen import Screen
+from textual.widgets import Button, DataTable, Input, Label, Static
+
+from .async_db import AsyncDatabase
+from .edit_word_screen import EditWordScreen
+from .quiz_session import QuizSession
+
+PAGE_SIZE = 20
+
+
+class SearchScreen(Screen):
+    CSS_PATH = "styles.tcss"
+    BINDINGS = [("escape", "close", "Close")]
+
+    def __init__(self, db: AsyncDatabase, session: QuizSession | None = None):
+        super().__init__()
+        self.db = db
+        # The quiz in progress, told about edited words so it doesn't ask
+        # an outdated copy it already loaded.
+        self.session = session
+        self.query_text = ""
+        self.page = 0
+        self.has_next = False
+
+    def compose(self) -> ComposeResult:
+        yield Container(
+            Label("Search Words", id="search_title"),
+            Input(
+                placeholder="Kanji, kana, English or sentence text...",
+                id="search_input",
+            ),
+            DataTable(id="search_results", cursor_type="row"),
+            Static("", id="search_status"),
+            Horizontal(
+                Button("Previous", id="prev_btn", disabled=True),
+                Button("Next", id="next_page_btn", disabled=True),
+                Button("Close", variant="error", id="close_btn"),
+                id="search_buttons",
+            ),
+            id="search_container",
+        )
+
+    def on_mount(self) -> None:
+        table = self.query_one("#search_results", DataTable)
+        table.add_columns("Kanji", "Kana", "English", "Sentence", "Tag")
+        self.query_one("#search_input", Input).focus()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self.query_text = event.value
+        self.page = 0
+        self.show_page()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        self.query_one("#search_results", DataTable).focus()
+
+    # Exclusive, so a search still running when the query changes again is
+    # cancelled rather than overwriting the newer results.
+    @work(exclusive=True)
+    async def show_page(self) -> None:
+        # One extra row tells whether there is a next page.
+        words = await self.db.search_words(
+            self.query_text, limit=PAGE_SIZE + 1, offset=self.page * PAGE_SIZE
+        )
+        self.has_next = len(words) > PAGE_SIZE
+        words = words[:PAGE_SIZE]
+
+        table = self.query_one("#search_results", DataTable)
+        table.clear()
+        for word in words:
+            table.add_row(
+                word.kanji_word,
+                word.kana_word,
+                word.english_word,
+                word.japanese_sentence,
+                word.tag,
+                key=str(word.id),
+            )
+
+        status = self.query_one("#search_status", Static)
+        if not self.query_text.strip():
+            status.update("")
+        elif not words:
+            status.update("No matches")
+        else:
+            first = self.page * PAGE_SIZE + 1
+            status.update(f"Page {self.page + 1} ({first}-{first + len(words) - 1})")
+
+        self.query_one("#prev_btn", Button).disabled = self.page == 0
+        self.query_one("#next_page_btn", Button).disabled = not self.has_next
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "close_btn":
+            self.action_close()
+        elif event.button.id == "prev_btn" and self.page > 0:
+            self.page -= 1
+            self.show_page()
+        elif event.button.id == "next_page_btn" and self.has_next:
+            self.page += 1
+            self.show_page()
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        if event.row_key.value is not None:
+            word_id = int(event.row_key.value)
+            self.app.push_screen(
+                EditWordScreen(self.db, word_id),
+                functools.partial(self.on_edit_word_done, word_id),
+            )
+
+    async def on_edit_word_done(self, word_id: int, changed: bool) -> None:
+        if changed:
+            word = await self.db.get_word(word_id)
+            if word and self.session:
+                await self.db.run(self.session.reload_word, word)
+            self.show_page()
+
+    def action_close(self) -> None:
+        self.dismiss()
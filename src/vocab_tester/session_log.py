@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+from typing import NamedTuple, Self
+
+from .config import Config
+from .models import TagFilter
+
+
+class SessionSettings(NamedTuple):
+    """Everything besides the deck and the answers that decides what is asked."""
+
+    seed: int | None = None
+    sample_mode: str = "random"
+    scheduler: str = "random"
+    incorrect_ratio: float = 1.0
+    session_size: int = 10
+    exclude_seen: bool = False
+    leech_threshold: int = 0
+    leech_mode: str = "allow"
+
+    @classmethod
+    def from_config(cls, config: Config, seed: int | None = None) -> Self:
+        return cls(
+            seed,
+            config.sample_mode,
+            config.scheduler,
+            config.incorrect_ratio,
+            config.session_size,
+            config.exclude_seen,
+            config.leech_threshold,
+            config.leech_mode,
+        )
+
+
+class RecordedAnswer(NamedTuple):
+    word_id: int
+    kana_correct: bool
+    meaning_correct: bool
+    response_ms: int | None = None
+    # The filter the word was asked under.
+    tag_filter: TagFilter | None = None
+
+    @property
+    def correct(self) -> bool:
+        return self.kana_correct and self.meaning_correct
+
+
+class SessionLog:
+    """
+    Records the answers given in a quiz session as JSON lines, after a first
+    line holding the session's settings, so the session can be replayed.
+    """
+
+    def __init__(self, path: Path, settings: SessionSettings) -> None:
+        self.path = path
+        self._file = path.open("w", encoding="utf-8")
+        self._write(settings._asdict())
+
+    def record(self, answer: RecordedAnswer) -> None:
+        entry = answer._asdict()
+        tag_filter = entry.pop("tag_filter")
+        if tag_filter:
+            entry["tags"] = sorted(tag_filter.tags)
+            entry["match_all"] = tag_filter.match_all
+        self._write(entry)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _write(self, entry: dict) -> None:
+        # Flushed per line, so a crashed session is still replayable.
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+
+def load_session(path: Path) -> tuple[SessionSettings, list[RecordedAnswer]]:
+    """Reads back a session written by SessionLog."""
+    with path.open(encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"Empty session log: {path}")
+
+    answers = []
+    for entry in lines[1:]:
+        tags = entry.pop("tags", None)
+        match_all = entry.pop("match_all", False)
+        tag_filter = TagFilter(frozenset(tags), match_all) if tags else None
+        answers.append(RecordedAnswer(**entry, tag_filter=tag_filter))
+    return SessionSettings(**lines[0]), answers
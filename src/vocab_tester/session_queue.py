@@ -0,0 +1,76 @@
+from collections import Counter, deque
+from typing import Iterable, Iterator, overload
+
+
+class SessionQueue:
+    """
+    The word ids waiting to be asked, front first.
+
+    A deque, so taking the next word and putting one back at (or a few
+    places from) the front don't shift the rest of the queue, plus a count
+    per id so membership and duplicate checks don't scan it. Supports the
+    read-only list operations older callers of QuizSession.queue rely on.
+    """
+
+    def __init__(self, word_ids: Iterable[int] = ()) -> None:
+        self._ids: deque[int] = deque()
+        self._counts: Counter[int] = Counter()
+        self.extend(word_ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __contains__(self, word_id: object) -> bool:
+        # Ids are dropped from the counts once none are left.
+        return word_id in self._counts
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]: ...
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        if isinstance(index, slice):
+            return list(self._ids)[index]
+        return self._ids[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SessionQueue):
+            return self._ids == other._ids
+        if isinstance(other, list):
+            return list(self._ids) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SessionQueue({list(self._ids)!r})"
+
+    def count(self, word_id: int) -> int:
+        return self._counts[word_id]
+
+    def append(self, word_id: int) -> None:
+        self._ids.append(word_id)
+        self._counts[word_id] += 1
+
+    def extend(self, word_ids: Iterable[int]) -> None:
+        for word_id in word_ids:
+            self.append(word_id)
+
+    def insert(self, index: int, word_id: int) -> None:
+        """Inserts so that `index` items are ahead of the word (fewer if short)."""
+        self._ids.insert(index, word_id)
+        self._counts[word_id] += 1
+
+    def popleft(self) -> int:
+        word_id = self._ids.popleft()
+        self._counts[word_id] -= 1
+        if not self._counts[word_id]:
+            del self._counts[word_id]
+        return word_id
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self._counts.clear()
@@ -0,0 +1,60 @@
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+from .models import TagFilter, Word
+
+SNAPSHOT_SUFFIX = ".session.json"
+
+
+class SessionSnapshot(NamedTuple):
+    """
+    An in-progress quiz session: the queue along with the words in it, so
+    it can be picked up again without querying the deck, plus where the
+    current question had got to and the score so far.
+    """
+
+    queue: list[int]
+    words: list[Word]
+    current_word_id: int | None
+    tag_filter: TagFilter | None
+    seen: list[int]
+    step: str = "kana"
+    kana_answer: str = ""
+    score_correct: int = 0
+    score_total: int = 0
+
+
+def snapshot_path(db_path: Path) -> Path:
+    """Where the session for a deck is kept: beside it, named after it."""
+    return db_path.with_suffix(SNAPSHOT_SUFFIX)
+
+
+def save_snapshot(path: Path, snapshot: SessionSnapshot) -> None:
+    """Writes the snapshot, replacing any earlier one atomically."""
+    entry = snapshot._asdict()
+    entry["words"] = [word.model_dump() for word in snapshot.words]
+    tag_filter = entry.pop("tag_filter")
+    if tag_filter:
+        entry["tags"] = sorted(tag_filter.tags)
+        entry["match_all"] = tag_filter.match_all
+
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text(
+        json.dumps(entry, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+    )
+    os.replace(temp_path, path)
+
+
+def load_snapshot(path: Path) -> SessionSnapshot | None:
+    """Reads a snapshot back, or None if there is none or it can't be read."""
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        tags = entry.pop("tags", None)
+        match_all = entry.pop("match_all", False)
+        entry["words"] = [Word(**word) for word in entry.get("words", [])]
+        tag_filter = TagFilter(frozenset(tags), match_all) if tags else None
+        return SessionSnapshot(**entry, tag_filter=tag_filter)
+    except (OSError, ValueError, TypeError):
+        return None
@@ -0,0 +1,124 @@
+import sqlite3
+from typing import Collection, NamedTuple
+
+from .models import Review, TagFilter
+from .sampling import exclude_condition, ids_after, tag_condition
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+
+# Correct answers given faster than this count as perfect recall.
+FAST_ANSWER_MS = 4000
+
+
+class Schedule(NamedTuple):
+    """
+    SM-2 state of a word. Stability is the current interval in days,
+    difficulty the ease factor that interval grows by, reps the run of
+    successful reviews and due_at when it is next due (unix milliseconds).
+    """
+
+    word_id: int
+    due_at: int
+    stability: float
+    difficulty: float
+    reps: int
+
+
+def grade(review: Review) -> int:
+    """Maps an answer onto SM-2's 0-5 recall quality (below 3 is a lapse)."""
+    if review.correct:
+        fast = review.response_ms is not None and review.response_ms < FAST_ANSWER_MS
+        return 5 if fast else 4
+    if review.kana_correct or review.meaning_correct:
+        return 2
+    return 0
+
+
+def next_schedule(schedule: Schedule | None, review: Review) -> Schedule:
+    """Applies one review to a word's schedule (None for a new word)."""
+    stability, ease, reps = (
+        (schedule.stability, schedule.difficulty, schedule.reps)
+        if schedule
+        else (0.0, INITIAL_EASE, 0)
+    )
+    quality = grade(review)
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+    if quality < 3:
+        reps, stability = 0, 1.0
+    else:
+        reps += 1
+        stability = 1.0 if reps == 1 else 6.0 if reps == 2 else stability * ease
+
+    return Schedule(
+        review.word_id,
+        review.timestamp + round(stability * DAY_MS),
+        stability,
+        ease,
+        reps,
+    )
+
+
+def record_review(cur: sqlite3.Cursor, review: Review) -> None:
+    """Reschedules the reviewed word. The caller must commit."""
+    cur.execute(
+        "SELECT word_id, due_at, stability, difficulty, reps"
+        " FROM schedule WHERE word_id = ?",
+        (review.word_id,),
+    )
+    row = cur.fetchone()
+    schedule = next_schedule(Schedule(*row) if row else None, review)
+    cur.execute(
+        "INSERT OR REPLACE INTO schedule"
+        " (word_id, due_at, stability, difficulty, reps) VALUES (?, ?, ?, ?, ?)",
+        schedule,
+    )
+
+
+def due_ids(
+    cur: sqlite3.Cursor,
+    now: int,
+    limit: int,
+    tag_filter: str | TagFilter | None = None,
+    exclude_ids: Collection[int] | None = None,
+) -> list[int]:
+    """
+    Returns up to `limit` ids of words due by `now`, most overdue first.
+    Walks idx_schedule_due from the oldest due time, so only due rows are
+    read however many words have been scheduled.
+    """
+    condition, params = tag_condition(tag_filter, "s.word_id", per_row=True)
+    excluded, excluded_params = exclude_condition(exclude_ids, "s.word_id")
+    # CROSS JOIN keeps the due index as the outer loop; the join itself
+    # skips words deleted since they were scheduled.
+    cur.execute(
+        f"""
+        SELECT s.word_id FROM schedule s
+        CROSS JOIN words w ON w.id = s.word_id
+        WHERE s.due_at <= ? AND {condition} AND {excluded}
+        ORDER BY s.due_at LIMIT ?
+        """,
+        [now] + params + excluded_params + [limit],
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def new_ids(
+    cur: sqlite3.Cursor,
+    limit: int,
+    tag_filter: str | TagFilter | None = None,
+    exclude_ids: Collection[int] | None = None,
+) -> list[int]:
+    """Returns up to `limit` ids of never reviewed words, oldest first."""
+    excluded, excluded_params = exclude_condition(exclude_ids, "w.id")
+    return ids_after(
+        cur,
+        tag_filter,
+        0,
+        limit,
+        f"NOT EXISTS (SELECT 1 FROM schedule s WHERE s.word_id = w.id) AND {excluded}",
+        excluded_params,
+    )
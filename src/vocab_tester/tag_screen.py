@@ -3,13 +3,13 @@ from textual.containers import Container, VerticalScroll
 from textual.screen import ModalScreen
 from textual.widgets import Button, Label
 
-from .db import Database
+from .async_db import AsyncDatabase
 
 
 class TagSelectionScreen(ModalScreen[str | None]):
     CSS_PATH = "styles.tcss"
 
-    def __init__(self, db: Database):
+    def __init__(self, db: AsyncDatabase):
         super().__init__()
         self.db = db
 
@@ -24,18 +24,16 @@ class TagSelectionScreen(ModalScreen[str | None]):
             id="tag_selection_container",
         )
 
-    def on_mount(self) -> None:
+    async def on_mount(self) -> None:
         tag_list = self.query_one("#tag_list", VerticalScroll)
-        tags = self.db.get_tags()
-
-        for tag in tags:
-            # Create a button for each tag.
-            # We use the tag name as the label.
-            # We can't use the tag as ID directly if it has spaces or invalid chars,
-            # but for simple implementation we can use a custom attribute or just check label in handler.
-            # Using a class for tag buttons helps identifying them.
-            btn = Button(tag, classes="tag-button")
-            # We can store the tag value on the button itself if we subclass or just use the label
+
+        for stats in await self.db.get_tag_stats():
+            # The label carries the count, the widget name the tag itself.
+            btn = Button(
+                f"{stats.name} ({stats.word_count})",
+                name=stats.name,
+                classes="tag-button",
+            )
             tag_list.mount(btn)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
@@ -44,5 +42,4 @@ class TagSelectionScreen(ModalScreen[str | None]):
         elif event.button.id == "filter_all":
             self.dismiss("")  # Empty string = All/No filter
         elif "tag-button" in event.button.classes:
-            # The label of the button is the tag
-            self.dismiss(str(event.button.label))
+            self.dismiss(event.button.name)
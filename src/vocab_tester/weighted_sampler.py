@@ -0,0 +1,159 @@
+from array import array
+import random
+from typing import Callable, Collection, Iterable, NamedTuple
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Words unseen for this long count as fully stale.
+STALE_DAYS = 30
+
+# How long a sampler's weights are used before staleness is recomputed for
+# the words not reviewed since. An hour is a rounding error next to
+# STALE_DAYS.
+REWEIGH_MS = 60 * 60 * 1000
+
+
+class ReviewStats(NamedTuple):
+    reviews: int = 0
+    misses: int = 0
+    last_seen: int | None = None  # unix milliseconds
+
+
+def word_weight(stats: ReviewStats, now: int) -> float:
+    """
+    How likely a word is to be drawn: its error rate, smoothed so that new
+    and rarely seen words start at one half, scaled by up to two as the
+    time since it was last seen approaches STALE_DAYS. Words never seen
+    have nothing to forget yet, so they aren't scaled.
+    """
+    error_rate = (stats.misses + 1) / (stats.reviews + 2)
+    staleness = 0.0
+    if stats.last_seen is not None:
+        days = max(now - stats.last_seen, 0) / DAY_MS
+        staleness = min(days, STALE_DAYS) / STALE_DAYS
+    return error_rate * (1 + staleness)
+
+
+class WeightedSampler:
+    """
+    Draws word ids in proportion to their weights.
+
+    The weights sit in a Fenwick tree over a flat array of doubles, so
+    changing one weight after a review and each draw both cost O(log n),
+    and the memory use is a few machine words per id.
+    """
+
+    def __init__(self, weights: Iterable[tuple[int, float]] = ()) -> None:
+        self._ids = array("q")
+        self._weights = array("d")
+        self._tree = array("d", [0.0])  # 1-based
+        self._positions: dict[int, int] = {}
+        for word_id, weight in weights:
+            self.set_weight(word_id, weight)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, word_id: object) -> bool:
+        return word_id in self._positions
+
+    @property
+    def total(self) -> float:
+        return self._prefix_sum(len(self._ids))
+
+    def weight(self, word_id: int) -> float:
+        position = self._positions.get(word_id)
+        return 0.0 if position is None else self._weights[position]
+
+    def set_weight(self, word_id: int, weight: float) -> None:
+        """Updates a word's weight, adding the word if it's new."""
+        weight = max(weight, 0.0)
+        position = self._positions.get(word_id)
+        if position is None:
+            self._append(word_id, weight)
+        else:
+            self._add(position, weight - self._weights[position])
+            self._weights[position] = weight
+
+    def reweigh(self, weigh: Callable[[int, float], float]) -> None:
+        """
+        Replaces every weight with weigh(word id, old weight) and rebuilds
+        the tree in one O(n) pass.
+        """
+        for position, word_id in enumerate(self._ids):
+            self._weights[position] = max(weigh(word_id, self._weights[position]), 0.0)
+        self._tree = array("d", [0.0])
+        self._tree.extend(self._weights)
+        for index in range(1, len(self._tree)):
+            parent = index + (index & -index)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[index]
+
+    def sample(
+        self,
+        rng: random.Random,
+        k: int,
+        exclude_ids: Collection[int] | None = None,
+    ) -> list[int]:
+        """Draws up to `k` distinct ids, skipping excluded ones."""
+        # Excluded and drawn words are zeroed for the duration of the draw,
+        # so no draw is ever wasted on them.
+        removed: dict[int, float] = {}
+        for word_id in exclude_ids or ():
+            position = self._positions.get(word_id)
+            if position is not None and position not in removed:
+                removed[position] = self._weights[position]
+                self._add(position, -removed[position])
+
+        found: list[int] = []
+        try:
+            while len(found) < k:
+                total = self.total
+                if total <= 1e-12:
+                    break
+                position = self._find(rng.random() * total)
+                if position in removed or self._weights[position] <= 0:
+                    # Only reachable through rounding in the tree's sums.
+                    break
+                found.append(self._ids[position])
+                removed[position] = self._weights[position]
+                self._add(position, -removed[position])
+        finally:
+            for position, weight in removed.items():
+                self._add(position, weight)
+        return found
+
+    def _append(self, word_id: int, weight: float) -> None:
+        self._positions[word_id] = len(self._ids)
+        self._ids.append(word_id)
+        self._weights.append(weight)
+        # A new node covers the range ending at it: its own weight plus the
+        # nodes already summed below it.
+        index = len(self._ids)
+        low = index - (index & -index)
+        self._tree.append(weight + self._prefix_sum(index - 1) - self._prefix_sum(low))
+
+    def _add(self, position: int, delta: float) -> None:
+        index = position + 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _prefix_sum(self, count: int) -> float:
+        total = 0.0
+        while count > 0:
+            total += self._tree[count]
+            count -= count & -count
+        return total
+
+    def _find(self, target: float) -> int:
+        """Returns the position whose cumulative weight range holds target."""
+        position = 0
+        step = 1 << (len(self._ids).bit_length())
+        while step:
+            following = position + step
+            if following < len(self._tree) and self._tree[following] <= target:
+                position = following
+                target -= self._tree[following]
+            step >>= 1
+        return min(position, len(self._ids) - 1)
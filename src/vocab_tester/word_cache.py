@@ -0,0 +1,66 @@
+from collections import OrderedDict
+import threading
+from typing import Iterable, NamedTuple
+
+from .models import Word
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class WordCache:
+    """
+    Bounded least-recently-used cache of Word objects by id.
+
+    Copies go in and out, so callers editing a Word they were handed can't
+    change the cached one. Shared by every thread using the Database.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._words: OrderedDict[int, Word] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, word_id: int) -> Word | None:
+        with self._lock:
+            word = self._words.get(word_id)
+            if word is None:
+                self.misses += 1
+                return None
+            self._words.move_to_end(word_id)
+            self.hits += 1
+        return word.model_copy()
+
+    def put(self, word: Word) -> None:
+        if word.id is None or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._words[word.id] = word.model_copy()
+            self._words.move_to_end(word.id)
+            while len(self._words) > self.maxsize:
+                self._words.popitem(last=False)
+
+    def invalidate(self, word_ids: Iterable[int] | None = None) -> None:
+        """Drops the given ids, or everything if none are given."""
+        with self._lock:
+            if word_ids is None:
+                self._words.clear()
+                return
+            for word_id in word_ids:
+                self._words.pop(word_id, None)
+
+    def invalidate_above(self, word_id: int) -> None:
+        """Drops every id greater than `word_id`."""
+        with self._lock:
+            for cached_id in [i for i in self._words if i > word_id]:
+                del self._words[cached_id]
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._words))
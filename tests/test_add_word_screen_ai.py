@@ -3,6 +3,7 @@ import asyncio
 from unittest.mock import MagicMock
 from textual.app import App
 from vocab_tester.add_word_screen import AddWordScreen
+from vocab_tester.async_db import AsyncDatabase
 from vocab_tester.ai_service import GeneratedWordData
 
 
@@ -13,7 +14,7 @@ class MockDatabase:
 
 class AddWordApp(App):
     def on_mount(self) -> None:
-        self.push_screen(AddWordScreen(MockDatabase()))  # type: ignore
+        self.push_screen(AddWordScreen(AsyncDatabase(MockDatabase())))  # type: ignore
 
 
 @pytest.mark.asyncio
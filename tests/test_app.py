@@ -1,5 +1,11 @@
 import pytest
 from vocab_tester.app import VocabTesterApp
+from vocab_tester.db import Database
+from vocab_tester.session_snapshot import (
+    SessionSnapshot,
+    save_snapshot,
+    snapshot_path,
+)
 
 
 @pytest.mark.asyncio
@@ -39,3 +45,34 @@ async def test_score_logic():
     assert app.score_correct == 1
     assert app.score_total == 2
     assert "Score: 1/2" in app.sub_title
+
+
+def test_app_shares_injected_database(tmp_path):
+    db = Database(db_path=tmp_path / "test_vocab.db")
+    app = VocabTesterApp(db=db)
+    assert app.db is db
+    assert app.async_db.db is db
+
+
+@pytest.mark.asyncio
+async def test_app_restores_saved_score(tmp_path):
+    db = Database(db_path=tmp_path / "test_vocab.db")
+    save_snapshot(
+        snapshot_path(db.db_path),
+        SessionSnapshot([2], [], None, None, [], score_correct=3, score_total=4),
+    )
+    app = VocabTesterApp(db=db)
+    app.on_mount()
+
+    assert app.resume_from.queue == [2]
+    assert "Score: 3/4" in app.sub_title
+
+
+def test_decks_in_one_directory_keep_their_own_session(tmp_path):
+    db = Database(db_path=tmp_path / "test_vocab.db")
+    other = Database(db_path=tmp_path / "other.db")
+    save_snapshot(snapshot_path(db.db_path), SessionSnapshot([2], [], None, None, []))
+
+    assert VocabTesterApp(db=db).resume_from.queue == [2]
+    assert VocabTesterApp(db=other).resume_from is None
+    assert snapshot_path(other.db_path) == tmp_path / "other.session.json"
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from vocab_tester.async_db import AsyncDatabase
+from vocab_tester.db import Database
+from vocab_tester.models import Word
+
+
+@pytest.fixture
+def async_db(tmp_path):
+    """An AsyncDatabase over a temporary database."""
+    db = AsyncDatabase(Database(db_path=tmp_path / "test_vocab.db"))
+    yield db
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_calls_run_on_one_dedicated_thread(async_db):
+    threads = {await async_db.run(threading.get_ident) for _ in range(5)}
+    assert len(threads) == 1
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_slow_call_does_not_block_event_loop(async_db):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await async_db.run(time.sleep, 0.2)
+    task.cancel()
+
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_calls_run_in_submission_order(async_db):
+    word = Word(
+        kanji_word="猫",
+        kana_word="ねこ",
+        english_word="cat",
+        japanese_sentence="猫です。",
+        english_sentence="It's a cat.",
+        tag="noun",
+    )
+    # Not awaited one by one: the read must still see the write queued first.
+    _, tags = await asyncio.gather(async_db.add_word(word), async_db.get_tags())
+    assert "noun" in tags
+
+
+@pytest.mark.asyncio
+async def test_api_mirrors_database(async_db):
+    word_id = (await async_db.get_random_word_ids(1))[0]
+    word = await async_db.get_word(word_id)
+    assert word is not None and word.id == word_id
+
+    word.english_word = "changed"
+    await async_db.update_word(word)
+    await async_db.record_result(word_id, False)
+
+    assert (await async_db.get_word(word_id)).english_word == "changed"
+    assert await async_db.get_incorrect_word_ids(5) == [word_id]
+    assert [w.id for w in await async_db.search_words("changed")] == [word_id]
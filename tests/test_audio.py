@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 import sys
 import subprocess
 from vocab_tester.quiz_screen import QuizScreen
+from vocab_tester.async_db import AsyncDatabase
 from vocab_tester.models import Word
 
 
@@ -19,12 +20,26 @@ class MockDatabase:
             tag="Tag",
         )
 
+    def get_words(self, word_ids):
+        return [self.get_word(word_id) for word_id in word_ids]
+
     def get_incorrect_word_ids(self, limit, tag_filter=None, exclude_ids=None):
         return []
 
     def get_random_word_ids(self, limit, tag_filter=None, exclude_ids=None):
         return [1]
 
+    def build_queue(self, size, tag_filter=None, exclude_ids=None, incorrect_ratio=1.0):
+        ids = self.get_incorrect_word_ids(size, tag_filter, exclude_ids)
+        return ids + self.get_random_word_ids(
+            size - len(ids),
+            tag_filter=tag_filter,
+            exclude_ids=set(exclude_ids or ()) | set(ids),
+        )
+
+    def get_failure_counts(self, word_ids):
+        return {}
+
 
 # Testable subclass
 class MockQuizScreen(QuizScreen):
@@ -49,10 +64,11 @@ class MockQuizScreen(QuizScreen):
 @pytest.fixture
 def screen():
     db = MockDatabase()
-    return MockQuizScreen(db)
+    return MockQuizScreen(AsyncDatabase(db))
 
 
-def test_audio_button_press_calls_play_audio(screen):
+@pytest.mark.asyncio
+async def test_audio_button_press_calls_play_audio(screen):
     """Test that pressing the audio button calls the play_audio worker."""
     # Mock play_audio (worker)
     screen.play_audio = MagicMock()
@@ -60,7 +76,7 @@ def test_audio_button_press_calls_play_audio(screen):
     event = MagicMock()
     event.button.id = "audio_btn"
 
-    screen.on_button_pressed(event)
+    await screen.on_button_pressed(event)
 
     screen.play_audio.assert_called_once()
 
@@ -0,0 +1,66 @@
+import multiprocessing
+from pathlib import Path
+
+from vocab_tester.db import Database
+from vocab_tester.models import Review, Word
+from vocab_tester.seeds import SAMPLES
+
+PROCESSES = 6
+ROUNDS = 40
+
+
+def _worker(db_path: Path, worker: int, start) -> None:
+    start.wait()
+    # Every process opens the fresh file at once, so this also races the
+    # schema setup and migrations.
+    db = Database(db_path=db_path)
+    for i in range(ROUNDS):
+        db.add_words(
+            [
+                Word(
+                    kanji_word=f"字{worker}-{i}",
+                    kana_word="じ",
+                    english_word=f"word {worker} {i}",
+                    japanese_sentence="字です。",
+                    english_sentence="A character.",
+                    tag=f"proc{worker}",
+                )
+            ]
+        )
+        # A distinct ts per process and round keeps every review's key unique.
+        db.record_results([Review(1, worker * 1_000_000 + i, True, i % 2 == 0, 500)])
+        db.get_random_word_ids(5)
+        db.search_words(f"word {worker}")
+        word = db.get_word(1)
+        word.english_sentence = f"edited by {worker}"
+        db.update_word(word)
+    db.close()
+
+
+def test_processes_share_one_database(tmp_path):
+    """Concurrent readers and writers in separate processes lose no writes."""
+    db_path = tmp_path / "shared.db"
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Barrier(PROCESSES)
+    processes = [
+        ctx.Process(target=_worker, args=(db_path, n, start)) for n in range(PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+
+    assert [p.exitcode for p in processes] == [0] * PROCESSES
+
+    db = Database(db_path=db_path)
+    with db.get_cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM words")
+        assert cur.fetchone()[0] == len(SAMPLES) + PROCESSES * ROUNDS
+        cur.execute("SELECT COUNT(*) FROM reviews")
+        assert cur.fetchone()[0] == PROCESSES * ROUNDS
+        cur.execute("PRAGMA journal_mode")
+        assert cur.fetchone()[0] == "wal"
+    counts = {stats.name: stats.word_count for stats in db.get_tag_stats()}
+    for n in range(PROCESSES):
+        assert counts[f"proc{n}"] == ROUNDS
+    db.close()
@@ -1,5 +1,5 @@
 import pytest
-from vocab_tester.config import Config
+from vocab_tester.config import DATABASE_PRESETS, Config, DatabaseSettings
 
 
 def test_config_defaults():
@@ -7,6 +7,8 @@ def test_config_defaults():
     config = Config()
     assert config.default_filter is None
     assert config.translation_kana == "hiragana"
+    assert config.leech_threshold == 0
+    assert config.leech_mode == "allow"
 
 
 def test_config_from_file_not_exists(tmp_path):
@@ -46,3 +48,53 @@ def test_config_from_file_invalid_toml(tmp_path):
 
     with pytest.raises(Exception):
         Config.from_file(config_path)
+
+
+def test_config_sample_mode(tmp_path):
+    """Test that the sample mode defaults to random and can be overridden."""
+    assert Config().sample_mode == "random"
+
+    config_path = tmp_path / "settings.toml"
+    config_path.write_text('sample_mode = "epoch"', encoding="utf-8")
+    assert Config.from_file(config_path).sample_mode == "epoch"
+
+
+def test_config_seed(tmp_path):
+    """Test that sessions are unseeded unless a seed is configured."""
+    assert Config().seed is None
+
+    config_path = tmp_path / "settings.toml"
+    config_path.write_text("seed = 1234", encoding="utf-8")
+    assert Config.from_file(config_path).seed == 1234
+
+
+def test_config_word_cache_size(tmp_path):
+    assert Config().word_cache_size == 1024
+
+    config_path = tmp_path / "settings.toml"
+    config_path.write_text("word_cache_size = 50000", encoding="utf-8")
+    assert Config.from_file(config_path).word_cache_size == 50000
+
+
+def test_database_settings_default_to_laptop_preset():
+    assert Config().database == DatabaseSettings.from_dict({"preset": "laptop"})
+
+
+def test_database_preset_with_overrides(tmp_path):
+    config_path = tmp_path / "settings.toml"
+    config_path.write_text(
+        '[database]\npreset = "sd-card-kiosk"\nbusy_timeout = 250\n', encoding="utf-8"
+    )
+
+    database = Config.from_file(config_path).database
+    assert database.busy_timeout == 250
+    assert database.mmap_size == DATABASE_PRESETS["sd-card-kiosk"]["mmap_size"]
+    assert database.cache_size == DATABASE_PRESETS["sd-card-kiosk"]["cache_size"]
+
+
+def test_database_settings_are_validated():
+    with pytest.raises(ValueError):
+        DatabaseSettings.from_dict({"preset": "mainframe"})
+    with pytest.raises(ValueError):
+        DatabaseSettings(journal_mode="WAL; DROP TABLE words")
+    assert DatabaseSettings(synchronous="full").synchronous == "FULL"
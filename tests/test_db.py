@@ -1,5 +1,10 @@
+import sqlite3
+import threading
+
 import pytest
-from vocab_tester.db import Database
+from vocab_tester import db as db_module
+from vocab_tester.config import DatabaseSettings
+from vocab_tester.db import Database, retry_on_busy
 from vocab_tester.models import Word
 
 
@@ -285,3 +290,141 @@ def test_get_random_word_ids_excludes(temp_db):
     # Exclude it
     ids = temp_db.get_random_word_ids(limit=100, exclude_ids=[w_id])
     assert w_id not in ids
+
+
+def test_connection_is_reused(temp_db):
+    """Test that consecutive calls share one pooled connection."""
+    with temp_db.get_cursor() as cur:
+        first = cur.connection
+    with temp_db.get_cursor() as cur:
+        second = cur.connection
+    assert first is second
+
+
+def test_connections_are_per_thread(temp_db):
+    """Test that each thread gets its own connection."""
+    with temp_db.get_cursor() as cur:
+        main_con = cur.connection
+
+    seen = []
+
+    def worker():
+        with temp_db.get_cursor() as cur:
+            seen.append(cur.connection)
+            cur.execute("SELECT COUNT(*) FROM words")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen and seen[0] is not main_con
+
+
+def test_uncommitted_writes_are_rolled_back(temp_db):
+    """Test that writes without commit=True don't leak into later calls."""
+    with temp_db.get_cursor() as cur:
+        cur.execute("DELETE FROM words")
+
+    with temp_db.get_cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM words")
+        assert cur.fetchone()[0] > 0
+
+
+def test_close_reopens_lazily(temp_db):
+    """Test that the database is still usable after close()."""
+    with temp_db.get_cursor() as cur:
+        old_con = cur.connection
+
+    temp_db.close()
+
+    assert temp_db.get_tags()
+    with temp_db.get_cursor() as cur:
+        assert cur.connection is not old_con
+
+
+def test_get_words_preserves_order(temp_db):
+    with temp_db.get_cursor() as cur:
+        cur.execute("SELECT id FROM words ORDER BY id")
+        ids = [row[0] for row in cur.fetchall()][:3]
+
+    order = [ids[2], ids[0], 9999, ids[1], ids[0]]
+    words = temp_db.get_words(order)
+
+    assert [w.id for w in words] == [ids[2], ids[0], ids[1], ids[0]]
+    assert temp_db.get_words([]) == []
+
+
+def test_settings_applied_to_every_connection(tmp_path):
+    settings = DatabaseSettings.from_dict(
+        {"preset": "shared-server", "cache_size": -1234}
+    )
+    db = Database(db_path=tmp_path / "test_vocab.db", settings=settings)
+
+    def read_pragmas(results):
+        con = db._connection()
+        results.append(
+            (
+                con.execute("PRAGMA journal_mode").fetchone()[0],
+                con.execute("PRAGMA synchronous").fetchone()[0],
+                con.execute("PRAGMA cache_size").fetchone()[0],
+                con.execute("PRAGMA temp_store").fetchone()[0],
+                con.execute("PRAGMA busy_timeout").fetchone()[0],
+            )
+        )
+
+    results: list[tuple] = []
+    read_pragmas(results)
+    thread = threading.Thread(target=read_pragmas, args=(results,))
+    thread.start()
+    thread.join()
+
+    # synchronous FULL is 2, temp_store FILE is 1.
+    assert results == [("wal", 2, -1234, 1, 30000)] * 2
+
+
+def _locked_error(code: int) -> sqlite3.OperationalError:
+    error = sqlite3.OperationalError("database is locked")
+    error.sqlite_errorcode = code
+    return error
+
+
+def test_retry_on_busy_retries_locked_writes(monkeypatch):
+    monkeypatch.setattr(db_module, "RETRY_DELAY", 0)
+    calls = []
+
+    @retry_on_busy
+    def write():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _locked_error(sqlite3.SQLITE_BUSY)
+        return "done"
+
+    assert write() == "done"
+    assert len(calls) == 3
+
+
+def test_retry_on_busy_gives_up(monkeypatch):
+    monkeypatch.setattr(db_module, "RETRY_DELAY", 0)
+    calls = []
+
+    @retry_on_busy
+    def write():
+        calls.append(1)
+        raise _locked_error(sqlite3.SQLITE_LOCKED)
+
+    with pytest.raises(sqlite3.OperationalError):
+        write()
+    assert len(calls) == db_module.WRITE_ATTEMPTS
+
+
+def test_retry_on_busy_reraises_other_errors():
+    calls = []
+
+    @retry_on_busy
+    def write():
+        calls.append(1)
+        raise sqlite3.OperationalError("no such table: nope")
+
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        write()
+    assert len(calls) == 1
@@ -1,4 +1,6 @@
+import pytest
 from unittest.mock import MagicMock, patch
+from vocab_tester.async_db import AsyncDatabase
 from vocab_tester.quiz_screen import QuizScreen
 
 
@@ -22,16 +24,21 @@ class MockQuizScreen(QuizScreen):
         return self.app_mock
 
 
-def test_default_filter_applied_on_mount():
+@pytest.mark.asyncio
+async def test_default_filter_applied_on_mount():
     mock_db = MagicMock()
     mock_db.get_tags.return_value = ["spring26", "other"]
     # Mock next_question to avoid queue filling logic in this test
     with patch.object(QuizScreen, "next_question"):
         mock_config = MagicMock()
+        mock_config.scheduler = "random"
+        mock_config.session_size = 10
+        mock_config.leech_threshold = 0
+        mock_config.leech_mode = "allow"
         mock_config.default_filter = "spring26"
         with patch("vocab_tester.quiz_screen.CONFIG", mock_config):
-            screen = MockQuizScreen(mock_db)
-            screen.on_mount()
+            screen = MockQuizScreen(AsyncDatabase(mock_db))
+            await screen.on_mount()
 
             assert screen.current_tag_filter == "spring26"
             screen.query_one("#filter_label").update.assert_called_with(
@@ -39,15 +46,20 @@ def test_default_filter_applied_on_mount():
             )
 
 
-def test_default_filter_ignored_if_invalid():
+@pytest.mark.asyncio
+async def test_default_filter_ignored_if_invalid():
     mock_db = MagicMock()
     mock_db.get_tags.return_value = ["other"]
     with patch.object(QuizScreen, "next_question"):
         mock_config = MagicMock()
+        mock_config.scheduler = "random"
+        mock_config.session_size = 10
+        mock_config.leech_threshold = 0
+        mock_config.leech_mode = "allow"
         mock_config.default_filter = "spring26"
         with patch("vocab_tester.quiz_screen.CONFIG", mock_config):
-            screen = MockQuizScreen(mock_db)
-            screen.on_mount()
+            screen = MockQuizScreen(AsyncDatabase(mock_db))
+            await screen.on_mount()
 
             assert screen.current_tag_filter is None
             # Check that it wasn't called with the invalid filter
@@ -55,14 +67,19 @@ def test_default_filter_ignored_if_invalid():
                 assert "spring26" not in call[0][0]
 
 
-def test_no_default_filter():
+@pytest.mark.asyncio
+async def test_no_default_filter():
     mock_db = MagicMock()
     mock_db.get_tags.return_value = ["spring26", "other"]
     with patch.object(QuizScreen, "next_question"):
         mock_config = MagicMock()
+        mock_config.scheduler = "random"
+        mock_config.session_size = 10
+        mock_config.leech_threshold = 0
+        mock_config.leech_mode = "allow"
         mock_config.default_filter = None
         with patch("vocab_tester.quiz_screen.CONFIG", mock_config):
-            screen = MockQuizScreen(mock_db)
-            screen.on_mount()
+            screen = MockQuizScreen(AsyncDatabase(mock_db))
+            await screen.on_mount()
 
             assert screen.current_tag_filter is None
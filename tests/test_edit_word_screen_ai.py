@@ -3,6 +3,7 @@ import asyncio
 from unittest.mock import MagicMock
 from textual.app import App
 from vocab_tester.edit_word_screen import EditWordScreen
+from vocab_tester.async_db import AsyncDatabase
 from vocab_tester.models import Word
 from vocab_tester.ai_service import GeneratedWordData
 
@@ -25,7 +26,7 @@ class MockDatabase:
 
 class EditWordApp(App):
     def on_mount(self) -> None:
-        self.push_screen(EditWordScreen(MockDatabase(), 1))
+        self.push_screen(EditWordScreen(AsyncDatabase(MockDatabase()), 1))
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+
+import pytest
+from vocab_tester.cli import main
+from vocab_tester.db import Database
+from vocab_tester.exporter import export_table
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+def test_export_words_csv(temp_db):
+    out = io.StringIO()
+    written = export_table(temp_db, "words", out)
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert written == len(rows) > 0
+    assert rows[0]["kanji_word"] == "学校"
+    assert set(rows[0]) == {
+        "id",
+        "kanji_word",
+        "japanese_sentence",
+        "kana_word",
+        "english_word",
+        "english_sentence",
+        "tag",
+    }
+
+
+def test_export_words_tag_filter(temp_db):
+    out = io.StringIO()
+    export_table(temp_db, "words", out, fmt="jsonl", tag_filter="verb")
+
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert rows
+    assert {row["tag"] for row in rows} == {"verb"}
+
+
+def test_export_reviews_tsv(temp_db):
+    temp_db.record_result(1, False, kana_correct=True, meaning_correct=False)
+    temp_db.record_result(3, True, response_ms=1500)
+
+    out = io.StringIO()
+    export_table(temp_db, "reviews", out, fmt="tsv")
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue()), delimiter="\t"))
+    assert [row["word_id"] for row in rows] == ["1", "3"]
+    assert rows[0]["kana_correct"] == "1"
+    assert rows[0]["meaning_correct"] == "0"
+    assert rows[1]["response_ms"] == "1500"
+
+
+def test_export_last_tested_tag_filter(temp_db):
+    temp_db.record_result(1, True)  # noun
+    temp_db.record_result(3, False)  # verb
+
+    out = io.StringIO()
+    export_table(temp_db, "last_tested", out, fmt="jsonl", tag_filter="verb")
+
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(row["word_id"], row["last_correct"]) for row in rows] == [(3, 0)]
+
+
+def test_export_streams_in_batches(temp_db):
+    con = temp_db._connection()
+    statements: list[str] = []
+    con.set_trace_callback(statements.append)
+    export_table(temp_db, "words", io.StringIO(), batch_size=2)
+    con.set_trace_callback(None)
+
+    # One query, however many batches it is read in.
+    assert len([s for s in statements if s.startswith("SELECT")]) == 1
+
+
+def test_export_unknown_table(temp_db):
+    with pytest.raises(ValueError):
+        export_table(temp_db, "settings", io.StringIO())
+
+
+def test_cli_export_to_file(tmp_path, capsys):
+    db_path = tmp_path / "cli.db"
+    output = tmp_path / "words.jsonl"
+
+    assert main(["--db", str(db_path), "export", "-o", str(output)]) == 0
+
+    assert "Exported" in capsys.readouterr().out
+    first = json.loads(output.read_text(encoding="utf-8").splitlines()[0])
+    assert first["kanji_word"] == "学校"
+
+
+def test_cli_export_to_stdout(tmp_path, capsys):
+    db_path = tmp_path / "cli.db"
+
+    assert main(["--db", str(db_path), "export", "words", "--tag", "adjective"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("id,kanji_word")
+    assert len(lines) == 2
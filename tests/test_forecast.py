@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from vocab_tester.cli import main
+from vocab_tester.db import Database
+from vocab_tester.forecast import DEFAULT_RETENTION, DeckState, load_state, simulate
+from vocab_tester.models import Review
+from vocab_tester.sm2 import DAY_MS, INITIAL_EASE
+
+NOW = 1_700_000_000_000
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+def deck(due=(), stability=(), reps=(), new_words=0, retention=1.0) -> DeckState:
+    return DeckState(
+        due=np.array(due, dtype=np.float64),
+        stability=np.array(stability, dtype=np.float64),
+        ease=np.full(len(due), INITIAL_EASE),
+        reps=np.array(reps, dtype=np.int64),
+        new_words=new_words,
+        retention=retention,
+    )
+
+
+def test_load_state(temp_db):
+    temp_db.record_results(
+        [Review(1, NOW - 3 * DAY_MS, True, True), Review(2, NOW, False, True)]
+    )
+    # Answered before the review history was kept.
+    with temp_db.get_cursor(commit=True) as cur:
+        cur.execute(
+            "INSERT INTO last_tested (word_id, last_seen, last_correct)"
+            " VALUES (3, ?, 1)",
+            ((NOW - 5 * DAY_MS) // 1000,),
+        )
+
+    state = load_state(temp_db, now=NOW)
+    assert state.due.tolist() == [-2, 1, -4]
+    assert state.stability.tolist() == [1, 1, 1]
+    assert state.reps.tolist() == [1, 0, 1]
+    assert state.new_words == len(temp_db.get_new_word_ids(100)) - 1
+    assert state.retention == DEFAULT_RETENTION
+
+
+def test_intervals_follow_sm2():
+    forecast = simulate(deck(due=[0], stability=[1], reps=[0]), days=30)
+    # Intervals of 1 and 6 days, then 6 times the ease.
+    assert np.flatnonzero(forecast.reviews).tolist() == [0, 1, 7, 22]
+    assert not forecast.lapses.any()
+
+
+def test_forgotten_words_come_back_daily():
+    forecast = simulate(deck(due=[-3, 2], stability=[10, 10], reps=[3, 3], retention=0))
+    assert forecast.reviews[:4].tolist() == [1, 1, 2, 2]
+    assert forecast.lapses[:4].tolist() == [1, 1, 2, 2]
+
+
+def test_new_words_introduced_daily():
+    forecast = simulate(deck(new_words=5), days=5, new_per_day=2)
+    assert forecast.new.tolist() == [2, 2, 1, 0, 0]
+    assert forecast.reviews.tolist() == [0, 2, 2, 1, 0]
+    assert not simulate(deck(new_words=5), new_per_day=0).new.any()
+
+
+def test_seeded_forecasts_agree():
+    state = deck(due=range(-50, 50), stability=[3] * 100, reps=[2] * 100)
+    state = state._replace(retention=0.8)
+    first = simulate(state, seed=7)
+    assert all(np.array_equal(a, b) for a, b in zip(first, simulate(state, seed=7)))
+    assert 0 < first.lapses.sum() < first.reviews.sum()
+
+
+def test_cli_forecast(tmp_path, capsys):
+    db_path = tmp_path / "test_vocab.db"
+    Database(db_path=db_path).close()
+
+    assert main(["--db", str(db_path), "forecast", "--days", "7"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 9
+    assert lines[0].split() == ["Date", "Reviews", "New", "Lapses"]
+    assert lines[-1].startswith("Peak of")
+
+    argv = ["--db", str(db_path), "forecast", "--retention", "1.5"]
+    assert main(argv) == 1
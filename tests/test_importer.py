@@ -0,0 +1,169 @@
+import json
+
+import pytest
+from vocab_tester.cli import main
+from vocab_tester.db import Database
+from vocab_tester.importer import detect_format, import_file
+
+HEADER = "kanji_word,japanese_sentence,kana_word,english_word,english_sentence,tag"
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+def count_words(db: Database, tag: str) -> int:
+    with db.get_cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM words WHERE tag = ?", (tag,))
+        return cur.fetchone()[0]
+
+
+def write_csv(path, rows: int, tag: str = "import") -> None:
+    lines = [HEADER]
+    for i in range(rows):
+        lines.append(f"語{i},文{i},ご{i},word {i},sentence {i},{tag}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_detect_format(tmp_path):
+    assert detect_format(tmp_path / "deck.csv") == "csv"
+    assert detect_format(tmp_path / "deck.TSV") == "tsv"
+    assert detect_format(tmp_path / "deck.jsonl") == "jsonl"
+
+
+def test_import_csv_in_chunks(temp_db, tmp_path):
+    path = tmp_path / "deck.csv"
+    write_csv(path, 25)
+
+    reports = []
+    result = import_file(
+        temp_db, path, chunk_size=10, progress=lambda r: reports.append(r.inserted)
+    )
+
+    assert result.inserted == 25
+    assert result.rows == 25
+    assert reports == [10, 20, 25]
+    assert count_words(temp_db, "import") == 25
+
+
+def test_import_tsv_with_default_tag(temp_db, tmp_path):
+    path = tmp_path / "deck.tsv"
+    path.write_text(
+        "kanji_word\tjapanese_sentence\tkana_word\tenglish_word\tenglish_sentence\n"
+        "犬\t犬がいる。\tいぬ\tdog\tThere is a dog.\n",
+        encoding="utf-8",
+    )
+
+    result = import_file(temp_db, path, default_tag="animals")
+
+    assert result.inserted == 1
+    assert count_words(temp_db, "animals") == 1
+
+
+def test_import_jsonl(temp_db, tmp_path):
+    path = tmp_path / "deck.jsonl"
+    row = {
+        "kanji_word": "鳥",
+        "japanese_sentence": "鳥が飛ぶ。",
+        "kana_word": "とり",
+        "english_word": "bird",
+        "english_sentence": "Birds fly.",
+        "tag": "jsonl",
+    }
+    path.write_text(json.dumps(row, ensure_ascii=False) + "\n\n", encoding="utf-8")
+
+    assert import_file(temp_db, path).inserted == 1
+    assert count_words(temp_db, "jsonl") == 1
+
+
+def test_invalid_rows_are_skipped(temp_db, tmp_path):
+    path = tmp_path / "deck.csv"
+    path.write_text(
+        f"{HEADER}\n語,文,ご,word,sentence,import\n,文,ご,word,sentence,import\n",
+        encoding="utf-8",
+    )
+
+    result = import_file(temp_db, path)
+
+    assert result.inserted == 1
+    assert result.skipped == 1
+    assert result.errors[0].startswith("row 2: kanji_word")
+
+
+def test_malformed_jsonl_lines_are_skipped(temp_db, tmp_path):
+    path = tmp_path / "deck.jsonl"
+    row = {
+        "kanji_word": "鳥",
+        "japanese_sentence": "鳥が飛ぶ。",
+        "kana_word": "とり",
+        "english_word": "bird",
+        "english_sentence": "Birds fly.",
+        "tag": "jsonl",
+    }
+    line = json.dumps(row, ensure_ascii=False)
+    path.write_text(f"{line}\n{{not json\n[1,2]\n{line}\n", encoding="utf-8")
+
+    result = import_file(temp_db, path)
+
+    assert result.inserted == 2
+    assert result.skipped == 2
+    assert result.errors[0].startswith("row 2: invalid JSON")
+    assert result.errors[1] == "row 3: not a JSON object"
+
+
+def test_interrupted_import_resumes(temp_db, tmp_path):
+    path = tmp_path / "deck.csv"
+    write_csv(path, 30)
+
+    def crash(result):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        import_file(temp_db, path, chunk_size=10, progress=crash)
+    assert count_words(temp_db, "import") == 10
+
+    result = import_file(temp_db, path, chunk_size=10)
+
+    assert result.resumed_from == 10
+    assert result.inserted == 20
+    assert count_words(temp_db, "import") == 30
+
+    # A finished import leaves no checkpoint behind.
+    with temp_db.get_cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM import_checkpoints")
+        assert cur.fetchone()[0] == 0
+
+
+def test_restart_ignores_checkpoint(temp_db, tmp_path):
+    path = tmp_path / "deck.csv"
+    write_csv(path, 20)
+
+    def crash(result):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        import_file(temp_db, path, chunk_size=10, progress=crash)
+
+    result = import_file(temp_db, path, chunk_size=10, restart=True)
+
+    assert result.resumed_from == 0
+    assert count_words(temp_db, "import") == 30
+
+
+def test_cli_import(tmp_path, capsys):
+    path = tmp_path / "deck.csv"
+    write_csv(path, 5, tag="cli")
+    db_path = tmp_path / "cli.db"
+
+    assert main(["--db", str(db_path), "import", str(path)]) == 0
+
+    assert "Imported 5 of 5 rows" in capsys.readouterr().out
+    assert count_words(Database(db_path), "cli") == 5
+
+
+def test_cli_import_missing_file(tmp_path, capsys):
+    missing = tmp_path / "missing.csv"
+    assert main(["--db", str(tmp_path / "cli.db"), "import", str(missing)]) == 1
+    assert "File not found" in capsys.readouterr().err
@@ -0,0 +1,177 @@
+import pytest
+from vocab_tester.cli import main
+from vocab_tester.db import Database
+from vocab_tester.leeches import FailureCounts
+from vocab_tester.migrations import SCHEMA_VERSION, get_version
+from vocab_tester.models import Review
+from vocab_tester.quiz_session import QuizSession
+
+NOW = 1_700_000_000_000
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+class FixedScheduler:
+    """Always picks the same words, in order."""
+
+    def __init__(self, word_ids: list[int]) -> None:
+        self.word_ids = word_ids
+
+    def pick(self, db, limit, tag_filter, exclude_ids):
+        return [i for i in self.word_ids if i not in exclude_ids][:limit]
+
+
+def fail(db: Database, word_id: int, times: int) -> None:
+    db.record_results([Review(word_id, NOW + i, False, True) for i in range(times)])
+
+
+def test_counters_follow_reviews(temp_db):
+    temp_db.record_results(
+        [
+            Review(1, NOW, False, False),
+            Review(1, NOW + 1, True, False),
+            Review(1, NOW + 2, True, True),
+            Review(1, NOW + 3, False, True),
+            Review(2, NOW, True, True),
+        ]
+    )
+    assert temp_db.get_failure_counts([1, 2, 3]) == {
+        1: FailureCounts(3, 1),
+        2: FailureCounts(0, 0),
+    }
+
+    # A late review from a replayed journal counts, but can't reset the run.
+    temp_db.record_results([Review(1, NOW - 1, True, True)])
+    temp_db.record_results([Review(1, NOW - 2, False, False)])
+    assert temp_db.get_failure_counts([1]) == {1: FailureCounts(4, 1)}
+
+
+def test_counters_backfilled_from_history(tmp_path):
+    path = tmp_path / "history.db"
+    db = Database(db_path=path)
+    fail(db, 1, 3)
+    db.record_results([Review(1, NOW + 10, True, True), Review(2, NOW, False, False)])
+    expected = db.get_failure_counts([1, 2])
+    with db.get_cursor(commit=True) as cur:
+        cur.execute("DROP TRIGGER reviews_failure_counts")
+        cur.execute("DROP TABLE failure_counts")
+        cur.execute("PRAGMA user_version = 8")
+    db.close()
+
+    db = Database(db_path=path)
+    assert get_version(db._connection()) == SCHEMA_VERSION
+    assert (
+        db.get_failure_counts([1, 2])
+        == expected
+        == {
+            1: FailureCounts(3, 0),
+            2: FailureCounts(1, 1),
+        }
+    )
+
+
+def test_get_leeches_most_failed_first(temp_db):
+    fail(temp_db, 4, 3)
+    fail(temp_db, 2, 5)
+    fail(temp_db, 7, 1)
+
+    leeches = temp_db.get_leeches(3)
+    assert [(word.id, counts) for word, counts in leeches] == [
+        (2, FailureCounts(5, 5)),
+        (4, FailureCounts(3, 3)),
+    ]
+
+
+def test_isolated_leeches_are_left_out(temp_db):
+    fail(temp_db, 2, 3)
+    session = QuizSession(
+        temp_db,
+        scheduler=FixedScheduler([1, 2, 3, 4]),
+        queue_size=4,
+        leech_threshold=3,
+        leech_mode="isolate",
+    )
+    session.next_question()
+    assert session.is_leech(2)
+    assert list(session.queue) == [3, 4]
+
+
+def test_capped_leeches_requeued_once(temp_db):
+    for word_id in (2, 3, 5):
+        fail(temp_db, word_id, 3)
+    session = QuizSession(
+        temp_db,
+        scheduler=FixedScheduler([2, 3, 5, 1, 4, 6, 7, 8, 9, 10]),
+        queue_size=10,
+        leech_threshold=3,
+        leech_mode="cap",
+    )
+    # Only queue_size // 5 leeches per refill.
+    assert session.next_question().id == 2
+    assert 3 in session.queue
+    assert 5 not in session.queue
+
+    session.record_result(False)
+    assert session.queue.count(2) == 1
+    assert session.queue[5] == 2
+
+
+def test_leech_cap_counts_queued_leeches(temp_db):
+    for word_id in (2, 3, 5):
+        fail(temp_db, word_id, 3)
+    session = QuizSession(
+        temp_db,
+        scheduler=FixedScheduler([2, 3, 1, 5, 4, 6, 7, 8, 9, 10]),
+        queue_size=10,
+        leech_threshold=3,
+        leech_mode="cap",
+    )
+    session.queue = [2, 3, 1]
+
+    # The refill picks 5, but two leeches are queued already.
+    session.next_question()
+    assert 5 not in session.queue
+    assert 4 in session.queue
+
+
+def test_counters_update_without_queries(temp_db, monkeypatch):
+    fail(temp_db, 1, 2)
+    session = QuizSession(
+        temp_db,
+        scheduler=FixedScheduler([1, 2, 3, 4]),
+        queue_size=4,
+        leech_threshold=3,
+    )
+    session.next_question()
+    assert not session.is_leech(1)
+
+    def no_queries(*args, **kwargs):
+        raise AssertionError("counters were queried")
+
+    monkeypatch.setattr(temp_db, "get_failure_counts", no_queries)
+    session.record_result(False)
+    assert session.is_leech(1)
+    # With leeches allowed, the usual two practice slots.
+    assert session.queue.count(1) == 2
+    assert temp_db.get_leeches(3)[0][1] == session.failures[1] == FailureCounts(3, 3)
+
+
+def test_unknown_leech_mode_rejected(temp_db):
+    with pytest.raises(ValueError):
+        QuizSession(temp_db, leech_mode="hide")
+
+
+def test_cli_leeches(tmp_path, capsys):
+    db_path = tmp_path / "test_vocab.db"
+    db = Database(db_path=db_path)
+    fail(db, 3, 4)
+    db.close()
+
+    assert main(["--db", str(db_path), "leeches", "--threshold", "4"]) == 0
+    out = capsys.readouterr().out
+    assert "failed 4 times, 4 in a row" in out
+    assert "1 leeches failed at least 4 times" in out
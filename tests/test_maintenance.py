@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+from textual import events
+from textual.widgets import Input
+from vocab_tester.app import VocabTesterApp
+from vocab_tester.cli import main
+from vocab_tester.config import CONFIG
+from vocab_tester.db import Database
+from vocab_tester.maintenance import maintain, quick_check
+from vocab_tester.migrations import AUTO_VACUUM_INCREMENTAL
+from vocab_tester.models import Word
+
+
+def _word(i: int) -> Word:
+    return Word(
+        kanji_word=f"字{i}",
+        kana_word="じ",
+        english_word=f"character {i}",
+        japanese_sentence="字を書きます。" * 10,
+        english_sentence="I write a character. " * 10,
+        tag="bulk",
+    )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "maintain.db"
+    db = Database(db_path=path)
+    db.add_words(_word(i) for i in range(2000))
+    with db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words WHERE tag = 'bulk'")
+    db.close()
+    return path
+
+
+def test_new_database_uses_incremental_vacuum(tmp_path):
+    db = Database(db_path=tmp_path / "new.db")
+    with db.get_cursor() as cur:
+        cur.execute("PRAGMA auto_vacuum")
+        assert cur.fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+
+
+def test_maintain_reclaims_pages_and_analyzes(db_path):
+    db = Database(db_path=db_path)
+    report = maintain(db)
+
+    assert report.pages_reclaimed > 0
+    assert report.bytes_reclaimed == report.pages_reclaimed * report.page_size
+    assert report.problems == []
+    with db.get_cursor() as cur:
+        cur.execute("PRAGMA freelist_count")
+        assert cur.fetchone()[0] == 0
+        cur.execute("SELECT COUNT(*) FROM sqlite_stat1")
+        assert cur.fetchone()[0] > 0
+    db.close()
+    assert db_path.stat().st_size == report.pages_after * report.page_size
+
+
+def test_quick_check_passes_on_healthy_database(tmp_path):
+    assert quick_check(Database(db_path=tmp_path / "check.db")) == []
+
+
+@pytest.mark.asyncio
+async def test_app_maintains_once_per_idle_spell(db_path, monkeypatch):
+    monkeypatch.setattr(CONFIG, "idle_maintenance_minutes", 5)
+    app = VocabTesterApp(Database(db_path=db_path))
+
+    await app.maintain_if_idle()
+    assert not app.maintained_while_idle
+
+    app.last_input_time -= 5 * 60
+    await app.maintain_if_idle()
+    assert app.maintained_while_idle
+    with app.db.get_cursor() as cur:
+        cur.execute("PRAGMA freelist_count")
+        assert cur.fetchone()[0] == 0
+    app.async_db.close()
+
+
+@pytest.mark.asyncio
+async def test_typing_an_answer_counts_as_activity(tmp_path):
+    app = VocabTesterApp(Database(db_path=tmp_path / "active.db"))
+    async with app.run_test() as pilot:
+        answer = app.query_one("#answer_input", Input)
+        for _ in range(100):
+            if not answer.disabled:
+                break
+            await asyncio.sleep(0.01)
+        answer.focus()
+
+        app.last_input_time -= 5 * 60
+        app.maintained_while_idle = True
+        await pilot.press("x", "y", "z")
+        assert answer.value == "xyz"
+        assert not app.maintained_while_idle
+
+        # Pilot's clicks skip App.on_event, so post a click as the driver does.
+        app.last_input_time -= 5 * 60
+        app.post_message(events.MouseDown(None, 1, 1, 0, 0, 1, False, False, False))
+        await pilot.pause()
+        assert app.last_input_time > time.monotonic() - 60
+
+
+def test_maintain_command(db_path, capsys):
+    assert main(["--db", str(db_path), "maintain"]) == 0
+
+    out = capsys.readouterr().out
+    assert "Reclaimed" in out
+    assert "Integrity check passed" in out
+    with sqlite3.connect(db_path) as con:
+        assert con.execute("PRAGMA freelist_count").fetchone()[0] == 0
@@ -0,0 +1,174 @@
+import sqlite3
+
+import pytest
+from vocab_tester.db import SCHEMA_PATH, Database
+from vocab_tester.migrations import AUTO_VACUUM_INCREMENTAL, SCHEMA_VERSION, get_version
+from vocab_tester.models import Word
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+@pytest.fixture
+def legacy_db_path(tmp_path):
+    """A database as created before migrations existed."""
+    db_file = tmp_path / "legacy_vocab.db"
+    con = sqlite3.connect(db_file)
+    con.executescript(SCHEMA_PATH.read_text())
+    con.execute(
+        "INSERT INTO words (kanji_word, japanese_sentence, kana_word, english_word, english_sentence, tag) VALUES ('猫', 's', 'ねこ', 'cat', 's', 'noun')"
+    )
+    # Duplicate rows for the same word, which the old code could produce.
+    con.execute(
+        "INSERT INTO last_tested (word_id, last_seen, last_correct) VALUES (1, 100, 1)"
+    )
+    con.execute(
+        "INSERT INTO last_tested (word_id, last_seen, last_correct) VALUES (1, 200, 0)"
+    )
+    con.commit()
+    con.close()
+    return db_file
+
+
+def index_names(db: Database) -> set[str]:
+    with db.get_cursor() as cur:
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        return {row[0] for row in cur.fetchall()}
+
+
+def query_plans(db: Database, action) -> list[str]:
+    """Runs `action` and returns the query plan of every SELECT it issued."""
+    con = db._connection()
+    statements: list[str] = []
+    con.set_trace_callback(statements.append)
+    try:
+        action()
+    finally:
+        con.set_trace_callback(None)
+
+    plans = []
+    for statement in statements:
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            rows = con.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+            plans.append("\n".join(row[3] for row in rows))
+    return plans
+
+
+def assert_no_table_scan(plans: list[str]) -> None:
+    for plan in plans:
+        for line in plan.splitlines():
+            if line.startswith("SCAN"):
+                assert (
+                    "USING" in line or "VIRTUAL TABLE" in line or "CONSTANT" in line
+                ), plan
+
+
+def test_new_database_is_at_latest_version(temp_db):
+    assert get_version(temp_db._connection()) == SCHEMA_VERSION
+    assert {
+        "idx_last_tested_word_id",
+        "idx_last_tested_incorrect",
+        "idx_word_tags_word",
+    } <= index_names(temp_db)
+
+
+def test_legacy_database_upgraded_in_place(legacy_db_path):
+    db = Database(db_path=legacy_db_path)
+
+    assert get_version(db._connection()) == SCHEMA_VERSION
+    with db.get_cursor() as cur:
+        cur.execute("SELECT last_seen, last_correct FROM last_tested")
+        rows = [tuple(row) for row in cur.fetchall()]
+    # Only the newest duplicate survives.
+    assert rows == [(200, 0)]
+
+    # Existing words are kept and not reseeded.
+    with db.get_cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM words")
+        assert cur.fetchone()[0] == 1
+
+    # Converted to incremental auto-vacuum outside of a transaction.
+    with db.get_cursor() as cur:
+        cur.execute("PRAGMA auto_vacuum")
+        assert cur.fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+
+
+def test_migrations_are_idempotent(legacy_db_path):
+    Database(db_path=legacy_db_path).close()
+    db = Database(db_path=legacy_db_path)
+    assert get_version(db._connection()) == SCHEMA_VERSION
+
+
+def test_last_tested_word_id_is_unique(temp_db):
+    temp_db.record_result(1, True)
+    with pytest.raises(sqlite3.IntegrityError):
+        with temp_db.get_cursor(commit=True) as cur:
+            cur.execute(
+                "INSERT INTO last_tested (word_id, last_seen, last_correct) VALUES (1, 0, 0)"
+            )
+
+
+def test_record_result_upserts_single_row(temp_db):
+    for correct in (True, False, True):
+        temp_db.record_result(1, correct)
+
+    with temp_db.get_cursor() as cur:
+        cur.execute("SELECT COUNT(*), last_correct FROM last_tested WHERE word_id = 1")
+        count, last_correct = cur.fetchone()
+    assert count == 1
+    assert last_correct == 1
+
+
+def test_filtered_sampling_uses_tag_index(temp_db):
+    temp_db.add_words(
+        Word(
+            kanji_word=f"v{i}",
+            kana_word=f"v{i}",
+            english_word=f"v{i}",
+            japanese_sentence=f"v{i}",
+            english_sentence=f"v{i}",
+            tag="verb",
+        )
+        for i in range(200)
+    )
+    plans = query_plans(
+        temp_db, lambda: temp_db.get_random_word_ids(5, tag_filter="verb")
+    )
+    assert plans
+    assert_no_table_scan(plans)
+    assert any("USING PRIMARY KEY (tag_id=?)" in plan for plan in plans)
+    assert any(
+        "USING COVERING INDEX idx_word_tags_word (word_id=? AND tag_id=?)" in plan
+        for plan in plans
+    )
+
+
+def test_unfiltered_sampling_uses_rowid(temp_db):
+    plans = query_plans(temp_db, lambda: temp_db.get_random_word_ids(5))
+    assert_no_table_scan(plans)
+    assert any("INTEGER PRIMARY KEY (rowid=?)" in plan for plan in plans)
+
+
+def test_incorrect_words_use_partial_index(temp_db):
+    temp_db.record_result(1, False)
+    for tag_filter in (None, "noun"):
+        plans = query_plans(
+            temp_db,
+            lambda: temp_db.get_incorrect_word_ids(5, tag_filter=tag_filter),
+        )
+        assert_no_table_scan(plans)
+        assert any("idx_last_tested_incorrect" in plan for plan in plans)
+
+
+def test_get_tags_does_not_read_words(temp_db):
+    plans = query_plans(temp_db, temp_db.get_tags)
+    assert plans
+    assert not any("words" in plan for plan in plans)
+
+
+def test_get_word_uses_primary_key(temp_db):
+    plans = query_plans(temp_db, lambda: temp_db.get_word(1))
+    assert plans == ["SEARCH words USING INTEGER PRIMARY KEY (rowid=?)"]
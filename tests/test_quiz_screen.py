@@ -1,7 +1,9 @@
 import pytest
 from unittest.mock import MagicMock
 from vocab_tester.quiz_screen import is_answer_correct, QuizScreen
-from vocab_tester.models import Word
+from vocab_tester.async_db import AsyncDatabase
+from vocab_tester.models import TagFilter, Word
+from vocab_tester.session_snapshot import SessionSnapshot
 
 
 # Mock Database
@@ -12,6 +14,9 @@ class MockDatabase:
     def get_random_word(self, tag_filter=None):
         return self._create_word()
 
+    def get_words(self, word_ids):
+        return [self.get_word(word_id) for word_id in word_ids]
+
     def get_incorrect_word_ids(self, limit, tag_filter=None, exclude_ids=None):
         return []
 
@@ -27,6 +32,17 @@ class MockDatabase:
             i += 1
         return res
 
+    def build_queue(self, size, tag_filter=None, exclude_ids=None, incorrect_ratio=1.0):
+        ids = self.get_incorrect_word_ids(size, tag_filter, exclude_ids)
+        return ids + self.get_random_word_ids(
+            size - len(ids),
+            tag_filter=tag_filter,
+            exclude_ids=set(exclude_ids or ()) | set(ids),
+        )
+
+    def get_failure_counts(self, word_ids):
+        return {}
+
     def _create_word(self, idx=0):
         # Use simple ID to avoid exclusion issues if needed, or just unique
         return Word(
@@ -39,7 +55,7 @@ class MockDatabase:
             tag="Tag",
         )
 
-    def record_result(self, word_id, correct):
+    def record_result(self, word_id, correct, **details):
         pass
 
 
@@ -66,21 +82,23 @@ class MockQuizScreen(QuizScreen):
 @pytest.fixture
 def screen():
     db = MockDatabase()
-    return MockQuizScreen(db)
+    return MockQuizScreen(AsyncDatabase(db))
 
 
-def test_queue_initialization(screen):
+@pytest.mark.asyncio
+async def test_queue_initialization(screen):
     """Test that queue is populated on mount/next_question."""
-    screen.next_question()
+    await screen.next_question()
     # Logic: fills to 10, pops 1 -> 9 left
     assert len(screen.queue) == 9
     assert isinstance(screen.question_data, Word)
     assert screen.question_data.kanji_word == "Kanji"
 
 
-def test_incorrect_answer_requeues(screen):
+@pytest.mark.asyncio
+async def test_incorrect_answer_requeues(screen):
     """Test that incorrect answers are re-inserted into the queue."""
-    screen.next_question()
+    await screen.next_question()
     initial_word = screen.question_data
 
     # Input incorrect answers
@@ -91,7 +109,7 @@ def test_incorrect_answer_requeues(screen):
     assert len(screen.queue) == 9
 
     # Trigger results
-    screen.show_results()
+    await screen.show_results()
 
     # Queue should now have the word inserted at 2 and 5
     # Size 9 + 2 = 11
@@ -101,14 +119,15 @@ def test_incorrect_answer_requeues(screen):
     assert screen.queue[5] == initial_word.id
 
 
-def test_correct_answer_does_not_requeue(screen):
+@pytest.mark.asyncio
+async def test_correct_answer_does_not_requeue(screen):
     """Test that correct answers are NOT re-inserted."""
-    screen.next_question()
+    await screen.next_question()
 
     screen.kana_answer = "Kana"
     screen.meaning_answer = "Meaning"  # Case insensitive check in code
 
-    screen.show_results()
+    await screen.show_results()
 
     # Queue size should remain 9 (or technically, it might not change,
     # but specifically it shouldn't grow by 2)
@@ -118,9 +137,10 @@ def test_correct_answer_does_not_requeue(screen):
     assert len(screen.queue) == 9
 
 
-def test_filter_tag_updates_queue(screen):
+@pytest.mark.asyncio
+async def test_filter_tag_updates_queue(screen):
     """Test that applying a filter clears queue and requests filtered words."""
-    screen.on_filter_selected("SomeTag")
+    await screen.on_filter_selected("SomeTag")
 
     assert screen.current_tag_filter == "SomeTag"
     # Queue should be cleared and refilled.
@@ -129,45 +149,49 @@ def test_filter_tag_updates_queue(screen):
     screen.query_one("#filter_label").update.assert_called_with("Filter: SomeTag")
 
 
-def test_filter_clear(screen):
+@pytest.mark.asyncio
+async def test_filter_clear(screen):
     screen.current_tag_filter = "OldTag"
-    screen.on_filter_selected("")  # Clear
+    await screen.on_filter_selected("")  # Clear
 
     assert screen.current_tag_filter is None
     screen.query_one("#filter_label").update.assert_called_with("Filter: All")
 
 
-def test_copy_button_press(screen):
-    screen.next_question()
+@pytest.mark.asyncio
+async def test_copy_button_press(screen):
+    await screen.next_question()
     # Mock event
     event = MagicMock()
     event.button.id = "copy_btn"
 
-    screen.on_button_pressed(event)
+    await screen.on_button_pressed(event)
 
     screen.app.copy_to_clipboard.assert_called_with("Sentence")
 
 
-def test_multiple_meanings_second_correct(screen):
-    screen.next_question()
+@pytest.mark.asyncio
+async def test_multiple_meanings_second_correct(screen):
+    await screen.next_question()
 
     # Case: Second meaning
     screen.kana_answer = "Kana"
     screen.meaning_answer = "Meaning 2"
-    screen.show_results()
+    await screen.show_results()
 
     screen.query_one("#result_message").update.assert_called_with(
         "[green bold]Correct![/]"
     )
 
 
-def test_multiple_meanings_incorrect(screen):
-    screen.next_question()
+@pytest.mark.asyncio
+async def test_multiple_meanings_incorrect(screen):
+    await screen.next_question()
 
     # Case: Incorrect meaning
     screen.kana_answer = "Kana"
     screen.meaning_answer = "Meaning 3"  # Not in "Meaning; Meaning 2"
-    screen.show_results()
+    await screen.show_results()
 
     # Should contain "Incorrect"
     args, _ = screen.query_one("#result_message").update.call_args
@@ -199,44 +223,47 @@ def test_is_answer_correct():
     assert is_answer_correct("to stay", "to go; to leave") is False
 
 
-def test_test_again_button_visibility_on_incorrect_answer(screen):
+@pytest.mark.asyncio
+async def test_test_again_button_visibility_on_incorrect_answer(screen):
     """Test that the 'Test Again' button becomes visible when an answer is incorrect."""
-    screen.next_question()
+    await screen.next_question()
 
     # Incorrect answer
     screen.kana_answer = "Wrong"
     screen.meaning_answer = "Wrong"
-    screen.show_results()
+    await screen.show_results()
 
     # #test_again_btn should have remove_class("hidden") called on it
     btn = screen.query_one("#test_again_btn")
     btn.remove_class.assert_called_with("hidden")
 
 
-def test_test_again_button_visibility_on_correct_answer(screen):
+@pytest.mark.asyncio
+async def test_test_again_button_visibility_on_correct_answer(screen):
     """Test that the 'Test Again' button is hidden when an answer is correct."""
-    screen.next_question()
+    await screen.next_question()
 
     # Correct answer
     screen.kana_answer = "Kana"
     screen.meaning_answer = "Meaning"
-    screen.show_results()
+    await screen.show_results()
 
     # #test_again_btn should have add_class("hidden") called on it
     btn = screen.query_one("#test_again_btn")
     btn.add_class.assert_called_with("hidden")
 
 
-def test_test_again_action_requeues_and_resets(screen):
+@pytest.mark.asyncio
+async def test_test_again_action_requeues_and_resets(screen):
     """Test that triggering test_again inserts the word ID at index 0 and sets up next question."""
-    screen.next_question()
+    await screen.next_question()
     current_id = screen.question_data.id
 
     # Set queue to some arbitrary list to track it
     screen.queue = [100, 101, 102]
 
     # Call test_again
-    screen.test_again()
+    await screen.test_again()
 
     # In test_again(), current_id is inserted at 0, making the queue [current_id, 100, 101, 102]
     # Then next_question() is called, which pops index 0, so the new question_data should be current_id,
@@ -250,14 +277,15 @@ def test_test_again_action_requeues_and_resets(screen):
     btn.add_class.assert_called_with("hidden")
 
 
-def test_test_again_after_edit_word(screen):
+@pytest.mark.asyncio
+async def test_test_again_after_edit_word(screen):
     """Test that editing a word updates the 'Test Again' button visibility."""
-    screen.next_question()
+    await screen.next_question()
 
     # Initial incorrect answer
     screen.kana_answer = "Wrong"
     screen.meaning_answer = "Wrong"
-    screen.show_results()
+    await screen.show_results()
 
     # Should be visible
     btn = screen.query_one("#test_again_btn")
@@ -277,10 +305,51 @@ def test_test_again_after_edit_word(screen):
         english_sentence="EngSentence",
         tag="Tag",
     )
-    screen.db.get_word = MagicMock(return_value=updated_word)
+    screen.db.db.get_word = MagicMock(return_value=updated_word)
 
     # Call edit done with changed=True
-    screen.on_edit_word_done(True)
+    await screen.on_edit_word_done(True)
 
     # Should now be hidden
     btn.add_class.assert_called_with("hidden")
+
+
+@pytest.mark.asyncio
+async def test_resume_mid_question(screen):
+    """A session saved between the two answers picks up at the meaning."""
+    db = MockDatabase()
+    screen.resume_from = SessionSnapshot(
+        queue=[4, 5],
+        words=db.get_words([3, 4, 5]),
+        current_word_id=3,
+        tag_filter=TagFilter.of("Tag"),
+        seen=[1, 2],
+        step="meaning",
+        kana_answer="Kana",
+    )
+    await screen.on_mount()
+
+    assert screen.question_data.id == 3
+    assert screen.step == "meaning"
+    assert screen.kana_answer == "Kana"
+    assert screen.queue == [4, 5]
+    snapshot = screen.snapshot()
+    assert snapshot._replace(words=[]) == screen.resume_from._replace(words=[])
+    assert sorted(word.id for word in snapshot.words) == [3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_resume_after_answer_moves_on(screen):
+    db = MockDatabase()
+    screen.resume_from = SessionSnapshot(
+        queue=[4, 5],
+        words=db.get_words([3, 4, 5]),
+        current_word_id=3,
+        tag_filter=None,
+        seen=[3],
+        step="result",
+    )
+    await screen.on_mount()
+
+    assert screen.question_data.id == 4
+    assert screen.step == "kana"
@@ -16,13 +16,24 @@ class MockDatabase:
             tag="Tag",
         )
 
+    def get_words(self, word_ids):
+        return [self.get_word(word_id) for word_id in word_ids]
+
     def get_incorrect_word_ids(self, limit, tag_filter=None, exclude_ids=None):
         return [2, 3]
 
     def get_random_word_ids(self, limit, tag_filter=None, exclude_ids=None):
         return [4, 5, 6]
 
-    def record_result(self, word_id, correct):
+    def build_queue(self, size, tag_filter=None, exclude_ids=None, incorrect_ratio=1.0):
+        ids = self.get_incorrect_word_ids(size, tag_filter, exclude_ids)
+        return ids + self.get_random_word_ids(
+            size - len(ids),
+            tag_filter=tag_filter,
+            exclude_ids=set(exclude_ids or ()) | set(ids),
+        )
+
+    def record_result(self, word_id, correct, **details):
         pass
 
 
@@ -53,7 +64,7 @@ def test_quiz_session_record_result_correct():
     session.next_question()  # sets current_word to id 2
 
     session.record_result(True)
-    db.record_result.assert_called_with(2, True)
+    assert db.record_result.call_args.args == (2, True)
 
 
 def test_quiz_session_record_result_incorrect():
@@ -64,7 +75,7 @@ def test_quiz_session_record_result_incorrect():
 
     # For incorrect answers, it should re-queue the current word id 2 at indices 2 and 5
     session.record_result(False)
-    db.record_result.assert_called_with(2, False)
+    assert db.record_result.call_args.args == (2, False)
     assert session.queue[2] == 2
     assert session.queue[5] == 2
 
@@ -77,3 +88,173 @@ def test_quiz_session_test_again():
     session.test_again()
     # Next question after test_again should be id 2 because it was prepended to the queue
     assert session.current_word.id == 2
+
+
+def test_quiz_session_record_result_details():
+    db = MockDatabase()
+    db.record_result = MagicMock()
+    session = QuizSession(db)
+    session.next_question()
+
+    session.record_result(
+        False, kana_correct=True, meaning_correct=False, response_ms=1200
+    )
+    db.record_result.assert_called_with(
+        2, False, kana_correct=True, meaning_correct=False, response_ms=1200
+    )
+
+
+class CountingDatabase(MockDatabase):
+    def __init__(self):
+        self.calls = []
+
+    def get_word(self, word_id):
+        self.calls.append("get_word")
+        return super().get_word(word_id)
+
+    def get_words(self, word_ids):
+        self.calls.append("get_words")
+        return [MockDatabase.get_word(self, word_id) for word_id in word_ids]
+
+    def get_incorrect_word_ids(self, limit, tag_filter=None, exclude_ids=None):
+        self.calls.append("get_incorrect_word_ids")
+        return []
+
+    def get_random_word_ids(self, limit, tag_filter=None, exclude_ids=None):
+        self.calls.append("get_random_word_ids")
+        start = max(exclude_ids or [0]) + 1
+        return list(range(start, start + limit))
+
+
+def test_quiz_session_prefetches_queue_in_one_batch():
+    db = CountingDatabase()
+    session = QuizSession(db)
+
+    session.next_question()
+    assert db.calls.count("get_words") == 1
+    assert set(session.prefetched) == set(session.queue)
+
+    # Advancing until the queue runs low needs no database access at all.
+    db.calls.clear()
+    for _ in range(len(session.queue) - session.refill_below + 1):
+        assert session.next_question() is not None
+    assert db.calls == []
+
+
+def test_quiz_session_requeue_ignores_copy_at_front():
+    db = CountingDatabase()
+    session = QuizSession(db)
+    word = session.next_question()
+    session.queue = [word.id, 50, 51, 52, 53, 54, word.id]
+
+    session.record_result(False)
+    assert session.queue.count(word.id) == 4
+
+    session.record_result(False)
+    assert session.queue.count(word.id) == 4
+
+
+def test_quiz_session_requeued_word_needs_no_io():
+    db = CountingDatabase()
+    session = QuizSession(db)
+    word = session.next_question()
+
+    db.calls.clear()
+    session.record_result(False)
+    session.next_question()
+    session.next_question()
+    assert session.next_question() is word
+    assert db.calls == []
+
+
+def test_quiz_session_skips_deleted_words():
+    db = CountingDatabase()
+    session = QuizSession(db)
+    session.queue = [100, 101]
+    db.get_words = lambda word_ids: [
+        MockDatabase.get_word(db, word_id) for word_id in word_ids if word_id != 100
+    ]
+
+    assert session.next_question().id == 101
+
+
+def test_quiz_session_reload_word_updates_prefetched_copy():
+    db = MockDatabase()
+    session = QuizSession(db)
+    word = session.next_question()
+    session.record_result(False)
+
+    edited = word.model_copy(update={"kanji_word": "Edited"})
+    session.reload_word(edited)
+
+    assert session.current_word is edited
+    assert session.prefetched[word.id] is edited
+
+
+def test_quiz_session_exclude_seen():
+    db = CountingDatabase()
+    db.get_random_word_ids = MagicMock(return_value=[2])
+    session = QuizSession(db, exclude_seen=True)
+    session.queue = [1]
+    session.next_question()
+    session.record_result(True)
+
+    session.next_question()
+    exclude_ids = db.get_random_word_ids.call_args.kwargs["exclude_ids"]
+    assert 1 in exclude_ids
+
+
+def test_quiz_session_exclude_seen_starts_over_when_exhausted():
+    db = CountingDatabase()
+    deck = {1, 2}
+    db.get_random_word_ids = lambda limit, tag_filter=None, exclude_ids=None: sorted(
+        deck - set(exclude_ids or ())
+    )[:limit]
+    session = QuizSession(db, exclude_seen=True)
+
+    answered = []
+    for _ in range(3):
+        answered.append(session.next_question().id)
+        session.record_result(True)
+        session.queue.clear()
+
+    assert answered[:2] == [1, 2]
+    assert answered[2] in deck
+    assert session.seen == {answered[2]}
+
+
+def test_quiz_session_filter_change_forgets_seen():
+    db = CountingDatabase()
+    db.get_random_word_ids = MagicMock(return_value=[2])
+    session = QuizSession(db, exclude_seen=True)
+    session.queue = [1]
+    session.next_question()
+    session.record_result(True)
+
+    session.set_tag_filter("verb")
+    session.next_question()
+    assert session.seen == set()
+    exclude_ids = db.get_random_word_ids.call_args.kwargs["exclude_ids"]
+    assert 1 not in exclude_ids
+
+
+def test_quiz_session_queue_size_is_configurable():
+    db = CountingDatabase()
+    db.get_random_word_ids = lambda limit, tag_filter=None, exclude_ids=None: list(
+        range(10, 10 + limit)
+    )
+    session = QuizSession(db, queue_size=30)
+
+    session.next_question()
+    # 2 incorrect words plus 28 random ones, one of them already asked.
+    assert len(session.queue) == 29
+
+
+def test_quiz_session_requeues_a_word_at_most_twice():
+    db = MockDatabase()
+    session = QuizSession(db)
+    session.next_question()
+
+    session.record_result(False)
+    session.record_result(False)
+    assert session.queue.count(2) == 2
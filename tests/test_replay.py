@@ -0,0 +1,113 @@
+import pytest
+from vocab_tester.cli import main
+from vocab_tester.db import Database
+from vocab_tester.models import TagFilter
+from vocab_tester.quiz_session import QuizSession
+from vocab_tester.replay import copy_deck, percentile, replay
+from vocab_tester.scheduler import make_scheduler
+from vocab_tester.session_log import (
+    RecordedAnswer,
+    SessionLog,
+    SessionSettings,
+    load_session,
+)
+
+SETTINGS = SessionSettings(seed=42, session_size=6)
+
+
+def record_session(db: Database, path, answers: int = 30) -> list[int]:
+    """Answers a seeded session, every third answer wrong, and logs it."""
+    db.rng.seed(SETTINGS.seed)
+    log = SessionLog(path, SETTINGS)
+    session = QuizSession(
+        db,
+        scheduler=make_scheduler(SETTINGS.scheduler),
+        queue_size=SETTINGS.session_size,
+        log=log,
+    )
+    asked = []
+    for i in range(answers):
+        if i == 20:
+            session.set_tag_filter("verb")
+        word = session.next_question()
+        asked.append(word.id)
+        session.record_result(i % 3 != 0, kana_correct=True, response_ms=1000 + i)
+    log.close()
+    return asked
+
+
+def test_seeded_databases_draw_alike(tmp_path):
+    first = Database(db_path=tmp_path / "a.db", seed=3)
+    second = Database(db_path=tmp_path / "b.db", seed=3)
+    assert first.build_queue(8) == second.build_queue(8)
+
+
+def test_session_log_round_trip(tmp_path):
+    db = Database(db_path=tmp_path / "deck.db")
+    asked = record_session(db, tmp_path / "session.jsonl")
+
+    settings, answers = load_session(tmp_path / "session.jsonl")
+    assert settings == SETTINGS
+    assert [answer.word_id for answer in answers] == asked
+    assert answers[0] == RecordedAnswer(asked[0], True, False, 1000)
+    assert answers[1].correct
+    assert answers[25].tag_filter == TagFilter.of("verb")
+
+
+def test_replay_reproduces_session(tmp_path):
+    db = Database(db_path=tmp_path / "deck.db")
+    copy_deck(db.db_path, tmp_path / "copy.db")
+    asked = record_session(db, tmp_path / "session.jsonl")
+    settings, answers = load_session(tmp_path / "session.jsonl")
+
+    report = replay(Database(db_path=tmp_path / "copy.db"), settings, answers)
+    assert report.asked == asked
+    assert report.matched == len(answers)
+    assert len(report.question_ms) == len(report.answer_ms) == len(answers)
+
+
+def test_replay_on_another_deck_is_deterministic(tmp_path):
+    record_session(Database(db_path=tmp_path / "deck.db"), tmp_path / "session.jsonl")
+    settings, answers = load_session(tmp_path / "session.jsonl")
+
+    other = Database(db_path=tmp_path / "other.db")
+    other.add_words(other.get_words(range(1, 9)))
+    copy_deck(other.db_path, tmp_path / "other_copy.db")
+
+    first = replay(other, settings, answers)
+    second = replay(Database(db_path=tmp_path / "other_copy.db"), settings, answers)
+    assert first.asked == second.asked
+    assert first.fingerprint == second.fingerprint
+
+
+def test_percentile():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3.0, 1.0, 2.0], 0.5) == 2.0
+    assert percentile([3.0, 1.0, 2.0], 0.95) == 3.0
+
+
+def test_cli_replay_leaves_deck_untouched(tmp_path, capsys):
+    db_path = tmp_path / "deck.db"
+    record_session(Database(db_path=tmp_path / "live.db"), tmp_path / "session.jsonl")
+    Database(db_path=db_path).close()
+
+    argv = ["--db", str(db_path), "replay", str(tmp_path / "session.jsonl")]
+    assert main(argv) == 0
+    out = capsys.readouterr().out
+    assert "Replayed 30 of 30 answers" in out
+    assert "next question: p50" in out
+
+    with Database(db_path=db_path).get_cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM reviews")
+        assert cur.fetchone()[0] == 0
+
+
+def test_cli_replay_missing_file(tmp_path, capsys):
+    argv = ["--db", str(tmp_path / "deck.db"), "replay", str(tmp_path / "nope")]
+    assert main(argv) == 1
+
+
+def test_load_session_rejects_empty_file(tmp_path):
+    (tmp_path / "empty.jsonl").write_text("")
+    with pytest.raises(ValueError):
+        load_session(tmp_path / "empty.jsonl")
@@ -0,0 +1,153 @@
+import pytest
+from vocab_tester.db import Database
+from vocab_tester.quiz_session import QuizSession
+from vocab_tester.result_recorder import ResultRecorder
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+def last_tested(db: Database) -> dict[int, int]:
+    with db.get_cursor() as cur:
+        cur.execute("SELECT word_id, last_correct FROM last_tested")
+        return {row[0]: row[1] for row in cur.fetchall()}
+
+
+def test_results_are_buffered_until_flush(temp_db):
+    recorder = ResultRecorder(temp_db, max_pending=10)
+    recorder.record(1, True)
+    recorder.record(2, False)
+
+    assert last_tested(temp_db) == {}
+    assert len(recorder.pending) == 2
+
+    assert recorder.flush() == 2
+    assert last_tested(temp_db) == {1: 1, 2: 0}
+    assert recorder.pending == []
+    assert recorder.journal_path.read_text() == ""
+
+
+def test_size_threshold_flushes(temp_db):
+    recorder = ResultRecorder(temp_db, max_pending=3)
+    for word_id in (1, 2, 3):
+        recorder.record(word_id, True)
+
+    assert recorder.pending == []
+    assert set(last_tested(temp_db)) == {1, 2, 3}
+
+
+def test_time_threshold_flushes(temp_db):
+    recorder = ResultRecorder(temp_db, max_delay=0)
+    recorder.record(1, False)
+
+    assert last_tested(temp_db) == {1: 0}
+
+
+def test_flush_is_one_transaction(temp_db):
+    recorder = ResultRecorder(temp_db)
+    for word_id in (1, 2, 3):
+        recorder.record(word_id, True)
+
+    con = temp_db._connection()
+    statements: list[str] = []
+    con.set_trace_callback(statements.append)
+    recorder.flush()
+    con.set_trace_callback(None)
+
+    assert statements.count("COMMIT") == 1
+
+
+def test_journal_replayed_after_crash(temp_db):
+    recorder = ResultRecorder(temp_db)
+    recorder.record(1, False)
+    recorder.record(2, True)
+    # Simulate a crash: nothing was flushed and the journal isn't cleaned up.
+    recorder._journal.close()
+    assert last_tested(temp_db) == {}
+
+    replayed = ResultRecorder(temp_db)
+    assert last_tested(temp_db) == {1: 0, 2: 1}
+    assert replayed.pending == []
+    assert replayed.journal_path.read_text() == ""
+
+
+def test_open_recorders_keep_their_journals(temp_db):
+    first = ResultRecorder(temp_db)
+    first.record(1, False)
+
+    # A second process replaying and flushing leaves the first one's
+    # unflushed results alone.
+    second = ResultRecorder(temp_db)
+    second.record(2, True)
+    second.flush()
+    assert last_tested(temp_db) == {2: 1}
+    assert first.journal_path.read_text() != ""
+
+    # The first one crashes; its journal is picked up by the next recorder.
+    first._journal.close()
+    ResultRecorder(temp_db)
+    assert last_tested(temp_db) == {1: 0, 2: 1}
+    assert not first.journal_path.exists()
+
+
+def test_close_removes_the_journal(temp_db):
+    recorder = ResultRecorder(temp_db)
+    recorder.record(1, True)
+    recorder.close()
+
+    assert not recorder.journal_path.exists()
+
+
+def test_truncated_journal_line_is_ignored(temp_db):
+    journal = temp_db.db_path.with_name("pending_results.log")
+    journal.write_text("1\t0\t100\n2\t1", encoding="utf-8")
+
+    ResultRecorder(temp_db)
+
+    assert last_tested(temp_db) == {1: 0}
+
+
+def test_replay_does_not_overwrite_newer_results(temp_db):
+    temp_db.record_result(1, True)
+    journal = temp_db.db_path.with_name("pending_results.log")
+    journal.write_text("1\t0\t100\n", encoding="utf-8")
+
+    ResultRecorder(temp_db)
+
+    assert last_tested(temp_db) == {1: 1}
+
+
+def test_close_flushes(temp_db):
+    recorder = ResultRecorder(temp_db)
+    recorder.record(1, True)
+    recorder.close()
+
+    assert last_tested(temp_db) == {1: 1}
+
+
+def test_session_records_through_recorder(temp_db):
+    recorder = ResultRecorder(temp_db)
+    session = QuizSession(temp_db, recorder=recorder)
+    word = session.next_question()
+
+    session.record_result(False)
+    assert last_tested(temp_db) == {}
+
+    session.flush()
+    assert last_tested(temp_db) == {word.id: 0}
+
+
+def test_journal_keeps_review_details(temp_db):
+    recorder = ResultRecorder(temp_db)
+    recorder.record(1, False, kana_correct=True, meaning_correct=False, response_ms=900)
+    recorder._journal.close()
+
+    ResultRecorder(temp_db)
+
+    [review] = temp_db.get_reviews(1)
+    assert review.kana_correct is True
+    assert review.meaning_correct is False
+    assert review.response_ms == 900
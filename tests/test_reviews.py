@@ -0,0 +1,92 @@
+import pytest
+from vocab_tester.db import Database
+from vocab_tester.models import Review
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+def last_tested(db: Database, word_id: int) -> tuple[int, int] | None:
+    with db.get_cursor() as cur:
+        cur.execute(
+            "SELECT last_seen, last_correct FROM last_tested WHERE word_id = ?",
+            (word_id,),
+        )
+        row = cur.fetchone()
+    return tuple(row) if row else None
+
+
+def test_record_result_appends_review(temp_db):
+    temp_db.record_result(
+        1, False, kana_correct=True, meaning_correct=False, response_ms=2500
+    )
+    temp_db.record_result(1, True)
+
+    reviews = temp_db.get_reviews(1)
+    assert len(reviews) == 2
+    assert reviews[0].kana_correct is True
+    assert reviews[0].meaning_correct is False
+    assert reviews[0].response_ms == 2500
+    assert reviews[0].correct is False
+    assert reviews[1].correct is True
+    assert reviews[1].response_ms is None
+
+
+def test_last_tested_derived_from_latest_review(temp_db):
+    temp_db.record_results(
+        [
+            Review(1, 5_000_000, True, True),
+            Review(1, 9_000_000, True, False),
+            # Out of order: older than what is already recorded.
+            Review(1, 7_000_000, True, True),
+        ]
+    )
+
+    assert last_tested(temp_db, 1) == (9_000, 0)
+
+
+def test_duplicate_review_ignored(temp_db):
+    review = Review(2, 1_000_000, False, False, 800)
+    temp_db.record_results([review])
+    temp_db.record_results([review])
+
+    assert temp_db.get_reviews(2) == [review]
+
+
+def test_same_millisecond_reviews_both_kept(temp_db):
+    """Another process answering in the same millisecond takes the next one."""
+    first = Review(2, 1_000_000, True, True, 800)
+    second = Review(2, 1_000_000, False, True, 1200)
+    temp_db.record_results([first])
+    temp_db.record_results([second])
+
+    assert temp_db.get_reviews(2) == [first, second._replace(timestamp=1_000_001)]
+
+    # Replaying either one, as a journal would, still adds nothing.
+    temp_db.record_results([first, second])
+    assert len(temp_db.get_reviews(2)) == 2
+    assert temp_db.get_schedule(2).reps == 0
+
+
+def test_reviews_table_is_without_rowid(temp_db):
+    with temp_db.get_cursor() as cur:
+        cur.execute("SELECT sql FROM sqlite_master WHERE name = 'reviews'")
+        assert "WITHOUT ROWID" in cur.fetchone()[0]
+
+
+def test_word_history_uses_primary_key(temp_db):
+    con = temp_db._connection()
+    plan = con.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM reviews WHERE word_id = 1 ORDER BY ts"
+    ).fetchall()
+    assert [row[3] for row in plan] == ["SEARCH reviews USING PRIMARY KEY (word_id=?)"]
+
+
+def test_review_now_defaults_parts_to_overall():
+    review = Review.now(3, True)
+    assert review.kana_correct is True
+    assert review.meaning_correct is True
+    assert review.timestamp > 1_000_000_000_000
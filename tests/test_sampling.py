@@ -0,0 +1,393 @@
+from collections import Counter
+import time
+
+import pytest
+from vocab_tester.db import Database
+from vocab_tester.models import TagFilter, Word
+from vocab_tester.sampling import exclude_condition, ids_after, tag_condition
+from vocab_tester.weighted_sampler import DAY_MS, REWEIGH_MS
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+@pytest.fixture
+def epoch_db(tmp_path):
+    """Fixture to create a temporary database sampling in epoch mode."""
+    return Database(db_path=tmp_path / "test_vocab.db", sample_mode="epoch")
+
+
+def make_word(name: str, tag: str = "noun") -> Word:
+    return Word(
+        kanji_word=name,
+        kana_word=name,
+        english_word=name,
+        japanese_sentence=name,
+        english_sentence=name,
+        tag=tag,
+    )
+
+
+def all_ids(db: Database, tag: str | None = None) -> set[int]:
+    with db.get_cursor() as cur:
+        if tag:
+            cur.execute("SELECT id FROM words WHERE tag = ?", (tag,))
+        else:
+            cur.execute("SELECT id FROM words")
+        return {row[0] for row in cur.fetchall()}
+
+
+def test_unknown_sample_mode_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Database(db_path=tmp_path / "test_vocab.db", sample_mode="shuffle")
+
+
+def test_random_ids_are_distinct_and_filtered(temp_db):
+    ids = temp_db.get_random_word_ids(limit=5, tag_filter="verb")
+    assert len(ids) == 5
+    assert len(set(ids)) == 5
+    assert set(ids) <= all_ids(temp_db, "verb")
+
+
+def test_random_ids_exhaust_small_deck(temp_db):
+    """Asking for more words than exist returns the whole filtered deck."""
+    verbs = all_ids(temp_db, "verb")
+    ids = temp_db.get_random_word_ids(limit=100, tag_filter="verb")
+    assert sorted(ids) == sorted(verbs)
+
+
+def test_random_ids_respect_exclusions(temp_db):
+    verbs = sorted(all_ids(temp_db, "verb"))
+    excluded = verbs[:-1]
+    ids = temp_db.get_random_word_ids(limit=10, tag_filter="verb", exclude_ids=excluded)
+    assert ids == verbs[-1:]
+
+
+def test_random_ids_unknown_tag(temp_db):
+    assert temp_db.get_random_word_ids(limit=5, tag_filter="missing") == []
+
+
+def test_random_ids_cover_deck_with_gaps(temp_db):
+    """Every word can be drawn, even with holes in the id space."""
+    with temp_db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words WHERE id % 3 = 0")
+
+    remaining = all_ids(temp_db)
+    drawn = set()
+    for _ in range(200):
+        drawn.update(temp_db.get_random_word_ids(limit=3))
+    assert drawn == remaining
+
+
+@pytest.mark.parametrize("draw", ["random", "queue"])
+def test_random_ids_uniform_across_gaps(temp_db, draw):
+    """A word after a long run of other words is drawn no more often than the rest."""
+    temp_db.add_words(make_word(f"n5-{i}", "n5") for i in range(50))
+    temp_db.add_words(make_word(f"other{i}", "other") for i in range(5000))
+    temp_db.add_words([make_word("n5-last", "n5")])
+    last = max(all_ids(temp_db, "n5"))
+
+    counts = Counter()
+    for _ in range(500):
+        if draw == "random":
+            counts.update(temp_db.get_random_word_ids(limit=10, tag_filter="n5"))
+        else:
+            counts.update(temp_db.build_queue(10, "n5", incorrect_ratio=0))
+
+    # 51 words, 10 per draw: each is expected about 98 times.
+    assert set(counts) == all_ids(temp_db, "n5")
+    assert counts[last] < 150
+    assert min(counts.values()) > 50
+
+
+def test_incorrect_ids_sampled_without_repeats(temp_db):
+    ids = sorted(all_ids(temp_db))[:4]
+    for word_id in ids:
+        temp_db.record_result(word_id, correct=False)
+
+    drawn = temp_db.get_incorrect_word_ids(limit=3)
+    assert len(drawn) == 3
+    assert set(drawn) <= set(ids)
+
+
+def test_epoch_walks_deck_without_repeats(epoch_db):
+    deck = all_ids(epoch_db)
+    drawn = []
+    while len(drawn) < len(deck):
+        drawn.extend(epoch_db.get_random_word_ids(limit=1))
+
+    assert len(drawn) == len(deck)
+    assert set(drawn) == deck
+
+    # The next draw starts a new epoch.
+    with epoch_db.get_cursor() as cur:
+        cur.execute("SELECT epoch FROM sample_epochs WHERE filter_key = ''")
+        assert cur.fetchone()[0] == 1
+    epoch_db.get_random_word_ids(limit=3)
+    with epoch_db.get_cursor() as cur:
+        cur.execute("SELECT epoch FROM sample_epochs WHERE filter_key = ''")
+        assert cur.fetchone()[0] == 2
+
+
+def test_epoch_is_per_filter(epoch_db):
+    verbs = all_ids(epoch_db, "verb")
+    drawn = epoch_db.get_random_word_ids(limit=len(verbs), tag_filter="verb")
+    assert set(drawn) == verbs
+
+    # The unfiltered epoch is independent and still covers everything.
+    deck = all_ids(epoch_db)
+    assert set(epoch_db.get_random_word_ids(limit=len(deck))) == deck
+
+
+def test_epoch_includes_words_added_mid_epoch(epoch_db):
+    deck = all_ids(epoch_db)
+    first = epoch_db.get_random_word_ids(limit=2)
+
+    epoch_db.add_word(make_word("新しい単語"))
+    new_id = max(all_ids(epoch_db))
+
+    rest = epoch_db.get_random_word_ids(limit=len(deck) - 1)
+    assert new_id in rest
+    assert not set(first) & set(rest)
+
+
+def test_epoch_skips_excluded_ids(epoch_db):
+    deck = sorted(all_ids(epoch_db))
+    drawn = epoch_db.get_random_word_ids(limit=len(deck), exclude_ids=deck[:3])
+    assert set(drawn) == set(deck[3:])
+
+
+@pytest.mark.parametrize(
+    "tag_filter", [None, "verb", TagFilter(frozenset({"n5", "verb"}), match_all=True)]
+)
+def test_ids_after_matches_filter_in_id_order(temp_db, tag_filter):
+    temp_db.add_words(
+        make_word(f"word{i}", ["verb", "noun", "verb; n5"][i % 3]) for i in range(60)
+    )
+    with temp_db.get_cursor() as cur:
+        condition, params = tag_condition(tag_filter)
+        cur.execute(f"SELECT id FROM words WHERE id > 20 AND {condition}", params)
+        expected = sorted(row[0] for row in cur.fetchall())
+
+        assert ids_after(cur, tag_filter, 20) == expected
+        assert ids_after(cur, tag_filter, 20, limit=5) == expected[:5]
+
+
+def test_ids_after_seeks_from_the_bound(temp_db):
+    temp_db.add_words(make_word(f"word{i}", "verb") for i in range(50))
+    statements = []
+    temp_db._connection().set_trace_callback(statements.append)
+    with temp_db.get_cursor() as cur:
+        ids_after(cur, "verb", 40, limit=3)
+        temp_db._connection().set_trace_callback(None)
+        plans = [
+            " ".join(row[3] for row in cur.execute(f"EXPLAIN QUERY PLAN {sql}"))
+            for sql in statements
+            if "word_tags" in sql
+        ]
+    assert any("(tag_id=? AND word_id>?)" in plan for plan in plans)
+    assert not any("TEMP B-TREE" in plan for plan in plans)
+
+
+def test_sampling_is_reproducible_with_seeded_rng(tmp_path):
+    first = Database(db_path=tmp_path / "a.db")
+    second = Database(db_path=tmp_path / "b.db")
+    first.rng.seed(7)
+    second.rng.seed(7)
+    assert first.get_random_word_ids(limit=5) == second.get_random_word_ids(limit=5)
+
+
+@pytest.mark.parametrize("mode", ["random", "epoch", "weighted"])
+@pytest.mark.parametrize("tag_filter", [None, "verb", ["verb", "noun"]])
+def test_huge_exclusion_sets(tmp_path, mode, tag_filter):
+    """Far more excluded ids than SQLite allows bound variables."""
+    db = Database(db_path=tmp_path / "test_vocab.db", sample_mode=mode)
+    keep = sorted(all_ids(db))[:3]
+    excluded = (set(all_ids(db)) - set(keep)) | set(range(10_000, 50_000))
+
+    ids = db.get_random_word_ids(10, tag_filter, exclude_ids=excluded)
+    assert ids
+    assert not set(ids) & excluded
+
+    for word_id in all_ids(db):
+        db.record_result(word_id, False)
+    incorrect = db.get_incorrect_word_ids(10, tag_filter, exclude_ids=excluded)
+    assert not set(incorrect) & excluded
+
+
+def test_exclusions_bind_one_variable():
+    small = exclude_condition({1}, "w.id")
+    large = exclude_condition(set(range(100_000)), "w.id")
+    assert small[0] == large[0]
+    assert len(small[1]) == len(large[1]) == 1
+    assert exclude_condition(set()) == ("1=1", [])
+
+
+@pytest.mark.parametrize("mode", ["random", "epoch", "weighted"])
+def test_build_queue_puts_incorrect_words_first(tmp_path, mode):
+    db = Database(db_path=tmp_path / "test_vocab.db", sample_mode=mode)
+    missed = {2, 5, 9}
+    for word_id in missed:
+        db.record_result(word_id, False)
+
+    ids = db.build_queue(8, exclude_ids={1})
+    assert len(ids) == 8
+    assert len(set(ids)) == 8
+    assert set(ids[:3]) == missed
+    assert 1 not in ids
+
+    verbs = db.build_queue(8, tag_filter="verb")
+    assert set(verbs) <= all_ids(db, "verb")
+    assert set(verbs[:2]) == {5, 9}
+
+
+def test_build_queue_caps_incorrect_share(temp_db):
+    temp_db.add_words(make_word(f"word{i}") for i in range(2000))
+    for word_id in range(1, 9):
+        temp_db.record_result(word_id, False)
+    # Random draws could still land on another missed word by chance.
+    temp_db.rng.seed(1)
+
+    ids = temp_db.build_queue(6, incorrect_ratio=0.5)
+    assert len(ids) == 6
+    assert all(word_id <= 8 for word_id in ids[:3])
+    assert all(word_id > 8 for word_id in ids[3:])
+
+    temp_db.rng.seed(1)
+    assert all(word_id > 8 for word_id in temp_db.build_queue(4, incorrect_ratio=0))
+    with pytest.raises(ValueError):
+        temp_db.build_queue(4, incorrect_ratio=1.5)
+
+
+@pytest.mark.parametrize("tag_filter", [None, "noun", "rare"])
+def test_build_queue_is_one_statement(temp_db, tag_filter):
+    temp_db.add_words(make_word(f"word{i}") for i in range(2000))
+    temp_db.add_words(make_word(f"rare{i}", "rare") for i in range(3))
+    temp_db.record_result(temp_db.build_queue(1, tag_filter)[0], False)
+
+    statements = []
+    temp_db._connection().set_trace_callback(statements.append)
+    ids = temp_db.build_queue(3 if tag_filter == "rare" else 10, tag_filter)
+    temp_db._connection().set_trace_callback(None)
+
+    assert len(set(ids)) == len(ids) == (3 if tag_filter == "rare" else 10)
+    # The filter's id range is cached from the first refill.
+    assert len(statements) == 1
+
+
+def test_build_queue_sees_words_added_since_the_range_was_cached(temp_db):
+    temp_db.build_queue(5, "rare")
+    temp_db.add_words(make_word(f"rare{i}", "rare") for i in range(3))
+    assert len(temp_db.build_queue(5, "rare")) == 3
+
+
+def test_build_queue_shuffles_missed_words_with_rng(temp_db):
+    missed = list(range(1, 9))
+    for word_id in missed:
+        temp_db.record_result(word_id, False)
+
+    orders = {tuple(temp_db.build_queue(8)) for _ in range(20)}
+    assert all(set(order) == set(missed) for order in orders)
+    assert len(orders) > 10
+
+
+def test_build_queue_is_reproducible_with_seeded_rng(tmp_path):
+    queues = []
+    for name in ("a.db", "b.db"):
+        db = Database(db_path=tmp_path / name)
+        for word_id in (2, 4, 6, 8):
+            db.record_result(word_id, False)
+        db.rng.seed(7)
+        queues.append(db.build_queue(8, incorrect_ratio=0.25))
+    assert queues[0] == queues[1]
+
+
+@pytest.fixture
+def weighted_db(tmp_path):
+    """Fixture to create a temporary database sampling in weighted mode."""
+    return Database(db_path=tmp_path / "test_vocab.db", sample_mode="weighted")
+
+
+def test_weighted_mode_favours_missed_words(weighted_db):
+    for word_id in all_ids(weighted_db) - {3}:
+        weighted_db.record_result(word_id, True)
+        weighted_db.record_result(word_id, True)
+    for _ in range(3):
+        weighted_db.record_result(3, False)
+    weighted_db.rng.seed(1)
+
+    drawn = Counter(weighted_db.get_random_word_ids(1)[0] for _ in range(1000))
+    assert drawn.most_common(1)[0][0] == 3
+    assert drawn[3] > 2 * drawn[4]
+
+
+def test_weighted_mode_reweights_after_each_result(weighted_db):
+    weighted_db.get_random_word_ids(1)
+    sampler = weighted_db._samplers[None]
+    before = sampler.weight(4)
+
+    weighted_db.record_result(4, False)
+    assert sampler.weight(4) > before
+    weighted_db.record_result(4, True)
+    weighted_db.record_result(4, True)
+    assert sampler.weight(4) < before
+    # Incremental updates, no rebuild.
+    assert weighted_db._samplers[None] is sampler
+
+
+def test_weighted_mode_sees_new_words_and_tags(weighted_db):
+    verbs = all_ids(weighted_db, "verb")
+    assert set(weighted_db.get_random_word_ids(100, "verb")) == verbs
+
+    weighted_db.add_word(make_word("taberu", tag="verb"))
+    assert len(weighted_db.get_random_word_ids(100, "verb")) == len(verbs) + 1
+
+
+def test_weighted_mode_updates_samplers_in_place(weighted_db):
+    weighted_db.get_random_word_ids(1, "verb")
+    weighted_db.get_random_word_ids(1, "noun")
+    samplers = dict(weighted_db._samplers)
+    verb = min(all_ids(weighted_db, "verb"))
+
+    word = weighted_db.get_word(verb)
+    word.tag = "noun"
+    weighted_db.update_word(word)
+    weighted_db.add_word(make_word("taberu", tag="verb"))
+    added = max(all_ids(weighted_db, "verb"))
+
+    assert weighted_db._samplers == samplers
+    verbs = set(weighted_db.get_random_word_ids(100, "verb"))
+    nouns = set(weighted_db.get_random_word_ids(100, "noun"))
+    assert verb not in verbs and verb in nouns
+    assert added in verbs and added not in nouns
+    assert verbs == all_ids(weighted_db, "verb")
+
+
+def test_weighted_mode_reweighs_stale_words_hourly(weighted_db, monkeypatch):
+    weighted_db.record_result(3, True)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    weighted_db.get_random_word_ids(1)
+    sampler = weighted_db._samplers[None]
+    fresh = sampler.weight(3)
+
+    # Nothing is reviewed while the days go by.
+    now += REWEIGH_MS / 1000 - 1
+    weighted_db.get_random_word_ids(1)
+    assert sampler.weight(3) == fresh
+
+    now += 10 * DAY_MS / 1000
+    weighted_db.get_random_word_ids(1)
+    assert weighted_db._samplers[None] is sampler
+    assert sampler.weight(3) > 1.3 * fresh
+
+
+def test_weighted_mode_reproducible_with_seed(tmp_path):
+    first = Database(db_path=tmp_path / "a.db", sample_mode="weighted")
+    second = Database(db_path=tmp_path / "b.db", sample_mode="weighted")
+    first.rng.seed(7)
+    second.rng.seed(7)
+    assert first.get_random_word_ids(limit=5) == second.get_random_word_ids(limit=5)
@@ -0,0 +1,148 @@
+import time
+
+import pytest
+from vocab_tester.db import Database
+from vocab_tester.migrations import SCHEMA_VERSION, get_version
+from vocab_tester.models import Review
+from vocab_tester.quiz_session import QuizSession
+from vocab_tester.scheduler import RandomScheduler, SM2Scheduler, make_scheduler
+from vocab_tester.sm2 import DAY_MS, MIN_EASE, next_schedule
+
+NOW = 1_700_000_000_000
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+def review(word_id: int, ts: int, correct: bool, response_ms: int | None = None):
+    return Review(word_id, ts, correct, correct, response_ms)
+
+
+def test_sm2_intervals_grow():
+    first = next_schedule(None, review(1, NOW, True))
+    assert (first.reps, first.stability) == (1, 1.0)
+    assert first.due_at == NOW + DAY_MS
+
+    second = next_schedule(first, review(1, first.due_at, True))
+    assert (second.reps, second.stability) == (2, 6.0)
+
+    third = next_schedule(second, review(1, second.due_at, True))
+    assert third.stability == pytest.approx(6.0 * third.difficulty)
+    assert third.due_at == second.due_at + round(third.stability * DAY_MS)
+
+
+def test_sm2_fast_answers_ease_up_and_lapses_reset():
+    fast = next_schedule(None, review(1, NOW, True, response_ms=1000))
+    slow = next_schedule(None, review(1, NOW, True, response_ms=9000))
+    assert fast.difficulty > slow.difficulty
+
+    lapse = next_schedule(fast, review(1, NOW + DAY_MS, False))
+    assert (lapse.reps, lapse.stability) == (0, 1.0)
+    assert lapse.difficulty < fast.difficulty
+
+    for _ in range(20):
+        lapse = next_schedule(lapse, review(1, NOW, False))
+    assert lapse.difficulty == MIN_EASE
+
+
+def test_record_results_schedules_once(temp_db):
+    reviews = [review(1, NOW, True), review(1, NOW + DAY_MS, True)]
+    temp_db.record_results(reviews)
+    # Replaying the same reviews (e.g. from the recorder journal) is a no-op.
+    temp_db.record_results(reviews)
+
+    schedule = temp_db.get_schedule(1)
+    assert schedule.reps == 2
+    assert schedule.due_at == NOW + DAY_MS + 6 * DAY_MS
+    assert temp_db.get_schedule(2) is None
+
+
+def test_due_words_most_overdue_first(temp_db):
+    temp_db.record_results(
+        [review(3, NOW - 5 * DAY_MS, True), review(1, NOW - 3 * DAY_MS, True)]
+    )
+    temp_db.record_results([review(2, NOW, True)])
+
+    # 3 became due four days ago, 1 two days ago and 2 not until tomorrow.
+    assert temp_db.get_due_word_ids(10, now=NOW) == [3, 1]
+    assert temp_db.get_due_word_ids(1, now=NOW) == [3]
+    assert temp_db.get_due_word_ids(10, exclude_ids={3}, now=NOW) == [1]
+    assert temp_db.get_due_word_ids(10, tag_filter="verb", now=NOW) == [3]
+
+    with temp_db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words WHERE id = 3")
+    assert temp_db.get_due_word_ids(10, now=NOW) == [1]
+
+
+def test_due_words_use_due_index(temp_db):
+    with temp_db.get_cursor() as cur:
+        cur.execute(
+            "EXPLAIN QUERY PLAN SELECT s.word_id FROM schedule s"
+            " CROSS JOIN words w ON w.id = s.word_id"
+            " WHERE s.due_at <= ? ORDER BY s.due_at LIMIT 10",
+            (NOW,),
+        )
+        plan = " ".join(row["detail"] for row in cur.fetchall())
+    assert "idx_schedule_due (due_at<?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_new_words_skip_reviewed(temp_db):
+    temp_db.record_results([review(1, NOW, True), review(3, NOW, False)])
+
+    assert temp_db.get_new_word_ids(3) == [2, 4, 5]
+    assert temp_db.get_new_word_ids(2, tag_filter="verb") == [4, 5]
+    assert temp_db.get_new_word_ids(2, exclude_ids={2}) == [4, 5]
+
+
+def test_sm2_scheduler_picks_due_then_new_then_random(temp_db):
+    now = int(time.time() * 1000)
+    temp_db.record_results([review(word_id, now, True) for word_id in range(2, 17)])
+    temp_db.record_results([review(5, now - 10 * DAY_MS, False)])
+
+    # 5 is due, 1 was never reviewed, everything else is practised ahead.
+    ids = SM2Scheduler().pick(temp_db, 4, None, set())
+    assert ids[:2] == [5, 1]
+    assert len(set(ids)) == 4
+
+    assert SM2Scheduler().pick(temp_db, 4, None, {5, 1, 2}).count(2) == 0
+
+
+def test_random_scheduler_asks_incorrect_words_first(temp_db):
+    temp_db.record_results([review(7, NOW, False)])
+
+    ids = RandomScheduler().pick(temp_db, 3, None, set())
+    assert ids[0] == 7
+    assert len(set(ids)) == 3
+
+
+def test_session_uses_scheduler(temp_db):
+    now = int(time.time() * 1000)
+    temp_db.record_results([review(word_id, now, True) for word_id in range(1, 17)])
+    temp_db.record_results([review(9, now - 10 * DAY_MS, False)])
+
+    session = QuizSession(temp_db, scheduler=make_scheduler("sm2"))
+    assert session.next_question().id == 9
+
+
+def test_make_scheduler_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        make_scheduler("fsrs")
+
+
+def test_schedule_backfilled_from_history(tmp_path):
+    path = tmp_path / "history.db"
+    db = Database(db_path=path)
+    db.record_results([review(1, NOW, True), review(1, NOW + DAY_MS, True)])
+    expected = db.get_schedule(1)
+    with db.get_cursor(commit=True) as cur:
+        cur.execute("DROP TABLE schedule")
+        cur.execute("PRAGMA user_version = 7")
+    db.close()
+
+    db = Database(db_path=path)
+    assert get_version(db._connection()) == SCHEMA_VERSION
+    assert db.get_schedule(1) == expected
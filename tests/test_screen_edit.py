@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock
 from vocab_tester.quiz_screen import QuizScreen
+from vocab_tester.async_db import AsyncDatabase
 from vocab_tester.models import Word
 
 
@@ -54,10 +55,11 @@ class MockQuizScreen(QuizScreen):
 @pytest.fixture
 def screen():
     db = MockDatabase()
-    return MockQuizScreen(db)
+    return MockQuizScreen(AsyncDatabase(db))
 
 
-def test_action_edit_word_pushes_screen(screen):
+@pytest.mark.asyncio
+async def test_action_edit_word_pushes_screen(screen):
     screen.step = "result"
     screen.question_data = Word(
         id=1,
@@ -69,7 +71,7 @@ def test_action_edit_word_pushes_screen(screen):
         tag="Tag",
     )
 
-    screen.action_edit_word()
+    await screen.action_edit_word()
 
     screen.app.push_screen.assert_called()
     call_args = screen.app.push_screen.call_args
@@ -77,7 +79,8 @@ def test_action_edit_word_pushes_screen(screen):
     assert call_args[0][1] == screen.on_edit_word_done
 
 
-def test_on_edit_word_done_refreshes_data(screen):
+@pytest.mark.asyncio
+async def test_on_edit_word_done_refreshes_data(screen):
     screen.question_data = Word(
         id=1,
         kanji_word="OldKanji",
@@ -88,7 +91,7 @@ def test_on_edit_word_done_refreshes_data(screen):
         tag="OldTag",
     )
     # Simulate editing done with changes
-    screen.on_edit_word_done(True)
+    await screen.on_edit_word_done(True)
 
     # Check if data updated
     assert screen.question_data.kanji_word == "NewKanji"
@@ -0,0 +1,187 @@
+import asyncio
+
+import sqlite3
+
+import pytest
+from textual.app import App
+from textual.widgets import DataTable, Input
+from vocab_tester.async_db import AsyncDatabase
+from vocab_tester.db import SCHEMA_PATH, Database
+from vocab_tester.models import Word
+from vocab_tester.quiz_session import QuizSession
+from vocab_tester.search_screen import PAGE_SIZE, SearchScreen
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    db = Database(db_path=tmp_path / "test_vocab.db")
+    with db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words")
+    return db
+
+
+def make_word(kanji: str, english: str, sentence: str = "文です。") -> Word:
+    return Word(
+        kanji_word=kanji,
+        kana_word="かな",
+        english_word=english,
+        japanese_sentence=sentence,
+        english_sentence=f"A sentence about {english}.",
+        tag="noun",
+    )
+
+
+def test_search_finds_japanese_substrings(temp_db):
+    temp_db.add_word(make_word("図書館", "library", "図書館で本を読みます。"))
+    temp_db.add_word(make_word("猫", "cat"))
+
+    assert [w.kanji_word for w in temp_db.search_words("本を読み")] == ["図書館"]
+    assert [w.kanji_word for w in temp_db.search_words("書館")] == ["図書館"]
+    assert [w.kanji_word for w in temp_db.search_words("猫")] == ["猫"]
+
+
+def test_search_ranks_word_hits_above_sentence_hits(temp_db):
+    temp_db.add_word(make_word("本", "book", "library の本です。"))
+    temp_db.add_word(make_word("図書館", "library"))
+
+    results = temp_db.search_words("library")
+    assert [w.kanji_word for w in results] == ["図書館", "本"]
+
+
+def test_search_ranks_every_hit(temp_db):
+    """An old word hit outranks any number of newer sentence hits."""
+    temp_db.add_words([make_word("猫", "kitten")])
+    temp_db.add_words(
+        make_word(f"語{i}", f"word {i}", "kittenの文です。") for i in range(600)
+    )
+
+    results = temp_db.search_words("kitten", limit=5)
+    assert results[0].english_word == "kitten"
+    assert len(temp_db.search_words("kitten", limit=20, offset=590)) == 11
+
+
+def test_search_requires_every_term(temp_db):
+    temp_db.add_word(make_word("犬", "dog"))
+    temp_db.add_word(make_word("猫", "cat"))
+
+    assert [w.kanji_word for w in temp_db.search_words("sentence cat")] == ["猫"]
+    assert [w.kanji_word for w in temp_db.search_words("sentence 犬")] == ["犬"]
+
+
+def test_search_treats_query_as_plain_text(temp_db):
+    temp_db.add_word(make_word("猫", "cat"))
+
+    for query in ('"cat', "cat*", "NOT cat", "%", "c_t", "a OR"):
+        temp_db.search_words(query)
+    assert temp_db.search_words("c_t") == []
+    assert temp_db.search_words("   ") == []
+
+
+def test_search_index_follows_updates_and_deletes(temp_db):
+    temp_db.add_word(make_word("猫", "cat"))
+    word = temp_db.search_words("cat")[0]
+
+    word.english_word = "kitty"
+    word.english_sentence = "A sentence about a kitty."
+    temp_db.update_word(word)
+    assert [w.id for w in temp_db.search_words("kitty")] == [word.id]
+    assert temp_db.search_words("cat") == []
+
+    with temp_db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words WHERE id = ?", (word.id,))
+    assert temp_db.search_words("kitty") == []
+
+
+def test_search_index_built_for_existing_words(tmp_path):
+    db_file = tmp_path / "legacy.db"
+    con = sqlite3.connect(db_file)
+    con.executescript(SCHEMA_PATH.read_text())
+    con.execute(
+        "INSERT INTO words (kanji_word, japanese_sentence, kana_word, english_word, english_sentence, tag) VALUES ('猫', '猫がいます。', 'ねこ', 'cat', 's', 'noun')"
+    )
+    con.commit()
+    con.close()
+
+    db = Database(db_path=db_file)
+    assert [w.kanji_word for w in db.search_words("猫がい")] == ["猫"]
+
+
+def test_search_pages(temp_db):
+    temp_db.add_words([make_word(f"語{i}", f"word {i}") for i in range(45)])
+
+    pages = [temp_db.search_words("word", limit=20, offset=n) for n in (0, 20, 40)]
+    assert [len(page) for page in pages] == [20, 20, 5]
+    ids = [w.id for page in pages for w in page]
+    assert len(set(ids)) == 45
+
+
+def test_search_uses_full_text_index(temp_db):
+    con = temp_db._connection()
+    statements: list[str] = []
+    con.set_trace_callback(statements.append)
+    temp_db.search_words("library")
+    con.set_trace_callback(None)
+
+    [statement] = [s for s in statements if "MATCH" in s]
+    plan = con.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+    assert any("VIRTUAL TABLE" in row[3] for row in plan)
+
+
+class SearchApp(App):
+    def __init__(self, db: Database, session: QuizSession | None = None):
+        super().__init__()
+        self.db = db
+        self.session = session
+
+    def on_mount(self) -> None:
+        self.push_screen(SearchScreen(AsyncDatabase(self.db), self.session))
+
+
+@pytest.mark.asyncio
+async def test_search_screen_pages_through_results(temp_db):
+    temp_db.add_words([make_word(f"語{i}", f"word {i}") for i in range(25)])
+
+    app = SearchApp(temp_db)
+    async with app.run_test() as pilot:
+        for _ in range(100):
+            if isinstance(app.screen, SearchScreen):
+                break
+            await asyncio.sleep(0.01)
+        screen = app.screen
+
+        screen.query_one("#search_input", Input).value = "word"
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        table = screen.query_one("#search_results", DataTable)
+        assert table.row_count == PAGE_SIZE
+
+        await pilot.click("#next_page_btn")
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert table.row_count == 25 - PAGE_SIZE
+        assert screen.query_one("#next_page_btn").disabled
+
+
+@pytest.mark.asyncio
+async def test_search_edits_reach_the_quiz_session(temp_db):
+    temp_db.add_words([make_word("猫", "cat"), make_word("犬", "dog")])
+    session = QuizSession(temp_db)
+    session.next_question()
+    queued = session.queue[0]
+    assert queued in session.prefetched
+
+    app = SearchApp(temp_db, session)
+    async with app.run_test():
+        for _ in range(100):
+            if isinstance(app.screen, SearchScreen):
+                break
+            await asyncio.sleep(0.01)
+
+        word = temp_db.get_word(queued)
+        word.english_word = "edited"
+        temp_db.update_word(word)
+        await app.screen.on_edit_word_done(queued, True)
+        await app.workers.wait_for_complete()
+
+    assert session.prefetched[queued].english_word == "edited"
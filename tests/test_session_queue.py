@@ -0,0 +1,41 @@
+from vocab_tester.session_queue import SessionQueue
+
+
+def test_behaves_like_a_list():
+    queue = SessionQueue([1, 2, 3])
+
+    assert len(queue) == 3
+    assert list(queue) == [1, 2, 3]
+    assert queue == [1, 2, 3]
+    assert queue[0] == 1
+    assert queue[-1] == 3
+    assert queue[1:] == [2, 3]
+    assert 2 in queue
+    assert 4 not in queue
+
+
+def test_insert_after_and_popleft():
+    queue = SessionQueue([1, 2, 3, 4])
+    queue.insert(2, 9)
+    queue.insert(10, 9)  # past the end: appended
+    assert queue == [1, 2, 9, 3, 4, 9]
+
+    assert queue.popleft() == 1
+    assert queue == [2, 9, 3, 4, 9]
+
+
+def test_counts_duplicates():
+    queue = SessionQueue([5, 6])
+    queue.insert(0, 5)
+    assert queue.count(5) == 2
+    assert queue.count(7) == 0
+
+    queue.popleft()
+    queue.popleft()
+    assert queue.count(5) == 0
+    assert 5 not in queue
+    assert 6 in queue
+
+    queue.clear()
+    assert len(queue) == 0
+    assert 6 not in queue
@@ -0,0 +1,65 @@
+import pytest
+from vocab_tester.db import Database
+from vocab_tester.models import TagFilter
+from vocab_tester.quiz_session import QuizSession
+from vocab_tester.session_snapshot import (
+    SessionSnapshot,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db")
+
+
+def test_snapshot_round_trip(tmp_path, temp_db):
+    path = tmp_path / "session.json"
+    snapshot = SessionSnapshot(
+        queue=[3, 1, 3],
+        words=temp_db.get_words([1, 3, 4]),
+        current_word_id=4,
+        tag_filter=TagFilter(frozenset({"verb", "noun"}), match_all=True),
+        seen=[2, 4],
+        step="meaning",
+        kana_answer="たべる",
+        score_correct=5,
+        score_total=7,
+    )
+    save_snapshot(path, snapshot)
+    assert load_snapshot(path) == snapshot
+    assert not path.with_name("session.json.tmp").exists()
+
+
+def test_unreadable_snapshots_are_ignored(tmp_path):
+    assert load_snapshot(tmp_path / "missing.json") is None
+
+    path = tmp_path / "session.json"
+    path.write_text('{"queue": [1', encoding="utf-8")
+    assert load_snapshot(path) is None
+    path.write_text('{"queue": [1], "words": [{"id": 1}]}', encoding="utf-8")
+    assert load_snapshot(path) is None
+
+
+def test_session_resumes_without_querying(temp_db, monkeypatch):
+    session = QuizSession(temp_db, "verb")
+    for correct in (True, False, True):
+        session.next_question()
+        session.record_result(correct)
+    snapshot = session.snapshot()
+    current = session.current_word
+    upcoming = list(session.queue)
+
+    def no_queries(*args, **kwargs):
+        raise AssertionError("the deck was queried")
+
+    monkeypatch.setattr(temp_db, "get_words", no_queries)
+    monkeypatch.setattr(temp_db, "build_queue", no_queries)
+
+    resumed = QuizSession(temp_db)
+    assert resumed.restore(snapshot) == current
+    assert resumed.current_tag_filter == TagFilter.of("verb")
+    assert resumed.seen == session.seen
+    assert resumed.next_question().id == upcoming[0]
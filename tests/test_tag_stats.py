@@ -0,0 +1,155 @@
+import asyncio
+import sqlite3
+
+import pytest
+from textual.app import App
+from textual.widgets import Button
+from vocab_tester.async_db import AsyncDatabase
+from vocab_tester.db import SCHEMA_PATH, Database
+from vocab_tester.models import Review, TagStats, Word
+from vocab_tester.tag_screen import TagSelectionScreen
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    db = Database(db_path=tmp_path / "test_vocab.db")
+    with db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words")
+    return db
+
+
+def add(db: Database, tag: str) -> int:
+    db.add_word(
+        Word(
+            kanji_word="語",
+            kana_word="ご",
+            english_word="word",
+            japanese_sentence="文。",
+            english_sentence="Sentence.",
+            tag=tag,
+        )
+    )
+    with db.get_cursor() as cur:
+        cur.execute("SELECT MAX(id) FROM words")
+        return cur.fetchone()[0]
+
+
+def stats(db: Database) -> dict[str, tuple[int, int]]:
+    return {s.name: (s.word_count, s.max_word_id) for s in db.get_tag_stats()}
+
+
+def test_stats_follow_inserts_updates_and_deletes(temp_db):
+    first = add(temp_db, "verb; JLPT-N5")
+    second = add(temp_db, "verb")
+    assert stats(temp_db) == {"verb": (2, second), "JLPT-N5": (1, first)}
+
+    word = temp_db.get_word(second)
+    word.tag = "noun"
+    temp_db.update_word(word)
+    assert stats(temp_db) == {
+        "verb": (1, first),
+        "JLPT-N5": (1, first),
+        "noun": (1, second),
+    }
+
+    with temp_db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words WHERE id = ?", (first,))
+    assert stats(temp_db) == {"noun": (1, second)}
+
+
+def test_last_used_tracks_reviews(temp_db):
+    word_id = add(temp_db, "verb; noun")
+    add(temp_db, "adjective")
+    temp_db.record_results([Review(word_id, 1_700_000_000_000, True, True)])
+
+    last_used = {s.name: s.last_used for s in temp_db.get_tag_stats()}
+    assert last_used == {
+        "verb": 1_700_000_000,
+        "noun": 1_700_000_000,
+        "adjective": None,
+    }
+
+
+def test_last_used_survives_edits(temp_db):
+    word_id = add(temp_db, "verb")
+    temp_db.record_results([Review(word_id, 1_700_000_000_000, True, True)])
+
+    word = temp_db.get_word(word_id)
+    word.english_word = "edited"
+    temp_db.update_word(word)
+    word.tag = "verb; noun"
+    temp_db.update_word(word)
+
+    last_used = {s.name: s.last_used for s in temp_db.get_tag_stats()}
+    assert last_used == {"verb": 1_700_000_000, "noun": None}
+    assert stats(temp_db) == {"verb": (1, word_id), "noun": (1, word_id)}
+
+
+def test_get_tags_reads_only_tag_stats(temp_db):
+    add(temp_db, "verb")
+    con = temp_db._connection()
+    statements: list[str] = []
+    con.set_trace_callback(statements.append)
+    temp_db.get_tags()
+    con.set_trace_callback(None)
+
+    plan = "\n".join(
+        row[3] for row in con.execute(f"EXPLAIN QUERY PLAN {statements[-1]}")
+    )
+    assert "word_tags" not in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_stats_backfilled_on_upgrade(tmp_path):
+    db_file = tmp_path / "legacy.db"
+    con = sqlite3.connect(db_file)
+    con.executescript(SCHEMA_PATH.read_text())
+    con.executemany(
+        "INSERT INTO words (kanji_word, japanese_sentence, kana_word, english_word, english_sentence, tag) VALUES ('猫', 's', 'ねこ', 'cat', 's', ?)",
+        [("noun",), ("noun; animal",)],
+    )
+    con.execute(
+        "INSERT INTO last_tested (word_id, last_seen, last_correct) VALUES (2, 500, 1)"
+    )
+    con.commit()
+    con.close()
+
+    db = Database(db_path=db_file)
+    assert db.get_tag_stats() == [
+        TagStats("animal", 1, 2, 500),
+        TagStats("noun", 2, 2, 500),
+    ]
+
+
+class TagApp(App):
+    def __init__(self, db: Database):
+        super().__init__()
+        self.db = db
+        self.selected = None
+
+    def on_mount(self) -> None:
+        self.push_screen(TagSelectionScreen(AsyncDatabase(self.db)), self.on_selected)
+
+    def on_selected(self, tag: str | None) -> None:
+        self.selected = tag
+
+
+@pytest.mark.asyncio
+async def test_tag_screen_shows_counts(temp_db):
+    add(temp_db, "verb")
+    add(temp_db, "verb")
+
+    app = TagApp(temp_db)
+    async with app.run_test() as pilot:
+        for _ in range(100):
+            if app.screen.query(".tag-button"):
+                break
+            await asyncio.sleep(0.01)
+
+        button = app.screen.query_one(".tag-button", Button)
+        assert str(button.label) == "verb (2)"
+
+        button.press()
+        await pilot.pause()
+        assert app.selected == "verb"
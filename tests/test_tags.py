@@ -0,0 +1,146 @@
+import sqlite3
+
+import pytest
+from vocab_tester.db import SCHEMA_PATH, Database
+from vocab_tester.models import TagFilter, Word
+from vocab_tester.quiz_session import QuizSession
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    db = Database(db_path=tmp_path / "test_vocab.db")
+    with db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words")
+    return db
+
+
+def add(db: Database, name: str, tag: str) -> int:
+    db.add_word(
+        Word(
+            kanji_word=name,
+            kana_word=name,
+            english_word=name,
+            japanese_sentence=name,
+            english_sentence=name,
+            tag=tag,
+        )
+    )
+    with db.get_cursor() as cur:
+        cur.execute("SELECT MAX(id) FROM words")
+        return cur.fetchone()[0]
+
+
+def word_tags(db: Database, word_id: int) -> set[str]:
+    with db.get_cursor() as cur:
+        cur.execute(
+            "SELECT t.name FROM word_tags wt JOIN tags t ON t.id = wt.tag_id"
+            " WHERE wt.word_id = ?",
+            (word_id,),
+        )
+        return {row[0] for row in cur.fetchall()}
+
+
+def test_word_tags_property():
+    word = Word(
+        kanji_word="行く",
+        kana_word="いく",
+        english_word="go",
+        japanese_sentence="行く。",
+        english_sentence="Go.",
+        tag="verb; JLPT-N5 ;",
+    )
+    assert word.tags == ["verb", "JLPT-N5"]
+
+
+def test_tag_filter_of():
+    assert TagFilter.of(None) is None
+    assert TagFilter.of("") is None
+    assert TagFilter.of([]) is None
+    assert TagFilter.of("verb") == TagFilter(frozenset({"verb"}))
+    assert TagFilter.of(["a", "b"]).key == "a|b"
+    assert TagFilter(frozenset({"b", "a"}), match_all=True).key == "a&b"
+
+
+def test_add_word_links_every_tag(temp_db):
+    word_id = add(temp_db, "行く", "verb; JLPT-N5")
+    assert word_tags(temp_db, word_id) == {"verb", "JLPT-N5"}
+    assert set(temp_db.get_tags()) == {"verb", "JLPT-N5"}
+
+
+def test_update_word_relinks_tags(temp_db):
+    word_id = add(temp_db, "行く", "verb; JLPT-N5")
+    word = temp_db.get_word(word_id)
+    word.tag = "verb; JLPT-N4"
+    temp_db.update_word(word)
+
+    assert word_tags(temp_db, word_id) == {"verb", "JLPT-N4"}
+    assert set(temp_db.get_tags()) == {"verb", "JLPT-N4"}
+
+
+def test_delete_word_unlinks_tags(temp_db):
+    word_id = add(temp_db, "行く", "verb")
+    with temp_db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words WHERE id = ?", (word_id,))
+
+    assert word_tags(temp_db, word_id) == set()
+    assert temp_db.get_tags() == []
+
+
+def test_any_and_all_semantics(temp_db):
+    go = add(temp_db, "行く", "verb; JLPT-N5")
+    eat = add(temp_db, "食べる", "verb")
+    cat = add(temp_db, "猫", "noun; JLPT-N5")
+
+    any_of = TagFilter(frozenset({"verb", "JLPT-N5"}))
+    all_of = TagFilter(frozenset({"verb", "JLPT-N5"}), match_all=True)
+
+    assert set(temp_db.get_random_word_ids(10, any_of)) == {go, eat, cat}
+    assert temp_db.get_random_word_ids(10, all_of) == [go]
+    assert set(temp_db.get_random_word_ids(10, "JLPT-N5")) == {go, cat}
+
+    for word_id in (go, eat, cat):
+        temp_db.record_result(word_id, False)
+    assert temp_db.get_incorrect_word_ids(10, all_of) == [go]
+    assert set(temp_db.get_incorrect_word_ids(10, "noun")) == {cat}
+
+
+def test_all_semantics_with_unknown_tag(temp_db):
+    add(temp_db, "行く", "verb")
+    missing = TagFilter(frozenset({"verb", "missing"}), match_all=True)
+    assert temp_db.get_random_word_ids(10, missing) == []
+
+
+def test_epoch_mode_with_tag_sets(tmp_path):
+    db = Database(db_path=tmp_path / "epoch.db", sample_mode="epoch")
+    go = add(db, "行く", "verb; JLPT-N5")
+    add(db, "食べる", "verb")
+
+    all_of = TagFilter(frozenset({"verb", "JLPT-N5"}), match_all=True)
+    assert db.get_random_word_ids(5, all_of) == [go]
+
+
+def test_session_accepts_tag_sets(temp_db):
+    go = add(temp_db, "行く", "verb; JLPT-N5")
+    add(temp_db, "食べる", "verb")
+
+    session = QuizSession(
+        temp_db, TagFilter(frozenset({"verb", "JLPT-N5"}), match_all=True)
+    )
+    assert session.next_question().id == go
+
+
+def test_legacy_tags_migrated(tmp_path):
+    db_file = tmp_path / "legacy.db"
+    con = sqlite3.connect(db_file)
+    con.executescript(SCHEMA_PATH.read_text())
+    con.execute(
+        "INSERT INTO words (kanji_word, japanese_sentence, kana_word, english_word, english_sentence, tag) VALUES ('猫', 's', 'ねこ', 'cat', 's', 'noun; animal')"
+    )
+    con.commit()
+    con.close()
+
+    db = Database(db_path=db_file)
+
+    assert word_tags(db, 1) == {"noun", "animal"}
+    assert db.get_random_word_ids(5, "animal") == [1]
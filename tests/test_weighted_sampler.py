@@ -0,0 +1,83 @@
+from collections import Counter
+import random
+
+import pytest
+from vocab_tester.weighted_sampler import (
+    DAY_MS,
+    STALE_DAYS,
+    ReviewStats,
+    WeightedSampler,
+    word_weight,
+)
+
+NOW = 1_700_000_000_000
+
+
+def test_word_weight_favours_misses_and_stale_words():
+    fresh = ReviewStats(reviews=4, misses=0, last_seen=NOW)
+    missed = ReviewStats(reviews=4, misses=3, last_seen=NOW)
+    stale = ReviewStats(reviews=4, misses=0, last_seen=NOW - 2 * STALE_DAYS * DAY_MS)
+
+    assert word_weight(missed, NOW) > word_weight(fresh, NOW)
+    assert word_weight(stale, NOW) == pytest.approx(2 * word_weight(fresh, NOW))
+    assert word_weight(ReviewStats(), NOW) == pytest.approx(0.5)
+
+
+def test_draws_follow_weights():
+    sampler = WeightedSampler([(1, 1.0), (2, 3.0), (3, 0.0)])
+    rng = random.Random(1)
+
+    counts = Counter(sampler.sample(rng, 1)[0] for _ in range(4000))
+    assert counts[3] == 0
+    assert counts[2] / counts[1] == pytest.approx(3, rel=0.15)
+
+
+def test_sample_is_distinct_and_skips_excluded():
+    sampler = WeightedSampler((word_id, 1.0) for word_id in range(1, 21))
+    rng = random.Random(2)
+
+    ids = sampler.sample(rng, 10, exclude_ids={1, 2, 99})
+    assert len(set(ids)) == 10
+    assert not {1, 2} & set(ids)
+
+    assert sorted(sampler.sample(rng, 50)) == list(range(1, 21))
+    # Drawn and excluded words get their weights back afterwards.
+    assert sampler.total == pytest.approx(20.0)
+
+
+def test_set_weight_updates_and_appends():
+    sampler = WeightedSampler([(1, 1.0), (2, 1.0)])
+    sampler.set_weight(2, 0.0)
+    sampler.set_weight(7, 2.5)
+
+    assert len(sampler) == 3
+    assert 7 in sampler
+    assert sampler.weight(7) == 2.5
+    assert sampler.total == pytest.approx(3.5)
+    assert 2 not in sampler.sample(random.Random(3), 3)
+
+
+def test_tree_matches_weights_after_many_updates():
+    rng = random.Random(4)
+    sampler = WeightedSampler()
+    weights = {}
+    for _ in range(500):
+        word_id = rng.randrange(100)
+        weights[word_id] = rng.random()
+        sampler.set_weight(word_id, weights[word_id])
+
+    assert sampler.total == pytest.approx(sum(weights.values()))
+    assert sorted(sampler.sample(rng, 200)) == sorted(
+        word_id for word_id, weight in weights.items() if weight > 0
+    )
+
+
+def test_reweigh_rebuilds_the_tree():
+    sampler = WeightedSampler((word_id, 1.0) for word_id in range(1, 51))
+    sampler.reweigh(lambda word_id, weight: weight * (word_id % 3))
+
+    assert sampler.weight(3) == 0.0
+    assert sampler.weight(5) == 2.0
+    assert sampler.total == pytest.approx(sum(i % 3 for i in range(1, 51)))
+    drawn = sampler.sample(random.Random(5), 50)
+    assert sorted(drawn) == [i for i in range(1, 51) if i % 3]
@@ -0,0 +1,119 @@
+import pytest
+from vocab_tester.db import Database
+from vocab_tester.models import Word
+from vocab_tester.word_cache import WordCache
+
+
+def make_word(word_id: int | None = None, kanji: str = "猫") -> Word:
+    return Word(
+        id=word_id,
+        kanji_word=kanji,
+        kana_word="ねこ",
+        english_word="cat",
+        japanese_sentence="猫です。",
+        english_sentence="It's a cat.",
+        tag="noun",
+    )
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Fixture to create a temporary database."""
+    return Database(db_path=tmp_path / "test_vocab.db", cache_size=4)
+
+
+def first_ids(db: Database, count: int) -> list[int]:
+    with db.get_cursor() as cur:
+        cur.execute("SELECT id FROM words ORDER BY id LIMIT ?", (count,))
+        return [row[0] for row in cur.fetchall()]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = WordCache(maxsize=2)
+    for word_id in (1, 2):
+        cache.put(make_word(word_id))
+    cache.get(1)
+    cache.put(make_word(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.info().currsize == 2
+
+
+def test_cached_words_are_copies():
+    cache = WordCache()
+    word = make_word(1)
+    cache.put(word)
+    word.kanji_word = "changed"
+
+    cached = cache.get(1)
+    cached.kana_word = "changed"
+    assert cache.get(1).kanji_word == "猫"
+    assert cache.get(1).kana_word == "ねこ"
+
+
+def test_repeated_reads_hit_cache(temp_db):
+    word_id = first_ids(temp_db, 1)[0]
+    temp_db.get_word(word_id)
+    temp_db.get_word(word_id)
+    temp_db.get_words([word_id, word_id])
+
+    info = temp_db.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+
+def test_cache_is_bounded(temp_db):
+    temp_db.get_words(first_ids(temp_db, 10))
+    assert temp_db.cache_info().currsize == 4
+
+
+def test_update_word_writes_through(temp_db):
+    word_id = first_ids(temp_db, 1)[0]
+    word = temp_db.get_word(word_id)
+    word.kanji_word = "edited"
+    temp_db.update_word(word)
+
+    misses = temp_db.cache_info().misses
+    assert temp_db.get_word(word_id).kanji_word == "edited"
+    assert temp_db.cache_info().misses == misses
+
+
+def test_add_word_invalidates_reused_ids(temp_db):
+    with temp_db.get_cursor() as cur:
+        cur.execute("SELECT MAX(id) FROM words")
+        max_id = cur.fetchone()[0]
+    assert temp_db.get_word(max_id) is not None
+
+    # Deleting the newest word lets SQLite hand its id to the next insert.
+    with temp_db.get_cursor(commit=True) as cur:
+        cur.execute("DELETE FROM words WHERE id = ?", (max_id,))
+    temp_db.add_word(make_word(kanji="新しい"))
+
+    assert temp_db.get_word(max_id).kanji_word == "新しい"
+
+
+def test_cache_can_be_disabled(tmp_path):
+    db = Database(db_path=tmp_path / "test_vocab.db", cache_size=0)
+    word_id = first_ids(db, 1)[0]
+    db.get_word(word_id)
+    db.get_word(word_id)
+    assert db.cache_info().hits == 0
+    assert db.cache_info().currsize == 0
+
+
+def test_cache_sees_writes_from_other_connections(temp_db):
+    word_id = first_ids(temp_db, 1)[0]
+    assert temp_db.get_word(word_id).kanji_word != "edited"
+
+    # Another process editing the deck, bypassing this Database.
+    other = Database(db_path=temp_db.db_path)
+    with other.get_cursor(commit=True) as cur:
+        cur.execute("UPDATE words SET kanji_word = 'edited' WHERE id = ?", (word_id,))
+
+    assert temp_db.get_word(word_id).kanji_word == "edited"
+    assert temp_db.get_words([word_id])[0].kanji_word == "edited"
+    # Reads alone leave the cache alone.
+    hits = temp_db.cache_info().hits
+    temp_db.get_word(word_id)
+    assert temp_db.cache_info().hits == hits + 1